@@ -0,0 +1,65 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmark: pages/sec of article extraction over a corpus of saved HTML pages,
+inline versus through the ``ExtractionPool``.
+
+Usage:
+    uv run python -m benchmarks.extraction --corpus DIR [--workers 1 2 4] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+from src.crawler.extraction import ExtractionPool, _extract_in_worker
+
+
+def _inline(pages) -> float:
+    start = time.perf_counter()
+    for html in pages:
+        _extract_in_worker(html)
+    return len(pages) / (time.perf_counter() - start)
+
+
+async def _pooled(pool: ExtractionPool, pages) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.aextract(html) for html in pages))
+    return len(pages) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, required=True)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    files = sorted(args.corpus.rglob("*.htm*"))
+    if not files:
+        parser.error(f"no .html files under {args.corpus}")
+    pages = [f.read_text(encoding="utf-8", errors="ignore") for f in files]
+    pages *= args.repeat
+    size = sum(len(html) for html in pages) / len(pages)
+    print(f"{len(files)} pages x {args.repeat}, {size:,.0f} chars on average")
+
+    rate = _inline(pages)
+    print(f"{'inline':18s} {rate:12,.1f} pages/sec")
+    for workers in args.workers:
+        pool = ExtractionPool(max_workers=workers, timeout=args.timeout)
+        # Start the workers before timing
+        asyncio.run(_pooled(pool, pages[:workers]))
+        rate = asyncio.run(_pooled(pool, pages))
+        pool.shutdown()
+        label = f"pool, {workers} worker(s)"
+        print(f"{label:18s} {rate:12,.1f} pages/sec")
+
+
+if __name__ == "__main__":
+    main()
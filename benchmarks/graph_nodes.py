@@ -0,0 +1,97 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmark: throughput of concurrent graph runs with sync versus async nodes.
+
+Runs the prompt enhancer graph against a fake chat model that answers after
+a fixed latency. LangGraph runs sync nodes in the default thread pool, so
+their throughput stops at the pool size, while async nodes only wait on the
+event loop.
+
+Usage:
+    uv run python -m benchmarks.graph_nodes [--runs 10 50 200] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from unittest.mock import patch
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.graph import StateGraph
+
+from src.config.report_style import ReportStyle
+from src.prompt_enhancer.graph.enhancer_node import (
+    aprompt_enhancer_node,
+    prompt_enhancer_node,
+)
+from src.prompt_enhancer.graph.state import PromptEnhancerState
+
+REPLY = "<enhanced_prompt>An enhanced prompt</enhanced_prompt>"
+
+
+class SlowChatModel(BaseChatModel):
+    """Chat model standing in for a remote LLM with a fixed latency."""
+
+    latency: float = 0.2
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake"
+
+    def _result(self) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(REPLY))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+
+def _graph(node):
+    builder = StateGraph(PromptEnhancerState)
+    builder.add_node("enhancer", node)
+    builder.set_entry_point("enhancer")
+    builder.set_finish_point("enhancer")
+    return builder.compile()
+
+
+async def _run(graph, runs: int) -> float:
+    state = {"prompt": "Write about AI", "report_style": ReportStyle.ACADEMIC}
+    start = time.perf_counter()
+    await asyncio.gather(*(graph.ainvoke(state) for _ in range(runs)))
+    return runs / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    model = SlowChatModel(latency=args.latency)
+    graphs = [
+        ("sync", _graph(prompt_enhancer_node)),
+        ("async", _graph(aprompt_enhancer_node)),
+    ]
+    with patch(
+        "src.prompt_enhancer.graph.enhancer_node.get_llm_by_type", return_value=model
+    ):
+        for runs in args.runs:
+            for name, graph in graphs:
+                rate = asyncio.run(_run(graph, runs))
+                label = f"{runs} concurrent runs"
+                print(f"{name:6s} {label:20s} {rate:10,.1f} runs/sec")
+
+
+if __name__ == "__main__":
+    main()
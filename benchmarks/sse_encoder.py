@@ -0,0 +1,66 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Microbenchmark: SSE events/sec produced by ``_process_message_chunk``.
+
+Usage:
+    uv run python -m benchmarks.sse_encoder [--events 50000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from langchain_core.messages import AIMessageChunk
+
+import src.server.sse as sse
+from src.server.app import _process_message_chunk
+from src.server.sse import StreamEventEncoder
+
+METADATA = {
+    "checkpoint_ns": "researcher:6b0c1c2e-6a1f-4f7e-9a53-0a6f3c5f1d2b",
+    "langgraph_node": "agent",
+    "langgraph_path": ("__pregel_pull", "agent"),
+    "langgraph_step": 4,
+}
+
+
+async def _run(chunks, reuse_encoder: bool) -> float:
+    encoder = StreamEventEncoder("bench-thread") if reuse_encoder else None
+    start = time.perf_counter()
+    for chunk in chunks:
+        async for _ in _process_message_chunk(
+            chunk, METADATA, "bench-thread", ("researcher:1",), encoder
+        ):
+            pass
+    return len(chunks) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50000)
+    args = parser.parse_args()
+
+    # chat_stream_message logs once per event when the saver is disabled
+    logging.disable(logging.WARNING)
+
+    chunks = []
+    for i in range(args.events):
+        chunk = AIMessageChunk(content=f"token {i} 数据 ", id="run--bench")
+        chunks.append(chunk)
+
+    orjson = sse.orjson
+    backends = [("json", None)] + ([("orjson", orjson)] if orjson else [])
+    for name, backend in backends:
+        sse.orjson = backend
+        for reuse in (False, True):
+            rate = asyncio.run(_run(chunks, reuse))
+            label = "shared encoder" if reuse else "encoder per event"
+            print(f"{name:7s} {label:18s} {rate:12,.0f} events/sec")
+    sse.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
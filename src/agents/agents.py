@@ -1,19 +1,77 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import logging
+
 from langgraph.prebuilt import create_react_agent
 
 from src.config.agents import AGENT_LLM_MAP
+from src.config.configuration import get_int_env
 from src.llms.llm import get_llm_by_type
 from src.prompts import apply_prompt_template
+from src.utils.cache import LRUCache, stable_hash
+
+logger = logging.getLogger(__name__)
+
+# Compiled agents are stateless and can be shared by concurrent steps and runs
+_agent_cache: LRUCache = LRUCache(
+    max_size=get_int_env("AGENT_CACHE_SIZE", 32),
+    ttl=get_int_env("AGENT_CACHE_TTL_SECONDS", 0),
+)
+
+# Tool attributes that do not affect what a tool does
+_IGNORED_TOOL_ATTRIBUTES = frozenset({"callbacks", "callback_manager", "verbose"})
+
+
+def _tool_signature(tool) -> dict:
+    """Describe a tool by its type, schema and configuration, not its identity."""
+    attributes = getattr(tool, "__dict__", {})
+    return {
+        "type": f"{type(tool).__module__}.{type(tool).__qualname__}",
+        "attributes": {
+            k: v for k, v in attributes.items() if k not in _IGNORED_TOOL_ATTRIBUTES
+        },
+    }
+
+
+def get_agent_cache_key(
+    agent_name: str, agent_type: str, tools: list, prompt_template: str
+) -> tuple:
+    """Key of the compiled agent for an agent type, LLM and tool set."""
+    return (
+        agent_name,
+        agent_type,
+        prompt_template,
+        AGENT_LLM_MAP[agent_type],
+        stable_hash([_tool_signature(tool) for tool in tools]),
+    )
 
 
 # Create agents using configured LLM types
 def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template: str):
-    """Factory function to create agents with consistent configuration."""
-    return create_react_agent(
+    """Factory function to create agents with consistent configuration.
+
+    Agents are cached by (agent name, agent type, prompt template, LLM, tool
+    signatures), so repeated steps reuse the compiled ReAct graph.
+    """
+    llm = get_llm_by_type(AGENT_LLM_MAP[agent_type])
+    key = get_agent_cache_key(agent_name, agent_type, tools, prompt_template)
+    cached = _agent_cache.get(key)
+    # The LLM is compared by identity so a reconfigured model is picked up
+    if cached is not None and cached[0] is llm:
+        return cached[1]
+
+    agent = create_react_agent(
         name=agent_name,
-        model=get_llm_by_type(AGENT_LLM_MAP[agent_type]),
+        model=llm,
         tools=tools,
         prompt=lambda state: apply_prompt_template(prompt_template, state),
     )
+    _agent_cache.set(key, (llm, agent))
+    logger.debug(f"Created {agent_type} agent with {len(tools)} tool(s)")
+    return agent
+
+
+def clear_agent_cache() -> None:
+    """Drop all cached agents."""
+    _agent_cache.clear()
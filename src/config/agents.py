@@ -18,3 +18,17 @@ AGENT_LLM_MAP: dict[str, LLMType] = {
     "prose_writer": "basic",
     "prompt_enhancer": "basic",
 }
+
+# Agents whose LLM responses may be cached when LLM_CACHE_ENABLED is set; only
+# deterministic (temperature 0) models are cached
+AGENT_LLM_CACHE: dict[str, bool] = {
+    "coordinator": True,
+    "planner": True,
+    "researcher": False,
+    "coder": False,
+    "reporter": False,
+    "podcast_script_writer": False,
+    "ppt_composer": False,
+    "prose_writer": True,
+    "prompt_enhancer": True,
+}
@@ -77,6 +77,9 @@ class Configuration:
     mcp_settings: dict = None  # MCP settings, including dynamic loaded tools
     report_style: str = ReportStyle.ACADEMIC.value  # Report style
     enable_deep_thinking: bool = False  # Whether to enable deep thinking
+    enable_parallel_steps: bool = False  # Run independent plan steps concurrently
+    max_parallel_steps: int = 3  # Maximum number of plan steps run at once
+    bypass_search_cache: bool = False  # Search again instead of using cached results
 
     @classmethod
     def from_runnable_config(
@@ -2,8 +2,16 @@
 # SPDX-License-Identifier: MIT
 
 from .article import Article
-from .crawler import Crawler
+from .crawler import Crawler, CrawlResult
+from .extraction import ExtractionPool
 from .jina_client import JinaClient
 from .readability_extractor import ReadabilityExtractor
 
-__all__ = ["Article", "Crawler", "JinaClient", "ReadabilityExtractor"]
+__all__ = [
+    "Article",
+    "Crawler",
+    "CrawlResult",
+    "ExtractionPool",
+    "JinaClient",
+    "ReadabilityExtractor",
+]
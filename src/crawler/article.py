@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import re
+from typing import Optional
 from urllib.parse import urljoin
 
 from markdownify import markdownify as md
@@ -10,15 +11,19 @@ from markdownify import markdownify as md
 class Article:
     url: str
 
-    def __init__(self, title: str, html_content: str):
+    def __init__(self, title: str, html_content: str, markdown: Optional[str] = None):
         self.title = title
         self.html_content = html_content
+        # Markdown of the content, converted once
+        self._markdown = markdown
 
     def to_markdown(self, including_title: bool = True) -> str:
+        if self._markdown is None:
+            self._markdown = md(self.html_content)
         markdown = ""
         if including_title:
             markdown += f"# {self.title}\n\n"
-        markdown += md(self.html_content)
+        markdown += self._markdown
         return markdown
 
     def to_message(self) -> list[dict]:
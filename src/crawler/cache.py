@@ -0,0 +1,218 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+On-disk cache of crawled pages and their extracted articles.
+
+Pages are stored by url along with their ETag/Last-Modified validators, and
+the HTML, article and markdown are stored once per distinct HTML content
+(by SHA-256), so a page that was re-fetched unchanged, or is served under
+several urls, is never extracted twice.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src.config.configuration import get_int_env, get_str_env
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contents (
+    content_hash TEXT PRIMARY KEY,
+    html TEXT NOT NULL,
+    title TEXT,
+    article_html TEXT,
+    markdown TEXT,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+"""
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedPage:
+    url: str
+    content_hash: str
+    html: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    title: Optional[str] = None
+    article_html: Optional[str] = None
+    markdown: Optional[str] = None
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    @property
+    def has_article(self) -> bool:
+        return self.article_html is not None
+
+
+class CrawlCache:
+    """
+    SQLite-backed crawl cache with a TTL and a size cap.
+
+    Attributes:
+        path: SQLite file of the cache
+        ttl: Seconds a page is used without asking the server again; stale
+            pages with validators are revalidated instead of re-fetched
+        max_bytes: Size of stored contents above which the least recently
+            used ones are dropped
+    """
+
+    def __init__(self, path: str, ttl: float = 86400, max_bytes: int = 256 << 20):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return not self.ttl or time.time() - page.fetched_at < self.ttl
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT p.content_hash, c.html, p.etag, p.last_modified, "
+                "p.fetched_at, c.title, c.article_html, c.markdown "
+                "FROM pages p JOIN contents c ON c.content_hash = p.content_hash "
+                "WHERE p.url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE contents SET last_access = ? WHERE content_hash = ?",
+                    (time.time(), row[0]),
+                )
+        return CachedPage(url, *row)
+
+    def store_page(
+        self,
+        url: str,
+        html: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CachedPage:
+        """Store a fetched page, keeping the article of identical content."""
+        digest = content_hash(html)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO contents "
+                "(content_hash, html, size, last_access) VALUES (?, ?, ?, ?)",
+                (digest, html, len(html.encode("utf-8")), now),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, content_hash, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, digest, etag, last_modified, now),
+            )
+            self._evict()
+        page = self.lookup(url)
+        if page is None:
+            # Larger than the whole cache, use it uncached
+            page = CachedPage(url, digest, html, etag, last_modified, now)
+        return page
+
+    def revalidated(self, url: str) -> None:
+        """Mark a page as fresh after the server said it is unchanged."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
+
+    def store_article(
+        self, digest: str, title: Optional[str], article_html: str, markdown: str
+    ) -> None:
+        size = sum(
+            len(value.encode("utf-8"))
+            for value in (title or "", article_html or "", markdown or "")
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE contents SET title = ?, article_html = ?, markdown = ?, "
+                "size = size + ? WHERE content_hash = ? AND article_html IS NULL",
+                (title, article_html, markdown, size, digest),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        # Called with the lock held, inside a transaction
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM contents"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT content_hash, size FROM contents ORDER BY last_access"
+        ).fetchall()
+        dropped = []
+        for digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            dropped.append((digest,))
+            total -= size
+        self._conn.executemany("DELETE FROM contents WHERE content_hash = ?", dropped)
+        self._conn.executemany("DELETE FROM pages WHERE content_hash = ?", dropped)
+        logger.debug(f"Evicted {len(dropped)} page(s) from the crawl cache")
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM contents")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_crawl_cache: Optional[CrawlCache] = None
+_crawl_cache_lock = threading.Lock()
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """Return the crawl cache configured by ``CRAWL_CACHE_PATH``, if any."""
+    global _crawl_cache
+    path = get_str_env("CRAWL_CACHE_PATH", "")
+    if not path:
+        return None
+    with _crawl_cache_lock:
+        if _crawl_cache is None or _crawl_cache.path != path:
+            try:
+                _crawl_cache = CrawlCache(
+                    path,
+                    ttl=get_int_env("CRAWL_CACHE_TTL_SECONDS", 86400),
+                    max_bytes=get_int_env("CRAWL_CACHE_MAX_MB", 256) << 20,
+                )
+            except Exception as e:
+                logger.error(f"Failed to open crawl cache at {path}: {e}")
+                return None
+        return _crawl_cache
@@ -0,0 +1,185 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Splitting crawled articles into chunks and ranking them against a query.
+
+Chunks follow the markdown sections of the article and are ranked with
+BM25, so a researcher gets the parts of a page relevant to its step instead
+of the first few hundred characters.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .article import Article
+
+_HEADING = re.compile(r"^#{1,6}\s+(.*?)\s*#*\s*$")
+# markdownify underlines h1/h2 by default
+_UNDERLINE = re.compile(r"^(=+|-+)\s*$")
+# CJK characters are single tokens, other words are runs of word characters
+_CJK = r"\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_TOKEN = re.compile(rf"[{_CJK}]|[^\W{_CJK}]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+@dataclass
+class Chunk:
+    index: int
+    heading: str
+    text: str
+
+    def to_dict(self) -> dict:
+        return {"offset": self.index, "heading": self.heading, "text": self.text}
+
+
+def _split_long(paragraph: str, max_chars: int) -> List[str]:
+    parts = []
+    while len(paragraph) > max_chars:
+        cut = paragraph.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        parts.append(paragraph[:cut].rstrip())
+        paragraph = paragraph[cut:].lstrip()
+    if paragraph:
+        parts.append(paragraph)
+    return parts
+
+
+def split_markdown(markdown: str, max_chars: int = 1200) -> List[Chunk]:
+    """
+    Split markdown into chunks of at most ``max_chars`` characters.
+
+    A chunk never spans two sections; within a section, paragraphs are
+    packed together, and a paragraph longer than ``max_chars`` is split at
+    whitespace.
+    """
+    chunks: List[Chunk] = []
+    heading = ""
+    paragraphs: List[str] = []
+
+    def flush() -> None:
+        current = ""
+        for paragraph in paragraphs:
+            for part in _split_long(paragraph, max_chars):
+                if current and len(current) + 2 + len(part) > max_chars:
+                    chunks.append(Chunk(len(chunks), heading, current))
+                    current = ""
+                current = f"{current}\n\n{part}" if current else part
+        if current:
+            chunks.append(Chunk(len(chunks), heading, current))
+        paragraphs.clear()
+
+    for block in re.split(r"\n\s*\n", markdown):
+        lines = []
+        for line in block.strip().splitlines():
+            match = _HEADING.match(line)
+            if match is not None:
+                title = match.group(1)
+            elif lines and _UNDERLINE.match(line):
+                title = lines.pop().strip()
+            else:
+                lines.append(line)
+                continue
+            if lines:
+                paragraphs.append("\n".join(lines))
+                lines = []
+            flush()
+            heading = title
+        if lines:
+            paragraphs.append("\n".join(lines))
+    flush()
+    return chunks
+
+
+class BM25:
+    """Okapi BM25 over a fixed list of tokenized documents."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._frequencies = [Counter(tokens) for tokens in documents]
+        self._lengths = [len(tokens) for tokens in documents]
+        self._average_length = sum(self._lengths) / len(documents) if documents else 0
+        document_frequencies = Counter(
+            token for frequencies in self._frequencies for token in frequencies
+        )
+        count = len(documents)
+        self._idf = {
+            token: math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for token, df in document_frequencies.items()
+        }
+
+    def scores(self, query: List[str]) -> List[float]:
+        scores = []
+        for frequencies, length in zip(self._frequencies, self._lengths):
+            norm = self.k1 * (
+                1 - self.b + self.b * length / (self._average_length or 1)
+            )
+            score = 0.0
+            for token in set(query):
+                tf = frequencies.get(token)
+                if tf:
+                    score += self._idf[token] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+
+class ChunkedDocument:
+    """A crawled article split into chunks, for ranked and paged reads."""
+
+    def __init__(self, url: str, title: Optional[str], chunks: List[Chunk]):
+        self.url = url
+        self.title = title
+        self.chunks = chunks
+        self._bm25: Optional[BM25] = None
+
+    @classmethod
+    def from_article(
+        cls, url: str, article: Article, max_chars: int = 1200
+    ) -> "ChunkedDocument":
+        markdown = article.to_markdown(including_title=False)
+        return cls(url, article.title, split_markdown(markdown, max_chars))
+
+    def read(self, offset: int = 0, budget: int = 4000) -> List[Chunk]:
+        """Return consecutive chunks from ``offset`` that fit in ``budget``."""
+        selected = []
+        used = 0
+        for chunk in self.chunks[max(0, offset) :]:
+            if selected and used + len(chunk.text) > budget:
+                break
+            selected.append(chunk)
+            used += len(chunk.text)
+        return selected
+
+    def search(self, query: str, top_k: int = 5, budget: int = 4000) -> List[Chunk]:
+        """
+        Return up to ``top_k`` chunks most relevant to ``query`` that fit in
+        ``budget``, in document order. Chunks sharing no term with the query
+        are left out unless nothing matches, in which case the document is
+        read from the start.
+        """
+        if self._bm25 is None:
+            self._bm25 = BM25([tokenize(f"{c.heading}\n{c.text}") for c in self.chunks])
+        scores = self._bm25.scores(tokenize(query))
+        ranked = sorted(
+            (i for i, score in enumerate(scores) if score > 0),
+            key=lambda i: -scores[i],
+        )
+        if not ranked:
+            return self.read(0, budget)
+        selected = []
+        used = 0
+        for i in ranked[:top_k]:
+            chunk = self.chunks[i]
+            if selected and used + len(chunk.text) > budget:
+                continue
+            selected.append(chunk)
+            used += len(chunk.text)
+        return sorted(selected, key=lambda chunk: chunk.index)
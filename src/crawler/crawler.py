@@ -1,13 +1,122 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from src.config.configuration import get_int_env
 
 from .article import Article
-from .jina_client import JinaClient
+from .cache import CachedPage, CrawlCache, get_crawl_cache
+from .extraction import get_extraction_pool, limit_html
+from .jina_client import JinaClient, JinaResponse
 from .readability_extractor import ReadabilityExtractor
 
+logger = logging.getLogger(__name__)
+
+# Per event loop: semaphores limiting concurrent crawls of each site
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def _host_semaphore(url: str, limit: int) -> asyncio.Semaphore:
+    semaphores = _host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    host = urlparse(url).netloc.lower()
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(limit)
+    return semaphores[host]
+
+
+def _validators(page: Optional[CachedPage]) -> dict:
+    if page is None:
+        return {}
+    return {"etag": page.etag, "last_modified": page.last_modified}
+
+
+def _store_response(
+    cache: CrawlCache,
+    url: str,
+    page: Optional[CachedPage],
+    response: JinaResponse,
+) -> CachedPage:
+    if response.not_modified and page is not None:
+        cache.revalidated(url)
+        return page
+    return cache.store_page(url, response.text, response.etag, response.last_modified)
+
+
+def _extract(html: str) -> Article:
+    pool = get_extraction_pool()
+    if pool is not None:
+        return pool.extract(html)
+    return ReadabilityExtractor().extract_article(limit_html(html))
+
+
+async def _aextract(html: str) -> Article:
+    pool = get_extraction_pool()
+    if pool is not None:
+        return await pool.aextract(html)
+    # Readability is CPU-bound, keep it off the event loop
+    return await asyncio.to_thread(
+        ReadabilityExtractor().extract_article, limit_html(html)
+    )
+
+
+def _store_article(cache: CrawlCache, page: CachedPage, article: Article) -> Article:
+    cache.store_article(
+        page.content_hash,
+        article.title,
+        article.html_content,
+        article.to_markdown(including_title=False),
+    )
+    article.url = page.url
+    return article
+
+
+def _cached_article(cache: CrawlCache, page: CachedPage) -> Optional[Article]:
+    """Return the article of a cached page, if it was extracted already."""
+    if not page.has_article:
+        return None
+    article = Article(page.title, page.article_html, markdown=page.markdown)
+    article.url = page.url
+    return article
+
+
+@dataclass
+class CrawlResult:
+    """Outcome of crawling one url of a batch."""
+
+    url: str
+    article: Optional[Article] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 
 class Crawler:
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+    ):
+        self.max_concurrency = max(
+            1,
+            max_concurrency
+            if max_concurrency is not None
+            else get_int_env("CRAWL_MAX_CONCURRENCY", 5),
+        )
+        self.per_host_concurrency = max(
+            1,
+            per_host_concurrency
+            if per_host_concurrency is not None
+            else get_int_env("CRAWL_PER_HOST_CONCURRENCY", 2),
+        )
+
     def crawl(self, url: str) -> Article:
         # To help LLMs better understand content, we extract clean
         # articles from HTML, convert them to markdown, and split
@@ -19,9 +128,67 @@ class Crawler:
         #
         # Instead of using Jina's own markdown converter, we'll use
         # our own solution to get better readability results.
+        cache = get_crawl_cache()
+        if cache is not None:
+            page = cache.lookup(url)
+            if page is None or not cache.is_fresh(page):
+                response = JinaClient().fetch(url, "html", **_validators(page))
+                page = _store_response(cache, url, page, response)
+            return _cached_article(cache, page) or _store_article(
+                cache, page, _extract(page.html)
+            )
+
         jina_client = JinaClient()
         html = jina_client.crawl(url, return_format="html")
-        extractor = ReadabilityExtractor()
-        article = extractor.extract_article(html)
+        article = _extract(html)
         article.url = url
         return article
+
+    async def acrawl(self, url: str) -> Article:
+        """Crawl a url without blocking the event loop."""
+        cache = get_crawl_cache()
+        if cache is not None:
+            page = cache.lookup(url)
+            if page is None or not cache.is_fresh(page):
+                response = await JinaClient().afetch(url, "html", **_validators(page))
+                page = _store_response(cache, url, page, response)
+            article = _cached_article(cache, page)
+            if article is not None:
+                return article
+            article = await _aextract(page.html)
+            # Markdown conversion is CPU-bound too unless done by the pool
+            return await asyncio.to_thread(_store_article, cache, page, article)
+
+        html = await JinaClient().acrawl(url, return_format="html")
+        article = await _aextract(html)
+        article.url = url
+        return article
+
+    async def crawl_many(self, urls: Iterable[str]) -> AsyncIterator[CrawlResult]:
+        """
+        Crawl urls concurrently and yield their results as they complete.
+
+        At most ``max_concurrency`` urls are crawled at once, and at most
+        ``per_host_concurrency`` of them on the same site. Failures are
+        yielded as results with an ``error`` instead of being raised.
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+        limit = asyncio.Semaphore(self.max_concurrency)
+
+        async def crawl_one(url: str) -> CrawlResult:
+            async with _host_semaphore(url, self.per_host_concurrency), limit:
+                try:
+                    return CrawlResult(url=url, article=await self.acrawl(url))
+                except Exception as e:
+                    logger.warning(f"Failed to crawl {url}: {e!r}")
+                    return CrawlResult(url=url, error=e)
+
+        tasks = [asyncio.create_task(crawl_one(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
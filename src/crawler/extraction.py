@@ -0,0 +1,156 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Process pool for article extraction.
+
+Readability (which may spawn node) and markdownify are CPU-bound; run in
+threads they still hold the GIL and stall every other stream served by the
+process. :class:`ExtractionPool` runs both in worker processes instead.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional, Tuple
+
+from src.config.configuration import get_int_env
+
+from .article import Article
+from .readability_extractor import ReadabilityExtractor
+
+logger = logging.getLogger(__name__)
+
+
+def limit_html(html: str, max_bytes: Optional[int] = None) -> str:
+    """Cut pages larger than ``max_bytes``, which extraction can't cope with."""
+    if max_bytes is None:
+        max_bytes = get_int_env("CRAWL_MAX_HTML_BYTES", 5 << 20)
+    if not max_bytes or len(html) <= max_bytes // 4:
+        return html
+    encoded = html.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return html
+    logger.warning(f"Truncating {len(encoded)} bytes of HTML to {max_bytes}")
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
+
+def _extract_in_worker(html: str) -> Tuple[str, str, str]:
+    article = ReadabilityExtractor().extract_article(html)
+    return article.title, article.html_content, article.to_markdown(False)
+
+
+class ExtractionPool:
+    """
+    Extracts articles in worker processes.
+
+    Attributes:
+        max_workers: Number of worker processes
+        timeout: Seconds an extraction may run; the pool is restarted when
+            one times out, as a busy worker can't be interrupted otherwise.
+            Pages wait for a free worker before their timeout starts.
+        max_html_bytes: Pages are truncated to this size before extraction
+    """
+
+    def __init__(
+        self, max_workers: int = 2, timeout: float = 30, max_html_bytes: int = 5 << 20
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.max_html_bytes = max_html_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._async_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        # Stop the stuck worker; queued extractions fail and are not retried
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    @staticmethod
+    def _article(result: Tuple[str, str, str]) -> Article:
+        title, html_content, markdown = result
+        return Article(title, html_content, markdown=markdown)
+
+    def extract(self, html: str) -> Article:
+        """Extract an article, blocking until a worker is done with it."""
+        html = limit_html(html, self.max_html_bytes)
+        with self._slots:
+            executor = self._get_executor()
+            future = executor.submit(_extract_in_worker, html)
+            try:
+                return self._article(future.result(timeout=self.timeout or None))
+            except FutureTimeoutError:
+                self._restart(executor)
+                raise TimeoutError(f"Article extraction took over {self.timeout}s")
+
+    async def aextract(self, html: str) -> Article:
+        """Extract an article without blocking the event loop."""
+        html = limit_html(html, self.max_html_bytes)
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_slots:
+            self._async_slots[loop] = asyncio.Semaphore(self.max_workers)
+        async with self._async_slots[loop]:
+            executor = self._get_executor()
+            future = executor.submit(_extract_in_worker, html)
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.wrap_future(future), self.timeout or None
+                )
+            except asyncio.TimeoutError:
+                self._restart(executor)
+                raise TimeoutError(f"Article extraction took over {self.timeout}s")
+        return self._article(result)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_extraction_pool: Optional[ExtractionPool] = None
+_extraction_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> Optional[ExtractionPool]:
+    """
+    Return the pool configured by ``CRAWL_EXTRACTION_WORKERS``, or None to
+    extract in the calling process.
+    """
+    global _extraction_pool
+    workers = get_int_env("CRAWL_EXTRACTION_WORKERS", 0)
+    if workers <= 0:
+        return None
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ExtractionPool(
+                max_workers=workers,
+                timeout=get_int_env("CRAWL_EXTRACTION_TIMEOUT_SECONDS", 30),
+                max_html_bytes=get_int_env("CRAWL_MAX_HTML_BYTES", 5 << 20),
+            )
+        return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _extraction_pool
+    with _extraction_pool_lock:
+        pool, _extraction_pool = _extraction_pool, None
+    if pool is not None:
+        pool.shutdown()
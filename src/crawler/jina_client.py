@@ -1,16 +1,66 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
 import os
+from dataclasses import dataclass
+from typing import Optional
 
-import requests
+import httpx
+
+from src.config.configuration import get_int_env
+from src.utils.http_client import get_async_http_client, get_http_client
 
 logger = logging.getLogger(__name__)
 
+JINA_READER_URL = "https://r.jina.ai/"
+
+# Jina answers these when it is overloaded or the target site is slow
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class JinaResponse:
+    status_code: int
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+    @classmethod
+    def from_httpx(cls, response: httpx.Response) -> "JinaResponse":
+        return cls(
+            status_code=response.status_code,
+            text=response.text,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+
 
 class JinaClient:
-    def crawl(self, url: str, return_format: str = "html") -> str:
+    def __init__(
+        self, timeout: Optional[float] = None, max_retries: Optional[int] = None
+    ):
+        self.timeout = (
+            timeout if timeout is not None else get_int_env("CRAWL_TIMEOUT_SECONDS", 30)
+        )
+        self.max_retries = (
+            max_retries
+            if max_retries is not None
+            else get_int_env("CRAWL_MAX_RETRIES", 2)
+        )
+
+    def _request(
+        self,
+        url: str,
+        return_format: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> dict:
         headers = {
             "Content-Type": "application/json",
             "X-Return-Format": return_format,
@@ -21,6 +71,63 @@ class JinaClient:
             logger.warning(
                 "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
             )
-        data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
-        return response.text
+        # Revalidate a cached copy instead of downloading it again
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return {"headers": headers, "json": {"url": url}, "timeout": self.timeout}
+
+    def fetch(
+        self,
+        url: str,
+        return_format: str = "html",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> JinaResponse:
+        response = get_http_client().post(
+            JINA_READER_URL, **self._request(url, return_format, etag, last_modified)
+        )
+        return JinaResponse.from_httpx(response)
+
+    def crawl(self, url: str, return_format: str = "html") -> str:
+        return self.fetch(url, return_format).text
+
+    async def afetch(
+        self,
+        url: str,
+        return_format: str = "html",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> JinaResponse:
+        """
+        Fetch a url over the shared async client, retrying transient failures
+        with exponential backoff.
+
+        Raises:
+            httpx.HTTPError: If the page could not be fetched
+        """
+        request = self._request(url, return_format, etag, last_modified)
+        for attempt in range(self.max_retries + 1):
+            retrying = attempt < self.max_retries
+            try:
+                response = await get_async_http_client().post(
+                    JINA_READER_URL, **request
+                )
+            except httpx.TransportError as e:
+                if not retrying:
+                    raise
+                logger.warning(f"Crawling {url} failed, retrying: {e!r}")
+            else:
+                if response.status_code not in _RETRYABLE_STATUS or not retrying:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return JinaResponse.from_httpx(response)
+                logger.warning(
+                    f"Crawling {url} got HTTP {response.status_code}, retrying"
+                )
+            await asyncio.sleep(0.5 * 2**attempt)
+
+    async def acrawl(self, url: str, return_format: str = "html") -> str:
+        """Crawl a url without blocking; see :meth:`afetch`."""
+        return (await self.afetch(url, return_format)).text
@@ -1,9 +1,12 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .builder import build_graph, build_graph_with_memory
+from .builder import build_graph, build_graph_with_checkpointer, build_graph_with_memory
+from .registry import GraphRegistry
 
 __all__ = [
     "build_graph_with_memory",
+    "build_graph_with_checkpointer",
     "build_graph",
+    "GraphRegistry",
 ]
@@ -1,25 +1,52 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+from typing import Optional
+
+from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
 
+from src.config.configuration import Configuration
 from src.prompts.planner_model import StepType
 
 from .nodes import (
-    background_investigation_node,
+    abackground_investigation_node,
+    acoordinator_node,
+    aplanner_node,
+    areporter_node,
     coder_node,
-    coordinator_node,
     human_feedback_node,
-    planner_node,
-    reporter_node,
     research_team_node,
     researcher_node,
 )
+from .scheduler import StepScheduler
 from .types import State
 
 
-def continue_to_running_research_team(state: State):
+def _step_node(step) -> Optional[str]:
+    if step.step_type == StepType.RESEARCH:
+        return "researcher"
+    if step.step_type == StepType.PROCESSING:
+        return "coder"
+    return None
+
+
+def _fan_out_ready_steps(state: State, max_parallel_steps: int):
+    current_plan = state["current_plan"]
+    ready = StepScheduler.from_plan(current_plan).ready()
+    sends = []
+    for index in ready[: max(1, int(max_parallel_steps))]:
+        node = _step_node(current_plan.steps[index])
+        if node is not None:
+            sends.append(Send(node, {**state, "step_index": index}))
+    return sends or "planner"
+
+
+def continue_to_running_research_team(
+    state: State, config: Optional[RunnableConfig] = None
+):
     current_plan = state.get("current_plan")
     if not current_plan or not current_plan.steps:
         return "planner"
@@ -27,6 +54,10 @@ def continue_to_running_research_team(state: State):
     if all(step.execution_res for step in current_plan.steps):
         return "planner"
 
+    configurable = Configuration.from_runnable_config(config)
+    if configurable.enable_parallel_steps:
+        return _fan_out_ready_steps(state, configurable.max_parallel_steps)
+
     # Find first incomplete step
     incomplete_step = None
     for step in current_plan.steps:
@@ -48,10 +79,10 @@ def _build_base_graph():
     """Build and return the base state graph with all nodes and edges."""
     builder = StateGraph(State)
     builder.add_edge(START, "coordinator")
-    builder.add_node("coordinator", coordinator_node)
-    builder.add_node("background_investigator", background_investigation_node)
-    builder.add_node("planner", planner_node)
-    builder.add_node("reporter", reporter_node)
+    builder.add_node("coordinator", acoordinator_node)
+    builder.add_node("background_investigator", abackground_investigation_node)
+    builder.add_node("planner", aplanner_node)
+    builder.add_node("reporter", areporter_node)
     builder.add_node("research_team", research_team_node)
     builder.add_node("researcher", researcher_node)
     builder.add_node("coder", coder_node)
@@ -77,6 +108,12 @@ def build_graph_with_memory():
     return builder.compile(checkpointer=memory)
 
 
+def build_graph_with_checkpointer(checkpointer, store=None):
+    """Build and return the agent workflow graph bound to the given checkpointer."""
+    builder = _build_base_graph()
+    return builder.compile(checkpointer=checkpointer, store=store)
+
+
 def build_graph():
     """Build and return the agent workflow graph without memory."""
     # build state graph
@@ -1,16 +1,28 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import json
 import logging
 import uuid
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import List, Optional
 import psycopg
 from psycopg.rows import dict_row
 from pymongo import MongoClient
-from langgraph.store.memory import InMemoryStore
-from src.config.configuration import get_bool_env, get_str_env
+from src.config.configuration import get_bool_env, get_int_env, get_str_env
+from src.graph.stream_buffer import StreamBufferStore
+from src.graph.stream_writer import (
+    CREATE_CHAT_STREAM_CHUNKS_TABLE_SQL,
+    CREATE_CHAT_STREAMS_TABLE_SQL,
+    INSERT_CHAT_STREAM_CHUNK_SQL,
+    STORAGE_MODE_BLOB,
+    STORAGE_MODE_CHUNKS,
+    STORAGE_MODES,
+    UPSERT_CHAT_STREAM_SQL,
+    BatchedStreamWriter,
+    create_stream_backend,
+)
 
 
 class ChatStreamManager:
@@ -18,19 +30,36 @@ class ChatStreamManager:
     Manages chat stream messages with persistent storage and in-memory caching.
 
     This class handles the storage and retrieval of chat messages using both
-    an in-memory store for temporary data and MongoDB or PostgreSQL for persistent storage.
-    It tracks message chunks and consolidates them when a conversation finishes.
+    per-thread in-memory buffers for temporary data and MongoDB or PostgreSQL for
+    persistent storage. Chunks are appended to the thread's buffer while streaming;
+    when a conversation finishes the buffered range is appended to the stored
+    conversation and the buffer is evicted.
+
+    When an async writer is enabled and a conversation finishes inside a running
+    event loop, the buffered chunks are handed to a background :class:`BatchedStreamWriter`
+    instead of being written synchronously, so the caller never blocks on database I/O.
 
     Attributes:
-        store (InMemoryStore): In-memory storage for temporary message chunks
+        buffers (StreamBufferStore): Per-thread buffers of not yet persisted chunks
         mongo_client (MongoClient): MongoDB client connection
         mongo_db (Database): MongoDB database instance
         postgres_conn (psycopg.Connection): PostgreSQL connection
+        writer (BatchedStreamWriter): Background writer used inside event loops
         logger (logging.Logger): Logger instance for this class
     """
 
     def __init__(
-        self, checkpoint_saver: bool = False, db_uri: Optional[str] = None
+        self,
+        checkpoint_saver: bool = False,
+        db_uri: Optional[str] = None,
+        async_writer: bool = False,
+        writer_batch_size: int = 64,
+        writer_flush_interval: float = 0.05,
+        buffer_max_threads: int = 0,
+        buffer_max_bytes: int = 0,
+        buffer_ttl: float = 0,
+        buffer_spill_dir: Optional[str] = None,
+        storage_mode: str = STORAGE_MODE_BLOB,
     ) -> None:
         """
         Initialize the ChatStreamManager with database connections.
@@ -38,17 +67,47 @@ class ChatStreamManager:
         Args:
             db_uri: Database connection URI. Supports MongoDB (mongodb://) and PostgreSQL (postgresql://)
                    If None, uses LANGGRAPH_CHECKPOINT_DB_URL env var or defaults to localhost
+            async_writer: Persist from a background task when called inside an event loop
+            writer_batch_size: Maximum number of threads written per batch by the async writer
+            writer_flush_interval: Seconds the async writer waits to coalesce writes
+            buffer_max_threads: Maximum number of threads buffered in memory (0 = unbounded)
+            buffer_max_bytes: Maximum total size of buffered chunks (0 = unbounded)
+            buffer_ttl: Seconds after which an idle thread's buffer is evicted (0 = never)
+            buffer_spill_dir: Directory receiving evicted chunks; dropped if not set
+            storage_mode: "blob" appends to one messages array per thread,
+                   "chunks" stores one row/document per chunk in chat_stream_chunks
         """
         self.logger = logging.getLogger(__name__)
-        self.store = InMemoryStore()
+        self.buffers = StreamBufferStore(
+            max_threads=buffer_max_threads,
+            max_bytes=buffer_max_bytes,
+            ttl=buffer_ttl,
+            spill_dir=buffer_spill_dir,
+        )
         self.checkpoint_saver = checkpoint_saver
         # Use provided URI or fall back to environment variable or default
         self.db_uri = db_uri
+        if storage_mode not in STORAGE_MODES:
+            self.logger.warning(
+                f"Unsupported storage mode: {storage_mode}. "
+                f"Supported modes: {', '.join(STORAGE_MODES)}"
+            )
+            storage_mode = STORAGE_MODE_BLOB
+        self.storage_mode = storage_mode
 
         # Initialize database connections
         self.mongo_client = None
         self.mongo_db = None
         self.postgres_conn = None
+        self.writer = None
+
+        if self.checkpoint_saver and async_writer and self.db_uri:
+            if create_stream_backend(self.db_uri) is not None:
+                self.writer = BatchedStreamWriter(
+                    lambda: create_stream_backend(self.db_uri, self.storage_mode),
+                    batch_size=writer_batch_size,
+                    flush_interval=writer_flush_interval,
+                )
 
         if self.checkpoint_saver:
             if self.db_uri.startswith("mongodb://"):
@@ -74,6 +133,10 @@ class ChatStreamManager:
             # Test connection
             self.mongo_client.admin.command("ping")
             self.logger.info("Successfully connected to MongoDB")
+            if self.storage_mode == STORAGE_MODE_CHUNKS:
+                self.mongo_db.chat_stream_chunks.create_index(
+                    [("thread_id", 1), ("_id", 1)]
+                )
         except Exception as e:
             self.logger.error(f"Failed to connect to MongoDB: {e}")
 
@@ -88,21 +151,13 @@ class ChatStreamManager:
             self.logger.error(f"Failed to connect to PostgreSQL: {e}")
 
     def _create_chat_streams_table(self) -> None:
-        """Create the chat_streams table if it doesn't exist."""
+        """Create the chat_streams (or chat_stream_chunks) table if it doesn't exist."""
         try:
             with self.postgres_conn.cursor() as cursor:
-                create_table_sql = """
-                CREATE TABLE IF NOT EXISTS chat_streams (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    thread_id VARCHAR(255) NOT NULL UNIQUE,
-                    messages JSONB NOT NULL,
-                    ts TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
-                );
-                
-                CREATE INDEX IF NOT EXISTS idx_chat_streams_thread_id ON chat_streams(thread_id);
-                CREATE INDEX IF NOT EXISTS idx_chat_streams_ts ON chat_streams(ts);
-                """
-                cursor.execute(create_table_sql)
+                if self.storage_mode == STORAGE_MODE_CHUNKS:
+                    cursor.execute(CREATE_CHAT_STREAM_CHUNKS_TABLE_SQL)
+                else:
+                    cursor.execute(CREATE_CHAT_STREAMS_TABLE_SQL)
                 self.postgres_conn.commit()
                 self.logger.info("Chat streams table created/verified successfully")
         except Exception as e:
@@ -137,29 +192,12 @@ class ChatStreamManager:
             return False
 
         try:
-            # Create namespace for this thread's messages
-            store_namespace: Tuple[str, str] = ("messages", thread_id)
-
-            # Get or initialize message cursor for tracking chunks
-            cursor = self.store.get(store_namespace, "cursor")
-            current_index = 0
-
-            if cursor is None:
-                # Initialize cursor for new conversation
-                self.store.put(store_namespace, "cursor", {"index": 0})
-            else:
-                # Increment index for next chunk
-                current_index = int(cursor.value.get("index", 0)) + 1
-                self.store.put(store_namespace, "cursor", {"index": current_index})
-
-            # Store the current message chunk
-            self.store.put(store_namespace, f"chunk_{current_index}", message)
+            # Append the chunk to the thread's buffer
+            self.buffers.append(thread_id, message)
 
             # Check if conversation is complete and should be persisted
             if finish_reason in ("stop", "interrupt"):
-                return self._persist_complete_conversation(
-                    thread_id, store_namespace, current_index
-                )
+                return self._persist_complete_conversation(thread_id)
 
             return True
 
@@ -169,147 +207,138 @@ class ChatStreamManager:
             )
             return False
 
-    def _persist_complete_conversation(
-        self, thread_id: str, store_namespace: Tuple[str, str], final_index: int
-    ) -> bool:
+    def _persist_complete_conversation(self, thread_id: str) -> bool:
         """
         Persist completed conversation to database (MongoDB or PostgreSQL).
 
-        Retrieves all message chunks from memory store and saves the complete
-        conversation to the configured database for permanent storage.
+        Detaches the thread's buffered chunks and appends them to the stored
+        conversation. The buffer is evicted once the chunks are handed off; if
+        the write fails they are put back so the next attempt includes them.
 
         Args:
             thread_id: Unique identifier for the conversation thread
-            store_namespace: Namespace tuple for accessing stored messages
-            final_index: The final chunk index for this conversation
 
         Returns:
             bool: True if persistence was successful, False otherwise
         """
+        messages: List[str] = []
         try:
-            # Retrieve all message chunks from memory store
-            # Get all messages up to the final index including cursor metadata
-            memories = self.store.search(store_namespace, limit=final_index + 2)
-
-            # Extract message content, filtering out cursor metadata
-            messages: List[str] = []
-            for item in memories:
-                value = item.dict().get("value", "")
-                # Skip cursor metadata, only include actual message chunks
-                if value and not isinstance(value, dict):
-                    messages.append(str(value))
+            if not self.checkpoint_saver:
+                self.logger.warning("Checkpoint saver is disabled")
+                self.buffers.pop(thread_id)
+                return False
 
+            messages = self.buffers.pop(thread_id)
             if not messages:
                 self.logger.warning(f"No messages found for thread {thread_id}")
                 return False
 
-            if not self.checkpoint_saver:
-                self.logger.warning("Checkpoint saver is disabled")
-                return False
-
+            # Inside the event loop, hand the chunks to the background writer
+            if self.writer is not None and _has_running_loop():
+                persisted = self.writer.submit(thread_id, messages)
             # Choose persistence method based on available connection
-            if self.mongo_db is not None:
-                return self._persist_to_mongodb(thread_id, messages)
+            elif self.mongo_db is not None:
+                persisted = self._persist_to_mongodb(thread_id, messages)
             elif self.postgres_conn is not None:
-                return self._persist_to_postgresql(thread_id, messages)
+                persisted = self._persist_to_postgresql(thread_id, messages)
             else:
                 self.logger.warning("No database connection available")
                 return False
 
+            if not persisted:
+                self.buffers.restore(thread_id, messages)
+            return persisted
+
         except Exception as e:
             self.logger.error(
                 f"Error persisting conversation for thread {thread_id}: {e}"
             )
+            self.buffers.restore(thread_id, messages)
             return False
 
     def _persist_to_mongodb(self, thread_id: str, messages: List[str]) -> bool:
-        """Persist conversation to MongoDB."""
+        """Append the new messages of a conversation to MongoDB."""
         try:
-            # Get MongoDB collection for chat streams
-            collection = self.mongo_db.chat_streams
-
-            # Check if conversation already exists in database
-            existing_document = collection.find_one({"thread_id": thread_id})
-
             current_timestamp = datetime.now()
 
-            if existing_document:
-                # Update existing conversation with new messages
-                update_result = collection.update_one(
-                    {"thread_id": thread_id},
-                    {"$set": {"messages": messages, "ts": current_timestamp}},
+            if self.storage_mode == STORAGE_MODE_CHUNKS:
+                # One document per chunk, ordered by _id
+                insert_result = self.mongo_db.chat_stream_chunks.insert_many(
+                    [
+                        {
+                            "thread_id": thread_id,
+                            "message": message,
+                            "ts": current_timestamp,
+                        }
+                        for message in messages
+                    ],
+                    ordered=True,
                 )
                 self.logger.info(
-                    f"Updated conversation for thread {thread_id}: "
-                    f"{update_result.modified_count} documents modified"
+                    f"Appended {len(insert_result.inserted_ids)} chunks "
+                    f"for thread {thread_id}"
                 )
-                return update_result.modified_count > 0
-            else:
-                # Create new conversation document
-                new_document = {
-                    "thread_id": thread_id,
-                    "messages": messages,
-                    "ts": current_timestamp,
-                    "id": uuid.uuid4().hex,
-                }
-                insert_result = collection.insert_one(new_document)
+                return len(insert_result.inserted_ids) == len(messages)
+
+            # Create the conversation or append to it in a single round trip
+            update_result = self.mongo_db.chat_streams.update_one(
+                {"thread_id": thread_id},
+                {
+                    "$push": {"messages": {"$each": messages}},
+                    "$set": {"ts": current_timestamp},
+                    "$setOnInsert": {"id": uuid.uuid4().hex},
+                },
+                upsert=True,
+            )
+            if update_result.upserted_id is not None:
                 self.logger.info(
-                    f"Created new conversation: {insert_result.inserted_id}"
+                    f"Created new conversation: {update_result.upserted_id}"
                 )
-                return insert_result.inserted_id is not None
+                return True
+            self.logger.info(
+                f"Updated conversation for thread {thread_id}: "
+                f"{update_result.modified_count} documents modified"
+            )
+            return update_result.modified_count > 0
 
         except Exception as e:
             self.logger.error(f"Error persisting to MongoDB: {e}")
             return False
 
     def _persist_to_postgresql(self, thread_id: str, messages: List[str]) -> bool:
-        """Persist conversation to PostgreSQL."""
+        """Append the new messages of a conversation to PostgreSQL."""
         try:
             with self.postgres_conn.cursor() as cursor:
-                # Check if conversation already exists
-                cursor.execute(
-                    "SELECT id FROM chat_streams WHERE thread_id = %s", (thread_id,)
-                )
-                existing_record = cursor.fetchone()
-
                 current_timestamp = datetime.now()
-                messages_json = json.dumps(messages)
-
-                if existing_record:
-                    # Update existing conversation with new messages
-                    cursor.execute(
-                        """
-                        UPDATE chat_streams 
-                        SET messages = %s, ts = %s 
-                        WHERE thread_id = %s
-                        """,
-                        (messages_json, current_timestamp, thread_id),
-                    )
-                    affected_rows = cursor.rowcount
-                    self.postgres_conn.commit()
 
-                    self.logger.info(
-                        f"Updated conversation for thread {thread_id}: "
-                        f"{affected_rows} rows modified"
-                    )
-                    return affected_rows > 0
-                else:
-                    # Create new conversation record
-                    conversation_id = uuid.uuid4()
-                    cursor.execute(
-                        """
-                        INSERT INTO chat_streams (id, thread_id, messages, ts) 
-                        VALUES (%s, %s, %s, %s)
-                        """,
-                        (conversation_id, thread_id, messages_json, current_timestamp),
+                if self.storage_mode == STORAGE_MODE_CHUNKS:
+                    # One row per chunk, ordered by id
+                    cursor.executemany(
+                        INSERT_CHAT_STREAM_CHUNK_SQL,
+                        [
+                            (thread_id, message, current_timestamp)
+                            for message in messages
+                        ],
                     )
-                    affected_rows = cursor.rowcount
                     self.postgres_conn.commit()
-
                     self.logger.info(
-                        f"Created new conversation with ID: {conversation_id}"
+                        f"Appended {len(messages)} chunks for thread {thread_id}"
                     )
-                    return affected_rows > 0
+                    return True
+
+                # Create the conversation or append to it in a single statement
+                cursor.execute(
+                    UPSERT_CHAT_STREAM_SQL,
+                    (uuid.uuid4(), thread_id, json.dumps(messages), current_timestamp),
+                )
+                affected_rows = cursor.rowcount
+                self.postgres_conn.commit()
+
+                self.logger.info(
+                    f"Upserted conversation for thread {thread_id}: "
+                    f"{affected_rows} rows modified"
+                )
+                return affected_rows > 0
 
         except Exception as e:
             self.logger.error(f"Error persisting to PostgreSQL: {e}")
@@ -317,6 +346,12 @@ class ChatStreamManager:
                 self.postgres_conn.rollback()
             return False
 
+    async def aclose(self) -> None:
+        """Flush the async writer, then close database connections."""
+        if self.writer is not None:
+            await self.writer.aclose()
+        self.close()
+
     def close(self) -> None:
         """Close database connections."""
         try:
@@ -333,6 +368,14 @@ class ChatStreamManager:
         except Exception as e:
             self.logger.error(f"Error closing PostgreSQL connection: {e}")
 
+    def stats(self) -> dict:
+        """Return buffer and writer metrics of this manager."""
+        stats = self.buffers.stats()
+        stats["writer_pending_threads"] = (
+            self.writer.pending_count if self.writer is not None else 0
+        )
+        return stats
+
     def __enter__(self):
         """Context manager entry."""
         return self
@@ -342,14 +385,42 @@ class ChatStreamManager:
         self.close()
 
 
+def _has_running_loop() -> bool:
+    """Return True when called from a coroutine running on an event loop."""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
 # Global instance for backward compatibility
 # TODO: Consider using dependency injection instead of global instance
 _default_manager = ChatStreamManager(
     checkpoint_saver=get_bool_env("LANGGRAPH_CHECKPOINT_SAVER", False),
     db_uri=get_str_env("LANGGRAPH_CHECKPOINT_DB_URL", "mongodb://localhost:27017"),
+    async_writer=get_bool_env("LANGGRAPH_CHECKPOINT_ASYNC_WRITER", True),
+    writer_batch_size=get_int_env("LANGGRAPH_CHECKPOINT_WRITER_BATCH_SIZE", 64),
+    writer_flush_interval=get_int_env("LANGGRAPH_CHECKPOINT_WRITER_FLUSH_MS", 50)
+    / 1000,
+    buffer_max_threads=get_int_env("LANGGRAPH_CHECKPOINT_BUFFER_MAX_THREADS", 1024),
+    buffer_max_bytes=get_int_env("LANGGRAPH_CHECKPOINT_BUFFER_MAX_BYTES", 64 << 20),
+    buffer_ttl=get_int_env("LANGGRAPH_CHECKPOINT_BUFFER_TTL_SECONDS", 3600),
+    buffer_spill_dir=get_str_env("LANGGRAPH_CHECKPOINT_BUFFER_SPILL_DIR") or None,
+    storage_mode=get_str_env("LANGGRAPH_CHECKPOINT_STORAGE_MODE", STORAGE_MODE_BLOB),
 )
 
 
+async def close_chat_stream_manager() -> None:
+    """Flush pending chat streams and close the default manager's connections."""
+    await _default_manager.aclose()
+
+
+def get_chat_stream_stats() -> dict:
+    """Return resident thread/byte counts and eviction metrics of chat streams."""
+    return _default_manager.stats()
+
+
 def chat_stream_message(thread_id: str, message: str, finish_reason: str) -> bool:
     """
     Legacy function wrapper for backward compatibility.
@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import copy
 import json
 import logging
 import os
@@ -9,25 +10,31 @@ from typing import Annotated, Literal
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.types import Command, interrupt
 
 from src.agents import create_agent
 from src.config.agents import AGENT_LLM_MAP
 from src.config.configuration import Configuration
+from src.llms.cache import with_llm_cache
 from src.llms.llm import get_llm_by_type
 from src.prompts.planner_model import Plan
 from src.prompts.template import apply_prompt_template
 from src.tools import (
+    crawl_many_tool,
     crawl_tool,
     get_retriever_tool,
     get_web_search_tool,
     python_repl_tool,
+    read_crawled_page_tool,
 )
+from src.tools.mcp_registry import mcp_tool_registry
+from src.tools.mcp_session_pool import PooledMCPClient
 from src.tools.search import LoggedTavilySearch
+from src.tools.search_cache import bypass_search_cache
 from src.utils.json_utils import repair_json_output
 
 from ..config import SELECTED_SEARCH_ENGINE, SearchEngine
+from .scheduler import StepScheduler
 from .types import State
 
 logger = logging.getLogger(__name__)
@@ -98,32 +105,21 @@ def handoff_to_planner(
     return
 
 
-def background_investigation_node(state: State, config: RunnableConfig):
-    logger.info("background investigation node is running.")
-    configurable = Configuration.from_runnable_config(config)
-    query = state.get("research_topic")
+def _background_investigation_update(searched_content, tavily: bool) -> dict:
     background_investigation_results = None
-    if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
-        searched_content = LoggedTavilySearch(
-            max_results=configurable.max_search_results
-        ).invoke(query)
-        if isinstance(searched_content, list):
-            background_investigation_results = [
-                f"## {elem['title']}\n\n{elem['content']}" for elem in searched_content
-            ]
-            return {
-                "background_investigation_results": "\n\n".join(
-                    background_investigation_results
-                )
-            }
-        else:
-            logger.error(
-                f"Tavily search returned malformed response: {searched_content}"
+    if not tavily:
+        background_investigation_results = searched_content
+    elif isinstance(searched_content, list):
+        background_investigation_results = [
+            f"## {elem['title']}\n\n{elem['content']}" for elem in searched_content
+        ]
+        return {
+            "background_investigation_results": "\n\n".join(
+                background_investigation_results
             )
+        }
     else:
-        background_investigation_results = get_web_search_tool(
-            configurable.max_search_results
-        ).invoke(query)
+        logger.error(f"Tavily search returned malformed response: {searched_content}")
     return {
         "background_investigation_results": json.dumps(
             background_investigation_results, ensure_ascii=False
@@ -131,13 +127,36 @@ def background_investigation_node(state: State, config: RunnableConfig):
     }
 
 
-def planner_node(
-    state: State, config: RunnableConfig
-) -> Command[Literal["human_feedback", "reporter"]]:
-    """Planner node that generate the full plan."""
-    logger.info("Planner generating full plan")
+def _background_search_tool(configurable: Configuration):
+    if SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value:
+        return LoggedTavilySearch(max_results=configurable.max_search_results)
+    return get_web_search_tool(configurable.max_search_results)
+
+
+def background_investigation_node(state: State, config: RunnableConfig):
+    """Blocking variant of :func:`abackground_investigation_node`."""
+    logger.info("background investigation node is running.")
     configurable = Configuration.from_runnable_config(config)
-    plan_iterations = state["plan_iterations"] if state.get("plan_iterations", 0) else 0
+    query = state.get("research_topic")
+    with bypass_search_cache(configurable.bypass_search_cache):
+        searched_content = _background_search_tool(configurable).invoke(query)
+    return _background_investigation_update(
+        searched_content, SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value
+    )
+
+
+async def abackground_investigation_node(state: State, config: RunnableConfig):
+    logger.info("background investigation node is running.")
+    configurable = Configuration.from_runnable_config(config)
+    query = state.get("research_topic")
+    with bypass_search_cache(configurable.bypass_search_cache):
+        searched_content = await _background_search_tool(configurable).ainvoke(query)
+    return _background_investigation_update(
+        searched_content, SELECTED_SEARCH_ENGINE == SearchEngine.TAVILY.value
+    )
+
+
+def _planner_messages(state: State, configurable: Configuration) -> list:
     messages = apply_prompt_template("planner", state, configurable)
 
     if state.get("enable_background_investigation") and state.get(
@@ -153,29 +172,29 @@ def planner_node(
                 ),
             }
         ]
+    return messages
+
+
+def _planner_uses_structured_output(configurable: Configuration) -> bool:
+    return AGENT_LLM_MAP["planner"] == "basic" and not configurable.enable_deep_thinking
 
+
+def _planner_llm(configurable: Configuration):
     if configurable.enable_deep_thinking:
-        llm = get_llm_by_type("reasoning")
+        return get_llm_by_type("reasoning")
     elif AGENT_LLM_MAP["planner"] == "basic":
-        llm = get_llm_by_type("basic").with_structured_output(
+        llm = with_llm_cache(get_llm_by_type("basic"), "planner")
+        return llm.with_structured_output(
             Plan,
             # method="json_mode",
         )
     else:
-        llm = get_llm_by_type(AGENT_LLM_MAP["planner"])
+        return with_llm_cache(get_llm_by_type(AGENT_LLM_MAP["planner"]), "planner")
 
-    # if the plan iterations is greater than the max plan iterations, return the reporter node
-    if plan_iterations >= configurable.max_plan_iterations:
-        return Command(goto="reporter")
 
-    full_response = ""
-    if AGENT_LLM_MAP["planner"] == "basic" and not configurable.enable_deep_thinking:
-        response = llm.invoke(messages)
-        full_response = response.model_dump_json(indent=4, exclude_none=True)
-    else:
-        response = llm.stream(messages)
-        for chunk in response:
-            full_response += chunk.content
+def _planner_command(
+    state: State, full_response: str, plan_iterations: int
+) -> Command[Literal["human_feedback", "reporter"]]:
     logger.debug(f"Current state messages: {state['messages']}")
     logger.info(f"Planner response: {full_response}")
 
@@ -206,6 +225,55 @@ def planner_node(
     )
 
 
+def planner_node(
+    state: State, config: RunnableConfig
+) -> Command[Literal["human_feedback", "reporter"]]:
+    """Planner node that generate the full plan."""
+    logger.info("Planner generating full plan")
+    configurable = Configuration.from_runnable_config(config)
+    plan_iterations = state["plan_iterations"] if state.get("plan_iterations", 0) else 0
+    messages = _planner_messages(state, configurable)
+    llm = _planner_llm(configurable)
+
+    # if the plan iterations is greater than the max plan iterations, return the reporter node
+    if plan_iterations >= configurable.max_plan_iterations:
+        return Command(goto="reporter")
+
+    full_response = ""
+    if _planner_uses_structured_output(configurable):
+        response = llm.invoke(messages)
+        full_response = response.model_dump_json(indent=4, exclude_none=True)
+    else:
+        response = llm.stream(messages)
+        for chunk in response:
+            full_response += chunk.content
+    return _planner_command(state, full_response, plan_iterations)
+
+
+async def aplanner_node(
+    state: State, config: RunnableConfig
+) -> Command[Literal["human_feedback", "reporter"]]:
+    """Non-blocking variant of :func:`planner_node`."""
+    logger.info("Planner generating full plan")
+    configurable = Configuration.from_runnable_config(config)
+    plan_iterations = state["plan_iterations"] if state.get("plan_iterations", 0) else 0
+    messages = _planner_messages(state, configurable)
+    llm = _planner_llm(configurable)
+
+    # if the plan iterations is greater than the max plan iterations, return the reporter node
+    if plan_iterations >= configurable.max_plan_iterations:
+        return Command(goto="reporter")
+
+    full_response = ""
+    if _planner_uses_structured_output(configurable):
+        response = await llm.ainvoke(messages)
+        full_response = response.model_dump_json(indent=4, exclude_none=True)
+    else:
+        async for chunk in llm.astream(messages):
+            full_response += chunk.content
+    return _planner_command(state, full_response, plan_iterations)
+
+
 def human_feedback_node(
     state,
 ) -> Command[Literal["planner", "research_team", "reporter", "__end__"]]:
@@ -256,18 +324,9 @@ def human_feedback_node(
     )
 
 
-def coordinator_node(
-    state: State, config: RunnableConfig
+def _coordinator_command(
+    state: State, configurable: Configuration, response
 ) -> Command[Literal["planner", "background_investigator", "__end__"]]:
-    """Coordinator node that communicate with customers."""
-    logger.info("Coordinator talking.")
-    configurable = Configuration.from_runnable_config(config)
-    messages = apply_prompt_template("coordinator", state)
-    response = (
-        get_llm_by_type(AGENT_LLM_MAP["coordinator"])
-        .bind_tools([handoff_to_planner])
-        .invoke(messages)
-    )
     logger.debug(f"Current state messages: {state['messages']}")
 
     goto = "__end__"
@@ -310,10 +369,37 @@ def coordinator_node(
     )
 
 
-def reporter_node(state: State, config: RunnableConfig):
-    """Reporter node that write a final report."""
-    logger.info("Reporter write final report")
+def coordinator_node(
+    state: State, config: RunnableConfig
+) -> Command[Literal["planner", "background_investigator", "__end__"]]:
+    """Coordinator node that communicate with customers."""
+    logger.info("Coordinator talking.")
     configurable = Configuration.from_runnable_config(config)
+    messages = apply_prompt_template("coordinator", state)
+    response = (
+        with_llm_cache(get_llm_by_type(AGENT_LLM_MAP["coordinator"]), "coordinator")
+        .bind_tools([handoff_to_planner])
+        .invoke(messages)
+    )
+    return _coordinator_command(state, configurable, response)
+
+
+async def acoordinator_node(
+    state: State, config: RunnableConfig
+) -> Command[Literal["planner", "background_investigator", "__end__"]]:
+    """Non-blocking variant of :func:`coordinator_node`."""
+    logger.info("Coordinator talking.")
+    configurable = Configuration.from_runnable_config(config)
+    messages = apply_prompt_template("coordinator", state)
+    response = await (
+        with_llm_cache(get_llm_by_type(AGENT_LLM_MAP["coordinator"]), "coordinator")
+        .bind_tools([handoff_to_planner])
+        .ainvoke(messages)
+    )
+    return _coordinator_command(state, configurable, response)
+
+
+def _reporter_messages(state: State, configurable: Configuration) -> list:
     current_plan = state.get("current_plan")
     input_ = {
         "messages": [
@@ -342,6 +428,14 @@ def reporter_node(state: State, config: RunnableConfig):
             )
         )
     logger.debug(f"Current invoke messages: {invoke_messages}")
+    return invoke_messages
+
+
+def reporter_node(state: State, config: RunnableConfig):
+    """Reporter node that write a final report."""
+    logger.info("Reporter write final report")
+    configurable = Configuration.from_runnable_config(config)
+    invoke_messages = _reporter_messages(state, configurable)
     response = get_llm_by_type(AGENT_LLM_MAP["reporter"]).invoke(invoke_messages)
     response_content = response.content
     logger.info(f"reporter response: {response_content}")
@@ -349,10 +443,39 @@ def reporter_node(state: State, config: RunnableConfig):
     return {"final_report": response_content}
 
 
+async def areporter_node(state: State, config: RunnableConfig):
+    """Non-blocking variant of :func:`reporter_node`."""
+    logger.info("Reporter write final report")
+    configurable = Configuration.from_runnable_config(config)
+    invoke_messages = _reporter_messages(state, configurable)
+    response = await get_llm_by_type(AGENT_LLM_MAP["reporter"]).ainvoke(invoke_messages)
+    response_content = response.content
+    logger.info(f"reporter response: {response_content}")
+
+    return {"final_report": response_content}
+
+
 def research_team_node(state: State):
     """Research team node that collaborates on tasks."""
     logger.info("Research team is collaborating on tasks.")
-    pass
+    step_results = state.get("step_results")
+    if not step_results:
+        return
+
+    # Fold the results of steps executed in parallel into the plan, in plan
+    # order, so observations don't depend on which agent finished first
+    current_plan = state.get("current_plan")
+    observations = list(state.get("observations", []))
+    for index, result in sorted((int(k), v) for k, v in step_results.items()):
+        step = current_plan.steps[index]
+        if not step.execution_res:
+            step.execution_res = result
+            observations.append(result)
+    return {
+        "current_plan": current_plan,
+        "observations": observations,
+        "step_results": None,
+    }
 
 
 async def _execute_agent_step(
@@ -363,19 +486,34 @@ async def _execute_agent_step(
     plan_title = current_plan.title
     observations = state.get("observations", [])
 
+    # Steps dispatched by the parallel research team carry their index
+    step_index = state.get("step_index")
+
     # Find the first unexecuted step
-    current_step = None
-    completed_steps = []
-    for step in current_plan.steps:
-        if not step.execution_res:
-            current_step = step
-            break
-        else:
-            completed_steps.append(step)
+    current_index = step_index
+    if current_index is None:
+        current_index = next(
+            (i for i, step in enumerate(current_plan.steps) if not step.execution_res),
+            None,
+        )
 
-    if not current_step:
+    if current_index is None:
         logger.warning("No unexecuted step found")
         return Command(goto="research_team")
+    current_step = current_plan.steps[current_index]
+
+    # With declared dependencies a step only sees the findings of its direct
+    # upstream steps; flat plans keep passing every completed step
+    scheduler = StepScheduler.from_plan(current_plan)
+    if scheduler.has_declared_dependencies:
+        candidates = scheduler.upstream(current_index)
+    else:
+        candidates = range(len(current_plan.steps))
+    completed_steps = [
+        current_plan.steps[i]
+        for i in candidates
+        if i != current_index and current_plan.steps[i].execution_res
+    ]
 
     logger.info(f"Executing step: {current_step.title}, agent: {agent_name}")
 
@@ -456,9 +594,26 @@ async def _execute_agent_step(
     response_content = result["messages"][-1].content
     logger.debug(f"{agent_name.capitalize()} full response: {response_content}")
 
+    logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
+
+    if step_index is not None:
+        # Concurrent steps report through the step_results reducer; the
+        # research team merges them into the plan and observations
+        return Command(
+            update={
+                "messages": [
+                    HumanMessage(
+                        content=response_content,
+                        name=agent_name,
+                    )
+                ],
+                "step_results": {step_index: response_content},
+            },
+            goto="research_team",
+        )
+
     # Update the step with the execution result
     current_step.execution_res = response_content
-    logger.info(f"Step '{current_step.title}' execution completed by {agent_name}")
 
     return Command(
         update={
@@ -517,20 +672,23 @@ async def _setup_and_execute_agent_step(
 
     # Create and execute agent with MCP tools if available
     if mcp_servers:
-        client = MultiServerMCPClient(mcp_servers)
         loaded_tools = default_tools[:]
-        all_tools = await client.get_tools()
+        # Tool listings are shared across steps and runs and the tools call
+        # their servers over pooled sessions; copies are annotated so the
+        # cached tools keep their original descriptions
+        all_tools = await mcp_tool_registry.get_tools(mcp_servers, PooledMCPClient)
         for tool in all_tools:
             if tool.name in enabled_tools:
+                tool = copy.copy(tool)
                 tool.description = (
                     f"Powered by '{enabled_tools[tool.name]}'.\n{tool.description}"
                 )
                 loaded_tools.append(tool)
         agent = create_agent(agent_type, agent_type, loaded_tools, agent_type)
-        return await _execute_agent_step(state, agent, agent_type)
     else:
         # Use default tools if no MCP servers are configured
         agent = create_agent(agent_type, agent_type, default_tools, agent_type)
+    with bypass_search_cache(configurable.bypass_search_cache):
         return await _execute_agent_step(state, agent, agent_type)
 
 
@@ -540,7 +698,12 @@ async def researcher_node(
     """Researcher node that do research"""
     logger.info("Researcher node is researching.")
     configurable = Configuration.from_runnable_config(config)
-    tools = [get_web_search_tool(configurable.max_search_results), crawl_tool]
+    tools = [
+        get_web_search_tool(configurable.max_search_results),
+        crawl_tool,
+        crawl_many_tool,
+        read_crawled_page_tool,
+    ]
     retriever_tool = get_retriever_tool(state.get("resources", []))
     if retriever_tool:
         tools.insert(0, retriever_tool)
@@ -0,0 +1,67 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.pregel import Pregel
+from langgraph.store.base import BaseStore
+
+from .builder import build_graph_with_checkpointer
+
+logger = logging.getLogger(__name__)
+
+
+class GraphRegistry:
+    """
+    Compiled workflow graphs, one per checkpointer backend.
+
+    A compiled graph is immutable once built and keeps all per-run state in the
+    config it is invoked with, so a single instance can serve any number of
+    concurrent streams. The registry compiles the workflow the first time a
+    checkpointer is seen and hands out that same instance afterwards, instead
+    of re-assigning ``checkpointer``/``store`` on a shared graph per request.
+
+    Entries are dropped automatically when their checkpointer is garbage
+    collected, or explicitly with :meth:`discard`.
+    """
+
+    def __init__(
+        self,
+        compile_graph: Callable[
+            [Optional[BaseCheckpointSaver], Optional[BaseStore]], Pregel
+        ] = build_graph_with_checkpointer,
+        store: Optional[BaseStore] = None,
+    ) -> None:
+        self.compile_graph = compile_graph
+        self.store = store
+        self._graphs: "weakref.WeakKeyDictionary[Any, Pregel]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, checkpointer: BaseCheckpointSaver) -> Pregel:
+        """Return the graph compiled for ``checkpointer``, compiling it once."""
+        graph = self._graphs.get(checkpointer)
+        if graph is not None:
+            return graph
+        with self._lock:
+            graph = self._graphs.get(checkpointer)
+            if graph is None:
+                logger.info(
+                    f"Compiling workflow graph for {type(checkpointer).__name__}"
+                )
+                graph = self.compile_graph(checkpointer, self.store)
+                self._graphs[checkpointer] = graph
+        return graph
+
+    def discard(self, checkpointer: BaseCheckpointSaver) -> None:
+        """Forget the graph compiled for ``checkpointer``."""
+        with self._lock:
+            self._graphs.pop(checkpointer, None)
+
+    def __len__(self) -> int:
+        return len(self._graphs)
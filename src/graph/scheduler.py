@@ -0,0 +1,127 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import logging
+from typing import List, Sequence
+
+from src.prompts.planner_model import Step, StepType
+
+logger = logging.getLogger(__name__)
+
+
+class StepScheduler:
+    """
+    Dependency graph of the steps of a plan.
+
+    Edges come from each step's ``depends_on`` (1-based step numbers).
+    References to missing steps or to the step itself are ignored, and a
+    processing step that declares no dependencies depends on every step
+    before it, as it usually processes their findings.
+
+    The graph is always acyclic: dependencies on earlier steps are kept as-is,
+    and a dependency on a later step is dropped if that step (transitively)
+    depends on the dependent one.
+
+    Attributes:
+        steps: The plan's steps
+        dependencies: Direct dependencies (0-based indices) of each step
+        dependents: Steps directly depending on each step
+        priority: Length of the longest chain of steps waiting on each step;
+            ready steps on the critical path are scheduled first
+    """
+
+    def __init__(self, steps: Sequence[Step]) -> None:
+        self.steps = steps
+        count = len(steps)
+        self.dependencies: List[List[int]] = [[] for _ in range(count)]
+
+        forward = []
+        for index, step in enumerate(steps):
+            declared = getattr(step, "depends_on", None) or []
+            if not declared and getattr(step, "step_type", None) == StepType.PROCESSING:
+                self.dependencies[index] = list(range(index))
+                continue
+            for number in dict.fromkeys(declared):
+                upstream = number - 1
+                if upstream < 0 or upstream >= count or upstream == index:
+                    continue
+                if upstream < index:
+                    self.dependencies[index].append(upstream)
+                else:
+                    forward.append((index, upstream))
+
+        for index, upstream in forward:
+            if self._depends_on(upstream, index):
+                logger.warning(
+                    f"Ignoring cyclic dependency of step {index + 1} on step {upstream + 1}"
+                )
+                continue
+            self.dependencies[index].append(upstream)
+
+        self.dependents: List[List[int]] = [[] for _ in range(count)]
+        for index, upstream_steps in enumerate(self.dependencies):
+            for upstream in upstream_steps:
+                self.dependents[upstream].append(index)
+
+        self.priority = [0] * count
+        for index in reversed(self._topological_order()):
+            self.priority[index] = max(
+                (self.priority[d] + 1 for d in self.dependents[index]), default=0
+            )
+
+    @classmethod
+    def from_plan(cls, plan) -> "StepScheduler":
+        return cls(plan.steps)
+
+    @property
+    def has_declared_dependencies(self) -> bool:
+        """Whether the planner declared any dependency in the plan."""
+        return any(getattr(step, "depends_on", None) for step in self.steps)
+
+    def is_done(self, index: int) -> bool:
+        return bool(self.steps[index].execution_res)
+
+    def ready(self) -> List[int]:
+        """
+        Return the unexecuted steps whose dependencies are all done, critical
+        path first and in plan order otherwise.
+        """
+        ready = [
+            index
+            for index in range(len(self.steps))
+            if not self.is_done(index)
+            and all(self.is_done(upstream) for upstream in self.dependencies[index])
+        ]
+        return sorted(ready, key=lambda index: (-self.priority[index], index))
+
+    def upstream(self, index: int) -> List[int]:
+        """Return the direct dependencies of a step, in plan order."""
+        return sorted(self.dependencies[index])
+
+    def _depends_on(self, index: int, target: int) -> bool:
+        stack, seen = [index], set()
+        while stack:
+            current = stack.pop()
+            if current == target:
+                return True
+            if current in seen:
+                continue
+            seen.add(current)
+            stack.extend(self.dependencies[current])
+        return False
+
+    def _topological_order(self) -> List[int]:
+        order: List[int] = []
+        visited = set()
+
+        def visit(index: int) -> None:
+            if index in visited:
+                return
+            visited.add(index)
+            for upstream in self.dependencies[index]:
+                visit(upstream)
+            order.append(index)
+
+        for index in range(len(self.steps)):
+            visit(index)
+        return order
@@ -0,0 +1,254 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadBuffer:
+    """Append-only chunk buffer of a single conversation thread."""
+
+    __slots__ = ("chunks", "nbytes", "created_at", "updated_at")
+
+    def __init__(self) -> None:
+        self.chunks: List[str] = []
+        self.nbytes = 0
+        self.created_at = self.updated_at = time.monotonic()
+
+    def append(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        self.nbytes += len(chunk)
+        self.updated_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+
+class StreamBufferStore:
+    """
+    Per-thread chunk buffers for chat streams.
+
+    Appending a chunk is a single ``list.append``; finishing a conversation
+    detaches the thread's list as-is (no copy, no re-assembly) and removes the
+    thread, so memory is released as soon as the chunks are handed off.
+
+    Buffers are kept in least-recently-updated order and bounded by:
+
+    - ``ttl``: threads idle for longer are treated as abandoned streams
+    - ``max_threads``: number of resident threads
+    - ``max_bytes``: total buffered size (measured in characters)
+
+    A limit of 0 disables it. Threads evicted by any of these limits are
+    spilled to ``spill_dir`` when it is set, and dropped otherwise. Spilled
+    chunks are loaded back in front of the resident ones when the thread is
+    read or popped, so a resumed conversation still persists in full.
+
+    Attributes:
+        max_threads: Maximum number of resident threads
+        max_bytes: Maximum total size of resident chunks
+        ttl: Seconds of inactivity after which a thread is evicted
+        spill_dir: Directory for evicted chunks, or None to drop them
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 0,
+        max_bytes: int = 0,
+        ttl: float = 0,
+        spill_dir: Optional[str] = None,
+        sweep_interval: float = 1.0,
+    ) -> None:
+        self.max_threads = max(0, max_threads)
+        self.max_bytes = max(0, max_bytes)
+        self.ttl = max(0.0, ttl)
+        self.spill_dir = spill_dir or None
+        self.sweep_interval = sweep_interval
+
+        self._buffers: "OrderedDict[str, ThreadBuffer]" = OrderedDict()
+        self._nbytes = 0
+        self._last_sweep = time.monotonic()
+        self._spilled: set = set()
+        self._evictions = 0
+        self._expirations = 0
+        self._spills = 0
+        self._dropped_chunks = 0
+
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    def append(self, thread_id: str, chunk: str) -> int:
+        """Append a chunk to the thread's buffer and return the buffered count."""
+        buffer = self._buffers.get(thread_id)
+        if buffer is None:
+            buffer = self._buffers[thread_id] = ThreadBuffer()
+        else:
+            self._buffers.move_to_end(thread_id)
+        buffer.append(chunk)
+        self._nbytes += len(chunk)
+
+        if self.ttl and buffer.updated_at - self._last_sweep >= self.sweep_interval:
+            self.expire(buffer.updated_at)
+        if (self.max_threads and len(self._buffers) > self.max_threads) or (
+            self.max_bytes and self._nbytes > self.max_bytes
+        ):
+            self._enforce_limits(thread_id)
+        return len(buffer.chunks)
+
+    def get(self, thread_id: str) -> List[str]:
+        """
+        Return the chunks buffered for a thread.
+
+        The resident list itself is returned unless the thread has spilled
+        chunks, in which case a merged copy is returned.
+        """
+        buffer = self._buffers.get(thread_id)
+        chunks = buffer.chunks if buffer is not None else []
+        if self._has_spill_file(thread_id):
+            return self._read_spill(thread_id) + chunks
+        return chunks
+
+    def pop(self, thread_id: str) -> List[str]:
+        """Detach and return the thread's chunks, evicting its buffer."""
+        buffer = self._buffers.pop(thread_id, None)
+        chunks: List[str] = []
+        if buffer is not None:
+            self._nbytes -= buffer.nbytes
+            chunks = buffer.chunks
+        if self._has_spill_file(thread_id):
+            spilled = self._read_spill(thread_id)
+            self._remove_spill(thread_id)
+            if spilled:
+                spilled.extend(chunks)
+                chunks = spilled
+        return chunks
+
+    def restore(self, thread_id: str, chunks: List[str]) -> None:
+        """Put chunks that could not be handed off back in front of the buffer."""
+        if not chunks:
+            return
+        buffer = self._buffers.get(thread_id)
+        if buffer is None:
+            buffer = self._buffers[thread_id] = ThreadBuffer()
+        else:
+            self._buffers.move_to_end(thread_id)
+        nbytes = sum(len(chunk) for chunk in chunks)
+        buffer.chunks[:0] = chunks
+        buffer.nbytes += nbytes
+        self._nbytes += nbytes
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Evict threads idle for longer than ``ttl`` and return how many."""
+        if not self.ttl:
+            return 0
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+        expired = 0
+        # Buffers are ordered by last update, so the idle ones are at the front
+        while self._buffers:
+            thread_id, buffer = next(iter(self._buffers.items()))
+            if now - buffer.updated_at < self.ttl:
+                break
+            self._evict(thread_id)
+            expired += 1
+        if expired:
+            self._expirations += expired
+            logger.info(f"Evicted {expired} idle chat stream buffer(s)")
+        return expired
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters describing resident and evicted buffers."""
+        return {
+            "resident_threads": len(self._buffers),
+            "resident_bytes": self._nbytes,
+            "spilled_threads": len(self._spilled),
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "spills": self._spills,
+            "dropped_chunks": self._dropped_chunks,
+        }
+
+    def _enforce_limits(self, current_thread_id: str) -> None:
+        """Evict least recently updated threads until the limits are met."""
+        while len(self._buffers) > 1 and (
+            (self.max_threads and len(self._buffers) > self.max_threads)
+            or (self.max_bytes and self._nbytes > self.max_bytes)
+        ):
+            thread_id = next(iter(self._buffers))
+            if thread_id == current_thread_id:
+                self._buffers.move_to_end(thread_id)
+                thread_id = next(iter(self._buffers))
+            self._evict(thread_id)
+
+        # A single stream larger than the budget can only be moved to disk;
+        # an active stream is never dropped
+        if self.max_bytes and self._nbytes > self.max_bytes and self.spill_dir:
+            self._evict(current_thread_id)
+
+    def _evict(self, thread_id: str) -> None:
+        buffer = self._buffers.pop(thread_id)
+        self._nbytes -= buffer.nbytes
+        self._evictions += 1
+        if self.spill_dir and self._spill(thread_id, buffer.chunks):
+            return
+        self._dropped_chunks += len(buffer.chunks)
+        logger.warning(
+            f"Dropped {len(buffer.chunks)} unpersisted chunk(s) of thread {thread_id}"
+        )
+
+    def _spill_path(self, thread_id: str) -> str:
+        digest = hashlib.sha256(thread_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.jsonl")
+
+    def _has_spill_file(self, thread_id: str) -> bool:
+        # Also picks up chunks spilled by a previous process
+        return bool(self.spill_dir) and os.path.exists(self._spill_path(thread_id))
+
+    def _spill(self, thread_id: str, chunks: List[str]) -> bool:
+        try:
+            with open(self._spill_path(thread_id), "a", encoding="utf-8") as f:
+                f.write(json.dumps(chunks, ensure_ascii=False))
+                f.write("\n")
+            self._spilled.add(thread_id)
+            self._spills += 1
+            return True
+        except OSError as e:
+            logger.error(f"Failed to spill chat stream buffer of {thread_id}: {e}")
+            return False
+
+    def _read_spill(self, thread_id: str) -> List[str]:
+        chunks: List[str] = []
+        try:
+            with open(self._spill_path(thread_id), "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        chunks.extend(json.loads(line))
+        except FileNotFoundError:
+            self._spilled.discard(thread_id)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load spilled chunks of {thread_id}: {e}")
+        return chunks
+
+    def _remove_spill(self, thread_id: str) -> None:
+        self._spilled.discard(thread_id)
+        try:
+            os.remove(self._spill_path(thread_id))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Failed to remove spilled chunks of {thread_id}: {e}")
+
+    def __contains__(self, thread_id: str) -> bool:
+        return thread_id in self._buffers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._buffers)
+
+    def __len__(self) -> int:
+        return len(self._buffers)
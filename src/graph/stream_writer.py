@@ -0,0 +1,356 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+CREATE_CHAT_STREAMS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS chat_streams (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    thread_id VARCHAR(255) NOT NULL UNIQUE,
+    messages JSONB NOT NULL,
+    ts TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_chat_streams_thread_id ON chat_streams(thread_id);
+CREATE INDEX IF NOT EXISTS idx_chat_streams_ts ON chat_streams(ts);
+"""
+
+UPSERT_CHAT_STREAM_SQL = """
+INSERT INTO chat_streams (id, thread_id, messages, ts)
+VALUES (%s, %s, %s, %s)
+ON CONFLICT (thread_id)
+DO UPDATE SET messages = chat_streams.messages || EXCLUDED.messages, ts = EXCLUDED.ts
+"""
+
+CREATE_CHAT_STREAM_CHUNKS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS chat_stream_chunks (
+    id BIGSERIAL PRIMARY KEY,
+    thread_id VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    ts TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_chat_stream_chunks_thread_id
+    ON chat_stream_chunks(thread_id, id);
+"""
+
+INSERT_CHAT_STREAM_CHUNK_SQL = """
+INSERT INTO chat_stream_chunks (thread_id, message, ts) VALUES (%s, %s, %s)
+"""
+
+# "blob" appends to one messages array per thread (chat_streams); "chunks"
+# stores one row/document per chunk (chat_stream_chunks), ordered by id.
+STORAGE_MODE_BLOB = "blob"
+STORAGE_MODE_CHUNKS = "chunks"
+STORAGE_MODES = (STORAGE_MODE_BLOB, STORAGE_MODE_CHUNKS)
+
+# A batch is a list of (thread_id, messages) pairs, at most one per thread.
+# ``messages`` holds the chunks streamed since the thread was last persisted.
+StreamBatch = List[Tuple[str, List[str]]]
+
+
+class StreamBackend(Protocol):
+    """Asynchronous storage backend used by :class:`BatchedStreamWriter`."""
+
+    async def open(self) -> None: ...
+
+    async def write_batch(self, batch: StreamBatch) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class AsyncPostgresStreamBackend:
+    """Write chat streams to PostgreSQL through an async psycopg pool."""
+
+    def __init__(
+        self,
+        db_uri: str,
+        min_size: int = 1,
+        max_size: int = 4,
+        storage_mode: str = STORAGE_MODE_BLOB,
+    ) -> None:
+        self.db_uri = db_uri
+        self.storage_mode = storage_mode
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool = None
+
+    async def open(self) -> None:
+        from psycopg_pool import AsyncConnectionPool
+
+        self.pool = AsyncConnectionPool(
+            self.db_uri,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            kwargs={"autocommit": True, "prepare_threshold": 0},
+            open=False,
+        )
+        await self.pool.open()
+        async with self.pool.connection() as conn:
+            if self.storage_mode == STORAGE_MODE_CHUNKS:
+                await conn.execute(CREATE_CHAT_STREAM_CHUNKS_TABLE_SQL)
+            else:
+                await conn.execute(CREATE_CHAT_STREAMS_TABLE_SQL)
+        logger.info("Async PostgreSQL chat stream backend is ready")
+
+    async def write_batch(self, batch: StreamBatch) -> None:
+        current_timestamp = datetime.now()
+        if self.storage_mode == STORAGE_MODE_CHUNKS:
+            sql = INSERT_CHAT_STREAM_CHUNK_SQL
+            rows = [
+                (thread_id, message, current_timestamp)
+                for thread_id, messages in batch
+                for message in messages
+            ]
+        else:
+            sql = UPSERT_CHAT_STREAM_SQL
+            rows = [
+                (uuid.uuid4(), thread_id, json.dumps(messages), current_timestamp)
+                for thread_id, messages in batch
+            ]
+        async with self.pool.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor() as cursor:
+                    await cursor.executemany(sql, rows)
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+
+class AsyncMongoStreamBackend:
+    """Write chat streams to MongoDB through motor."""
+
+    def __init__(self, db_uri: str, storage_mode: str = STORAGE_MODE_BLOB) -> None:
+        self.db_uri = db_uri
+        self.storage_mode = storage_mode
+        self.client = None
+        self.collection = None
+
+    async def open(self) -> None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        self.client = AsyncIOMotorClient(self.db_uri)
+        await self.client.admin.command("ping")
+        if self.storage_mode == STORAGE_MODE_CHUNKS:
+            self.collection = self.client.checkpointing_db.chat_stream_chunks
+            await self.collection.create_index([("thread_id", 1), ("_id", 1)])
+        else:
+            self.collection = self.client.checkpointing_db.chat_streams
+        logger.info("Async MongoDB chat stream backend is ready")
+
+    async def write_batch(self, batch: StreamBatch) -> None:
+        from pymongo import UpdateOne
+
+        current_timestamp = datetime.now()
+        if self.storage_mode == STORAGE_MODE_CHUNKS:
+            documents = [
+                {"thread_id": thread_id, "message": message, "ts": current_timestamp}
+                for thread_id, messages in batch
+                for message in messages
+            ]
+            # Ordered so that _id order matches chunk order within a thread
+            await self.collection.insert_many(documents, ordered=True)
+            return
+
+        operations = [
+            UpdateOne(
+                {"thread_id": thread_id},
+                {
+                    "$push": {"messages": {"$each": messages}},
+                    "$set": {"ts": current_timestamp},
+                    "$setOnInsert": {"id": uuid.uuid4().hex},
+                },
+                upsert=True,
+            )
+            for thread_id, messages in batch
+        ]
+        await self.collection.bulk_write(operations, ordered=False)
+
+    async def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+            self.collection = None
+
+
+def create_stream_backend(
+    db_uri: str, storage_mode: str = STORAGE_MODE_BLOB
+) -> Optional[StreamBackend]:
+    """Create the async backend matching the scheme of ``db_uri``."""
+    if db_uri.startswith("mongodb://"):
+        return AsyncMongoStreamBackend(db_uri, storage_mode=storage_mode)
+    if db_uri.startswith("postgresql://") or db_uri.startswith("postgres://"):
+        return AsyncPostgresStreamBackend(db_uri, storage_mode=storage_mode)
+    return None
+
+
+class BatchedStreamWriter:
+    """
+    Background writer that coalesces completed conversations into batched upserts.
+
+    ``submit`` never performs I/O: it queues the chunks a thread streamed since
+    its last persist and wakes up a writer task running on the current event
+    loop. The task waits ``flush_interval`` seconds so that several threads (and
+    several ranges of the same thread) are merged into one round trip, then
+    hands at most ``batch_size`` threads to the backend, which appends each
+    range to the stored conversation.
+
+    Attributes:
+        backend_factory: Callable creating a fresh backend for the writer loop
+        batch_size: Maximum number of threads written per round trip
+        flush_interval: Seconds to wait for more ranges before flushing
+        max_retries: Attempts per range before it is dropped
+    """
+
+    def __init__(
+        self,
+        backend_factory: Callable[[], StreamBackend],
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        max_retries: int = 3,
+    ) -> None:
+        self.backend_factory = backend_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval)
+        self.max_retries = max(1, max_retries)
+
+        self._pending: Dict[str, List[str]] = {}
+        self._attempts: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._backend: Optional[StreamBackend] = None
+        self._closing = False
+
+    @property
+    def pending_count(self) -> int:
+        """Number of threads waiting to be written."""
+        return len(self._pending)
+
+    def submit(self, thread_id: str, messages: List[str]) -> bool:
+        """
+        Queue newly streamed chunks of a conversation for persistence.
+
+        Must be called from a running event loop. The writer takes ownership of
+        ``messages``. Returns False when the writer is shutting down and the
+        chunks were not accepted.
+        """
+        if self._closing:
+            return False
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._bind(loop)
+
+        # Coalesce: consecutive ranges of the same thread are written together
+        pending = self._pending.get(thread_id)
+        if pending is None:
+            self._pending[thread_id] = messages
+        else:
+            pending.extend(messages)
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Attach the writer task to ``loop``, abandoning a previous dead loop."""
+        if self._task is not None and not self._task.done():
+            if not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._task.cancel)
+        self._loop = loop
+        self._backend = None
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = loop.create_task(self._run(), name="chat-stream-writer")
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if not self._closing and self.flush_interval:
+                if len(self._pending) < self.batch_size:
+                    await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+
+            while self._pending:
+                batch = self._take_batch()
+                await self._write(batch)
+
+            self._idle.set()
+            if self._closing:
+                return
+
+    def _take_batch(self) -> StreamBatch:
+        batch: StreamBatch = []
+        for thread_id in list(self._pending)[: self.batch_size]:
+            batch.append((thread_id, self._pending.pop(thread_id)))
+        return batch
+
+    async def _write(self, batch: StreamBatch) -> None:
+        try:
+            if self._backend is None:
+                backend = self.backend_factory()
+                await backend.open()
+                self._backend = backend
+            await self._backend.write_batch(batch)
+            for thread_id, _ in batch:
+                self._attempts.pop(thread_id, None)
+            logger.debug(f"Persisted {len(batch)} chat stream(s) in one batch")
+        except Exception as e:
+            logger.error(f"Error persisting chat stream batch: {e}")
+            self._requeue(batch)
+            if not self._closing:
+                # Back off before retrying so a dead database is not hammered
+                await asyncio.sleep(max(self.flush_interval, 0.5))
+
+    def _requeue(self, batch: StreamBatch) -> None:
+        for thread_id, messages in batch:
+            attempts = self._attempts.get(thread_id, 0) + 1
+            if attempts >= self.max_retries:
+                logger.error(
+                    f"Dropping chat stream for thread {thread_id} after "
+                    f"{attempts} failed attempts"
+                )
+                self._attempts.pop(thread_id, None)
+                continue
+            self._attempts[thread_id] = attempts
+            # Keep ordering: the failed range goes before anything queued since
+            pending = self._pending.pop(thread_id, None)
+            if pending is not None:
+                messages = messages + pending
+            self._pending[thread_id] = messages
+
+    async def flush(self) -> None:
+        """Wait until every range submitted so far has been handled."""
+        if self._task is None or self._task.done():
+            return
+        if self._loop is not asyncio.get_running_loop():
+            return
+        await self._idle.wait()
+
+    async def aclose(self) -> None:
+        """Flush pending ranges, stop the writer task and close the backend."""
+        self._closing = True
+        if self._task is not None and not self._task.done():
+            if self._loop is asyncio.get_running_loop():
+                self._wakeup.set()
+                await self._task
+            else:
+                self._task.cancel()
+        self._task = None
+        if self._backend is not None:
+            try:
+                await self._backend.close()
+            except Exception as e:
+                logger.error(f"Error closing chat stream backend: {e}")
+            self._backend = None
+        self._closing = False
@@ -1,6 +1,6 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
-
+from typing import Annotated, Optional
 
 from langgraph.graph import MessagesState
 
@@ -8,6 +8,15 @@ from src.prompts.planner_model import Plan
 from src.rag import Resource
 
 
+def merge_step_results(
+    left: Optional[dict[int, str]], right: Optional[dict[int, str]]
+) -> dict[int, str]:
+    """Merge results of concurrently executed steps; ``None`` clears them."""
+    if right is None:
+        return {}
+    return {**(left or {}), **right}
+
+
 class State(MessagesState):
     """State for the agent system, extends MessagesState with next field."""
 
@@ -22,3 +31,6 @@ class State(MessagesState):
     auto_accepted_plan: bool = False
     enable_background_investigation: bool = True
     background_investigation_results: str = None
+    # Results of plan steps executed in parallel, keyed by step index, until the
+    # research team folds them into the plan
+    step_results: Annotated[dict[int, str], merge_step_results] = {}
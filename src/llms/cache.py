@@ -0,0 +1,183 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Opt-in cache of LLM responses.
+
+:class:`LLMResponseCache` is a LangChain cache, so it is keyed on what
+LangChain passes to it: the rendered messages, and the model configuration
+together with the bound tools and structured output schema. Only models
+with a temperature of 0 are cached, as the answer of any other model is
+not meant to be reused.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, TypeVar
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumps, loads
+
+from src.config.agents import AGENT_LLM_CACHE
+from src.config.configuration import get_bool_env, get_int_env, get_str_env
+from src.utils.cache import LRUCache, stable_hash
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseChatModel)
+
+
+class SQLiteLLMCache:
+    """On-disk tier of :class:`LLMResponseCache`, holding serialized responses."""
+
+    def __init__(self, path: str, ttl: float = 0) -> None:
+        self.path = path
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at and expires_at <= time.time():
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = time.time() + self.ttl if self.ttl else 0
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache(BaseCache):
+    """
+    LangChain cache with an in-memory LRU tier and an optional SQLite tier;
+    a hit on disk is copied to memory.
+
+    Attributes:
+        max_size: Number of responses kept in memory
+        ttl: Seconds a response is reused; 0 keeps it until evicted
+        sqlite_path: SQLite file of the on-disk tier, if any
+    """
+
+    def __init__(
+        self, max_size: int = 256, ttl: float = 0, sqlite_path: Optional[str] = None
+    ) -> None:
+        self._memory: LRUCache[str] = LRUCache(max_size=max_size, ttl=ttl)
+        self._disk: Optional[SQLiteLLMCache] = None
+        if sqlite_path:
+            try:
+                self._disk = SQLiteLLMCache(sqlite_path, ttl=ttl)
+            except Exception as e:
+                logger.error(f"Failed to open LLM cache at {sqlite_path}: {e}")
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return stable_hash([llm_string, prompt])
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        value = self._memory.get(key)
+        if value is None and self._disk is not None:
+            try:
+                value = self._disk.get(key)
+            except Exception as e:
+                logger.warning(f"LLM cache lookup failed: {e}")
+            if value is not None:
+                self._memory.set(key, value)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return loads(value)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        value = dumps(return_val)
+        self._memory.set(key, value)
+        if self._disk is not None:
+            try:
+                self._disk.set(key, value)
+            except Exception as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+    def clear(self, **kwargs: Any) -> None:
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+
+llm_response_cache = LLMResponseCache(
+    max_size=get_int_env("LLM_CACHE_SIZE", 256),
+    ttl=get_int_env("LLM_CACHE_TTL_SECONDS", 0),
+    sqlite_path=get_str_env("LLM_CACHE_SQLITE_PATH", "") or None,
+)
+
+# Cached copies of the shared model instances, by id of the original
+_cached_models: Dict[int, Tuple[BaseChatModel, BaseChatModel]] = {}
+_cached_models_lock = threading.Lock()
+
+
+def is_deterministic(llm: BaseChatModel) -> bool:
+    return getattr(llm, "temperature", None) == 0
+
+
+def with_llm_cache(llm: M, agent: str) -> M:
+    """
+    Return ``llm`` with response caching if it is enabled by
+    ``LLM_CACHE_ENABLED`` and ``AGENT_LLM_CACHE`` for ``agent``, and the
+    model is deterministic; return ``llm`` itself otherwise.
+    """
+    if not get_bool_env("LLM_CACHE_ENABLED", False) or not AGENT_LLM_CACHE.get(agent):
+        return llm
+    if not isinstance(llm, BaseChatModel) or not is_deterministic(llm):
+        logger.debug(
+            f"Not caching responses for {agent}, its model is not deterministic"
+        )
+        return llm
+    with _cached_models_lock:
+        entry = _cached_models.get(id(llm))
+        # Keep the original alive, so its id is not reused
+        if entry is None or entry[0] is not llm:
+            entry = (llm, llm.model_copy(update={"cache": llm_response_cache}))
+            _cached_models[id(llm)] = entry
+    return entry[1]
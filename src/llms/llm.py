@@ -3,16 +3,18 @@
 
 import os
 from pathlib import Path
-from typing import Any, Dict, get_args
+from typing import Any, Dict, List, get_args
 
-import httpx
 from langchain_core.language_models import BaseChatModel
 from langchain_deepseek import ChatDeepSeek
 from langchain_openai import AzureChatOpenAI, ChatOpenAI
 
 from src.config import load_yaml_config
 from src.config.agents import LLMType
+from src.config.configuration import get_int_env
 from src.llms.providers.dashscope import ChatDashscope
+from src.llms.router import RoutedChatModel
+from src.llms.transport import TransportConfig, get_llm_http_clients
 
 # Cache for LLM instances
 _llm_cache: dict[LLMType, BaseChatModel] = {}
@@ -57,6 +59,8 @@ def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> BaseChatMod
         raise ValueError(f"Unknown LLM type: {llm_type}")
 
     llm_conf = conf.get(config_key, {})
+    if isinstance(llm_conf, list):
+        return _create_routed_llm(llm_type, llm_conf)
     if not isinstance(llm_conf, dict):
         raise ValueError(f"Invalid LLM configuration for {llm_type}: {llm_conf}")
 
@@ -69,19 +73,53 @@ def _create_llm_use_conf(llm_type: LLMType, conf: Dict[str, Any]) -> BaseChatMod
     if not merged_conf:
         raise ValueError(f"No configuration found for LLM type: {llm_type}")
 
+    return _create_llm(llm_type, merged_conf)
+
+
+def _create_routed_llm(
+    llm_type: LLMType, endpoints: List[Dict[str, Any]]
+) -> RoutedChatModel:
+    """Create a model routing calls across the endpoints listed for a type."""
+    if not endpoints or not all(isinstance(e, dict) for e in endpoints):
+        raise ValueError(f"Invalid LLM configuration for {llm_type}: {endpoints}")
+
+    # Environment variables provide defaults shared by the endpoints
+    env_conf = _get_env_llm_conf(llm_type)
+
+    models = []
+    weights = []
+    for endpoint in endpoints:
+        endpoint_conf = {**env_conf, **endpoint}
+        weights.append(float(endpoint_conf.pop("weight", 1)))
+        # Fail over to the next endpoint rather than retry a failing one
+        endpoint_conf.setdefault("max_retries", 0)
+        models.append(_create_llm(llm_type, endpoint_conf))
+
+    return RoutedChatModel(
+        models=models,
+        weights=weights,
+        failure_threshold=get_int_env("LLM_ROUTER_FAILURE_THRESHOLD", 3),
+        cooldown=get_int_env("LLM_ROUTER_COOLDOWN_SECONDS", 30),
+    )
+
+
+def _create_llm(llm_type: LLMType, merged_conf: Dict[str, Any]) -> BaseChatModel:
+    """Create the model of a single endpoint."""
     # Add max_retries to handle rate limit errors
     if "max_retries" not in merged_conf:
         merged_conf["max_retries"] = 3
 
-    # Handle SSL verification settings
-    verify_ssl = merged_conf.pop("verify_ssl", True)
-
-    # Create custom HTTP client if SSL verification is disabled
-    if not verify_ssl:
-        http_client = httpx.Client(verify=False)
-        http_async_client = httpx.AsyncClient(verify=False)
-        merged_conf["http_client"] = http_client
-        merged_conf["http_async_client"] = http_async_client
+    # Share connection pools with the other models of the same endpoint;
+    # transport settings such as verify_ssl are not model arguments
+    transport = TransportConfig.from_conf(merged_conf)
+    endpoint = (
+        merged_conf.get("azure_endpoint")
+        or merged_conf.get("base_url")
+        or os.getenv("AZURE_OPENAI_ENDPOINT")
+    )
+    http_client, http_async_client = get_llm_http_clients(endpoint, transport)
+    merged_conf.setdefault("http_client", http_client)
+    merged_conf.setdefault("http_async_client", http_async_client)
 
     if "azure_endpoint" in merged_conf or os.getenv("AZURE_OPENAI_ENDPOINT"):
         return AzureChatOpenAI(**merged_conf)
@@ -135,13 +173,19 @@ def get_configured_llm_models() -> dict[str, list[str]]:
             # Get configuration from environment variables
             env_conf = _get_env_llm_conf(llm_type)
 
-            # Merge configurations, with environment variables taking precedence
-            merged_conf = {**yaml_conf, **env_conf}
+            if isinstance(yaml_conf, list):
+                # Routed endpoints take environment variables as defaults
+                endpoint_confs = [{**env_conf, **endpoint} for endpoint in yaml_conf]
+            else:
+                # Merge configurations, with environment variables taking precedence
+                endpoint_confs = [{**yaml_conf, **env_conf}]
 
             # Check if model is configured
-            model_name = merged_conf.get("model")
-            if model_name:
-                configured_models.setdefault(llm_type, []).append(model_name)
+            for merged_conf in endpoint_confs:
+                model_name = merged_conf.get("model")
+                models = configured_models.get(llm_type, [])
+                if model_name and model_name not in models:
+                    configured_models.setdefault(llm_type, []).append(model_name)
 
         return configured_models
 
@@ -0,0 +1,324 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Routing of chat model calls across several endpoints serving a model type.
+
+:class:`RoutedChatModel` sends each call to the healthy endpoint with the
+fewest outstanding requests relative to its weight. An endpoint that answers
+with 429 is taken out of rotation at once, and one that keeps failing with
+5xx or connection errors after a few attempts; either comes back after a
+cooldown, on probation. A call that fails with such an error is retried on
+the next endpoint, so callers only see an error when every endpoint failed.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+import openai
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.runnables import (
+    Runnable,
+    RunnableBinding,
+    RunnableParallel,
+    RunnableSequence,
+)
+from pydantic import Field, PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether another endpoint may succeed where this error was raised."""
+    if isinstance(error, (openai.APIConnectionError, httpx.TransportError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(status_code, int) and (status_code == 429 or status_code >= 500)
+
+
+def _is_rate_limit(error: BaseException) -> bool:
+    return getattr(error, "status_code", None) == 429
+
+
+class EndpointHealth:
+    """Outstanding requests and circuit breaker state of an endpoint."""
+
+    def __init__(self, name: str, weight: float) -> None:
+        self.name = name
+        self.weight = weight
+        self.outstanding = 0
+        self.failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+
+    def available(self, now: float, cooldown: float) -> bool:
+        if self.state == OPEN and now - self.opened_at >= cooldown:
+            # Let calls through again; one more failure reopens the circuit
+            self.state = HALF_OPEN
+        return self.state != OPEN
+
+    def load(self) -> float:
+        return (self.outstanding + 1) / self.weight
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "weight": self.weight,
+            "outstanding": self.outstanding,
+            "failures": self.failures,
+            "state": self.state,
+        }
+
+
+class RoutedChatModel(BaseChatModel):
+    """
+    Chat model load balancing and failing over between endpoint models.
+
+    Attributes:
+        models: Models of the endpoints, configured alike but for the endpoint
+        weights: Relative share of the traffic of each endpoint
+        failure_threshold: Consecutive failures opening the circuit of an endpoint
+        cooldown: Seconds an open circuit keeps an endpoint out of rotation
+    """
+
+    models: List[BaseChatModel]
+    weights: List[float] = Field(default_factory=list)
+    failure_threshold: int = 3
+    cooldown: float = 30
+
+    _health: List[EndpointHealth] = PrivateAttr(default_factory=list)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _turn: int = PrivateAttr(default=0)
+
+    def model_post_init(self, context: Any, /) -> None:
+        super().model_post_init(context)
+        if not self.models:
+            raise ValueError("RoutedChatModel needs at least one model")
+        weights = self.weights or [1.0] * len(self.models)
+        if len(weights) != len(self.models) or any(w <= 0 for w in weights):
+            raise ValueError(f"Invalid endpoint weights: {self.weights}")
+        self._health = [
+            EndpointHealth(_endpoint_name(model, i), float(weight))
+            for i, (model, weight) in enumerate(zip(self.models, weights))
+        ]
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"models": [dict(model._identifying_params) for model in self.models]}
+
+    @property
+    def temperature(self) -> Optional[float]:
+        """Temperature of the endpoint models, if they all share one."""
+        temperatures = {getattr(model, "temperature", None) for model in self.models}
+        return temperatures.pop() if len(temperatures) == 1 else None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [health.to_dict() for health in self._health]
+
+    def _order(self) -> List[int]:
+        """
+        Endpoints in the order to try them: available ones by load, ties
+        taken in turn, then the ones with an open circuit as a last resort.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._turn += 1
+            count = len(self._health)
+            indices = [(self._turn + i) % count for i in range(count)]
+            available = [
+                i for i in indices if self._health[i].available(now, self.cooldown)
+            ]
+            available.sort(key=lambda i: self._health[i].load())
+            return available + [i for i in indices if i not in available]
+
+    @contextmanager
+    def _track(self, index: int) -> Iterator[None]:
+        health = self._health[index]
+        with self._lock:
+            health.outstanding += 1
+        try:
+            yield
+        except BaseException as e:
+            with self._lock:
+                health.outstanding -= 1
+                if is_retryable(e):
+                    self._record_failure(health, e)
+            raise
+        with self._lock:
+            health.outstanding -= 1
+            health.failures = 0
+            health.state = CLOSED
+
+    def _record_failure(self, health: EndpointHealth, error: BaseException) -> None:
+        health.failures += 1
+        if health.state == OPEN:
+            return
+        if (
+            health.state == HALF_OPEN
+            or health.failures >= self.failure_threshold
+            or _is_rate_limit(error)
+        ):
+            health.state = OPEN
+            health.opened_at = time.monotonic()
+            logger.warning(
+                f"LLM endpoint {health.name} taken out of rotation for "
+                f"{self.cooldown}s after {health.failures} failure(s): {error}"
+            )
+
+    def _failover(self, index: int, error: BaseException, last: bool) -> None:
+        if last or not is_retryable(error):
+            raise error
+        logger.info(
+            f"LLM endpoint {self._health[index].name} failed, trying the next one: "
+            f"{error}"
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        order = self._order()
+        for attempt, index in enumerate(order):
+            model = self.models[index]
+            try:
+                with self._track(index):
+                    return model._generate(
+                        messages, stop=stop, run_manager=run_manager, **kwargs
+                    )
+            except Exception as e:
+                self._failover(index, e, attempt == len(order) - 1)
+        raise AssertionError("unreachable")
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        order = self._order()
+        for attempt, index in enumerate(order):
+            model = self.models[index]
+            try:
+                with self._track(index):
+                    return await model._agenerate(
+                        messages, stop=stop, run_manager=run_manager, **kwargs
+                    )
+            except Exception as e:
+                self._failover(index, e, attempt == len(order) - 1)
+        raise AssertionError("unreachable")
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        order = self._order()
+        for attempt, index in enumerate(order):
+            model = self.models[index]
+            started = False
+            try:
+                with self._track(index):
+                    for chunk in model._stream(
+                        messages, stop=stop, run_manager=run_manager, **kwargs
+                    ):
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                # Chunks already streamed cannot be taken back
+                if started:
+                    raise
+                self._failover(index, e, attempt == len(order) - 1)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ):
+        order = self._order()
+        for attempt, index in enumerate(order):
+            model = self.models[index]
+            started = False
+            try:
+                with self._track(index):
+                    async for chunk in model._astream(
+                        messages, stop=stop, run_manager=run_manager, **kwargs
+                    ):
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                if started:
+                    raise
+                self._failover(index, e, attempt == len(order) - 1)
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> Runnable:
+        return _rebind(self.models[0].bind_tools(tools, **kwargs), self.models[0], self)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable:
+        """
+        Structure the output the way the endpoint models do; they are
+        configured alike, so the arguments the first one binds for a call
+        suit whichever endpoint serves it.
+        """
+        structured = self.models[0].with_structured_output(schema, **kwargs)
+        return _rebind(structured, self.models[0], self)
+
+
+def _rebind(runnable: Any, model: BaseChatModel, router: RoutedChatModel) -> Any:
+    """Return ``runnable`` with ``router`` in place of ``model``."""
+    if runnable is model:
+        return router
+    if isinstance(runnable, RunnableBinding):
+        bound = _rebind(runnable.bound, model, router)
+        if bound is runnable.bound:
+            return runnable
+        return runnable.model_copy(update={"bound": bound})
+    if isinstance(runnable, RunnableSequence):
+        steps = [_rebind(step, model, router) for step in runnable.steps]
+        return RunnableSequence(*steps, name=runnable.name)
+    if isinstance(runnable, RunnableParallel):
+        return RunnableParallel(
+            {
+                key: _rebind(step, model, router)
+                for key, step in runnable.steps__.items()
+            }
+        )
+    return runnable
+
+
+def _endpoint_name(model: BaseChatModel, index: int) -> str:
+    for attr in ("openai_api_base", "azure_endpoint", "api_base", "base_url"):
+        value = getattr(model, attr, None)
+        if value:
+            return f"{value} ({getattr(model, 'model_name', '')})"
+    return f"endpoint {index}"
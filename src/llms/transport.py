@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+HTTP clients shared by the chat models.
+
+Each OpenAI-compatible model used to get clients of its own from the SDK, so
+models served by the same endpoint each kept their own connection pool and
+opened their own TLS connections. Models now get the clients registered for
+their endpoint and transport settings, and those clients live as long as the
+process, like the cached models holding them.
+"""
+
+import importlib.util
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from src.config.configuration import get_bool_env, get_int_env
+from src.utils.cache import stable_hash
+
+logger = logging.getLogger(__name__)
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Model configuration keys that configure the transport rather than the model
+TRANSPORT_KEYS = (
+    "verify_ssl",
+    "proxy",
+    "http2",
+    "max_connections",
+    "max_keepalive_connections",
+    "keepalive_seconds",
+    "connect_timeout",
+    "read_timeout",
+)
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    verify_ssl: bool = True
+    proxy: Optional[str] = None
+    http2: bool = True
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_seconds: float = 30
+    connect_timeout: float = 10
+    read_timeout: float = 120
+
+    @classmethod
+    def from_conf(cls, conf: Dict[str, Any]) -> "TransportConfig":
+        """
+        Pop the transport settings out of a model configuration, defaulting
+        to the ``LLM_HTTP_*`` environment variables.
+        """
+        settings = {key: conf.pop(key) for key in TRANSPORT_KEYS if key in conf}
+        defaults = cls(
+            http2=get_bool_env("LLM_HTTP2", True),
+            max_connections=get_int_env("LLM_HTTP_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=get_int_env(
+                "LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", 20
+            ),
+            keepalive_seconds=get_int_env("LLM_HTTP_KEEPALIVE_SECONDS", 30),
+            connect_timeout=get_int_env("LLM_HTTP_CONNECT_TIMEOUT_SECONDS", 10),
+            read_timeout=get_int_env("LLM_HTTP_TIMEOUT_SECONDS", 120),
+        )
+        # Values from conf.yaml environment overrides come in as strings
+        for key, value in settings.items():
+            default = getattr(defaults, key)
+            if isinstance(default, bool) and isinstance(value, str):
+                settings[key] = value.strip().lower() in ("1", "true", "yes", "y")
+            elif isinstance(default, (int, float)) and not isinstance(default, bool):
+                settings[key] = type(default)(value)
+        return cls(**{**asdict(defaults), **settings})
+
+    def client_options(self) -> dict:
+        return {
+            "verify": self.verify_ssl,
+            "proxy": self.proxy or None,
+            "http2": _HTTP2_AVAILABLE and self.http2,
+            # The OpenAI SDK follows redirects with its default clients too
+            "follow_redirects": True,
+            "timeout": httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_seconds,
+            ),
+        }
+
+
+_clients: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_http_clients(
+    base_url: Optional[str], config: TransportConfig
+) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Return the sync and async clients shared by models of an endpoint."""
+    key = stable_hash([base_url or "", asdict(config)])
+    with _clients_lock:
+        clients = _clients.get(key)
+        if clients is None or clients[0].is_closed or clients[1].is_closed:
+            options = config.client_options()
+            clients = (httpx.Client(**options), httpx.AsyncClient(**options))
+            _clients[key] = clients
+            logger.debug(f"Created LLM HTTP clients for {base_url or 'default'}")
+        return clients
@@ -3,7 +3,7 @@
 
 from langgraph.graph import StateGraph
 
-from src.prompt_enhancer.graph.enhancer_node import prompt_enhancer_node
+from src.prompt_enhancer.graph.enhancer_node import aprompt_enhancer_node
 from src.prompt_enhancer.graph.state import PromptEnhancerState
 
 
@@ -13,7 +13,7 @@ def build_graph():
     builder = StateGraph(PromptEnhancerState)
 
     # Add the enhancer node
-    builder.add_node("enhancer", prompt_enhancer_node)
+    builder.add_node("enhancer", aprompt_enhancer_node)
 
     # Set entry point
     builder.set_entry_point("enhancer")
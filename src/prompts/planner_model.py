@@ -20,6 +20,10 @@ class Step(BaseModel):
     execution_res: Optional[str] = Field(
         default=None, description="The Step execution result"
     )
+    depends_on: List[int] = Field(
+        default_factory=list,
+        description="1-based numbers of earlier steps whose results this step needs",
+    )
 
 
 class Plan(BaseModel):
@@ -6,12 +6,12 @@ import logging
 
 from langgraph.graph import END, START, StateGraph
 
-from src.prose.graph.prose_continue_node import prose_continue_node
-from src.prose.graph.prose_fix_node import prose_fix_node
-from src.prose.graph.prose_improve_node import prose_improve_node
-from src.prose.graph.prose_longer_node import prose_longer_node
-from src.prose.graph.prose_shorter_node import prose_shorter_node
-from src.prose.graph.prose_zap_node import prose_zap_node
+from src.prose.graph.prose_continue_node import aprose_continue_node
+from src.prose.graph.prose_fix_node import aprose_fix_node
+from src.prose.graph.prose_improve_node import aprose_improve_node
+from src.prose.graph.prose_longer_node import aprose_longer_node
+from src.prose.graph.prose_shorter_node import aprose_shorter_node
+from src.prose.graph.prose_zap_node import aprose_zap_node
 from src.prose.graph.state import ProseState
 
 
@@ -23,12 +23,12 @@ def build_graph():
     """Build and return the ppt workflow graph."""
     # build state graph
     builder = StateGraph(ProseState)
-    builder.add_node("prose_continue", prose_continue_node)
-    builder.add_node("prose_improve", prose_improve_node)
-    builder.add_node("prose_shorter", prose_shorter_node)
-    builder.add_node("prose_longer", prose_longer_node)
-    builder.add_node("prose_fix", prose_fix_node)
-    builder.add_node("prose_zap", prose_zap_node)
+    builder.add_node("prose_continue", aprose_continue_node)
+    builder.add_node("prose_improve", aprose_improve_node)
+    builder.add_node("prose_shorter", aprose_shorter_node)
+    builder.add_node("prose_longer", aprose_longer_node)
+    builder.add_node("prose_fix", aprose_fix_node)
+    builder.add_node("prose_zap", aprose_zap_node)
     builder.add_conditional_edges(
         START,
         optional_node,
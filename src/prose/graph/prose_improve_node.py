@@ -6,6 +6,7 @@ import logging
 from langchain.schema import HumanMessage, SystemMessage
 
 from src.config.agents import AGENT_LLM_MAP
+from src.llms.cache import with_llm_cache
 from src.llms.llm import get_llm_by_type
 from src.prompts.template import get_prompt_template
 from src.prose.graph.state import ProseState
@@ -13,14 +14,28 @@ from src.prose.graph.state import ProseState
 logger = logging.getLogger(__name__)
 
 
+def _messages(state: ProseState):
+    return [
+        SystemMessage(content=get_prompt_template("prose/prose_improver")),
+        HumanMessage(content=f"The existing text is: {state['content']}"),
+    ]
+
+
 def prose_improve_node(state: ProseState):
     logger.info("Generating prose improve content...")
-    model = get_llm_by_type(AGENT_LLM_MAP["prose_writer"])
-    prose_content = model.invoke(
-        [
-            SystemMessage(content=get_prompt_template("prose/prose_improver")),
-            HumanMessage(content=f"The existing text is: {state['content']}"),
-        ],
+    model = with_llm_cache(
+        get_llm_by_type(AGENT_LLM_MAP["prose_writer"]), "prose_writer"
+    )
+    prose_content = model.invoke(_messages(state))
+    logger.info(f"prose_content: {prose_content}")
+    return {"output": prose_content.content}
+
+
+async def aprose_improve_node(state: ProseState):
+    logger.info("Generating prose improve content...")
+    model = with_llm_cache(
+        get_llm_by_type(AGENT_LLM_MAP["prose_writer"]), "prose_writer"
     )
+    prose_content = await model.ainvoke(_messages(state))
     logger.info(f"prose_content: {prose_content}")
     return {"output": prose_content.content}
@@ -4,23 +4,27 @@
 import base64
 import json
 import logging
-from typing import Annotated, List, cast
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, Callable, Dict, List, Optional, cast
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response, StreamingResponse
 from langchain_core.messages import AIMessageChunk, BaseMessage, ToolMessage
 from langgraph.types import Command
 from langgraph.store.memory import InMemoryStore
-from langgraph.checkpoint.mongodb import AsyncMongoDBSaver
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
-from psycopg_pool import AsyncConnectionPool
 
-from src.config.configuration import get_recursion_limit, get_bool_env, get_str_env
+from src.config.configuration import (
+    get_bool_env,
+    get_int_env,
+    get_recursion_limit,
+    get_str_env,
+)
 from src.config.report_style import ReportStyle
 from src.config.tools import SELECTED_RAG_PROVIDER
 from src.graph.builder import build_graph_with_memory
+from src.graph.registry import GraphRegistry
 from src.llms.llm import get_configured_llm_models
 from src.podcast.graph.builder import build_graph as build_podcast_graph
 from src.ppt.graph.builder import build_graph as build_ppt_graph
@@ -28,6 +32,16 @@ from src.prompt_enhancer.graph.builder import build_graph as build_prompt_enhanc
 from src.prose.graph.builder import build_graph as build_prose_graph
 from src.rag.builder import build_retriever
 from src.rag.retriever import Resource
+from src.server.checkpointer import close_checkpointer, get_checkpointer
+from src.server.coalesce import coalesce_message_chunks
+from src.server.replay import ReplayRegistry, parse_last_event_id
+from src.server.run_request import RunReportResponse, RunResponse
+from src.server.runs import Run, RunConflictError, RunManager
+from src.server.sse import (
+    SERIALIZATION_ERROR_FRAME,
+    StreamEventEncoder,
+    encode_event,
+)
 from src.server.chat_request import (
     ChatRequest,
     EnhancePromptRequest,
@@ -37,25 +51,53 @@ from src.server.chat_request import (
     TTSRequest,
 )
 from src.server.config_request import ConfigResponse
-from src.server.mcp_request import MCPServerMetadataRequest, MCPServerMetadataResponse
-from src.server.mcp_utils import load_mcp_tools
+from src.server.mcp_request import (
+    MCPServerCacheInvalidateRequest,
+    MCPServerCacheInvalidateResponse,
+    MCPServerMetadataRequest,
+    MCPServerMetadataResponse,
+)
+from src.server.mcp_utils import invalidate_mcp_tools, load_mcp_tools
 from src.server.rag_request import (
     RAGConfigResponse,
     RAGResourceRequest,
     RAGResourcesResponse,
 )
+from src.crawler.extraction import shutdown_extraction_pool
 from src.tools import VolcengineTTS
-from src.graph.checkpoint import chat_stream_message
+from src.tools.mcp_session_pool import mcp_session_pool
+from src.graph.checkpoint import chat_stream_message, close_chat_stream_manager
+from src.utils.http_client import close_http_clients
 from src.utils.json_utils import sanitize_args
 
 logger = logging.getLogger(__name__)
 
 INTERNAL_SERVER_ERROR_DETAIL = "Internal Server Error"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared checkpointer up front so requests don't pay for pool/DDL setup
+    try:
+        await get_checkpointer()
+    except Exception as e:
+        logger.error(f"Failed to open checkpointer, retrying on first request: {e}")
+    yield
+    # Stop background runs before tearing down what they write to
+    await run_manager.shutdown()
+    # Flush chat streams still queued in the background writer
+    await close_chat_stream_manager()
+    await close_checkpointer()
+    await mcp_session_pool.aclose()
+    await close_http_clients()
+    shutdown_extraction_pool()
+
+
 app = FastAPI(
     title="DeerFlow API",
     description="API for Deer",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -75,10 +117,103 @@ app.add_middleware(
 )
 in_memory_store = InMemoryStore()
 graph = build_graph_with_memory()
+# Graphs compiled once per checkpointer backend and shared by concurrent requests
+graph_registry = GraphRegistry(store=in_memory_store)
+# Workflow runs execute as background tasks; clients read their events from
+# the thread's replay log and can reconnect to it with Last-Event-ID
+run_manager = RunManager(
+    ReplayRegistry(
+        max_threads=get_int_env("CHAT_STREAM_REPLAY_MAX_THREADS", 256),
+        ttl=get_int_env("CHAT_STREAM_REPLAY_TTL_SECONDS", 900),
+        max_events=get_int_env("CHAT_STREAM_REPLAY_MAX_EVENTS", 5000),
+        max_bytes=get_int_env("CHAT_STREAM_REPLAY_MAX_BYTES", 2 << 20),
+    ),
+    max_runs=get_int_env("CHAT_RUN_MAX_RUNS", 1000),
+)
 
 
 @app.post("/api/chat/stream")
 async def chat_stream(request: ChatRequest):
+    run = _start_run(request)
+    return StreamingResponse(
+        run.log.subscribe(run.start_id),
+        media_type="text/event-stream",
+        headers={"X-Run-ID": run.run_id},
+    )
+
+
+@app.get("/api/chat/stream/{thread_id}")
+async def resume_chat_stream(
+    thread_id: str,
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+    last_event_id_param: Optional[str] = Query(default=None, alias="last_event_id"),
+):
+    """Replay the events of a thread after Last-Event-ID and follow the live run."""
+    replay_log = run_manager.replay_registry.get(thread_id)
+    if replay_log is None:
+        raise HTTPException(status_code=404, detail="Thread not found")
+    return StreamingResponse(
+        replay_log.subscribe(parse_last_event_id(last_event_id or last_event_id_param)),
+        media_type="text/event-stream",
+    )
+
+
+@app.post("/api/runs", response_model=RunResponse)
+async def create_run(request: ChatRequest):
+    """Start a workflow run in the background without streaming it."""
+    return _start_run(request).to_dict()
+
+
+@app.get("/api/runs/{run_id}", response_model=RunResponse)
+async def get_run(run_id: str):
+    return _get_run(run_id).to_dict()
+
+
+@app.get("/api/runs/{run_id}/stream")
+async def attach_run(
+    run_id: str,
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+):
+    """Stream the events of a run, from its start or after Last-Event-ID."""
+    run = _get_run(run_id)
+    return StreamingResponse(
+        run.log.subscribe(max(run.start_id, parse_last_event_id(last_event_id))),
+        media_type="text/event-stream",
+        headers={"X-Run-ID": run.run_id},
+    )
+
+
+@app.post("/api/runs/{run_id}/cancel", response_model=RunResponse)
+async def cancel_run(run_id: str):
+    run = _get_run(run_id)
+    await run_manager.cancel(run_id)
+    return run.to_dict()
+
+
+@app.get("/api/runs/{run_id}/report", response_model=RunReportResponse)
+async def get_run_report(run_id: str):
+    run = _get_run(run_id)
+    if not run.final_report:
+        if not run.done:
+            raise HTTPException(status_code=409, detail="Run is still running")
+        raise HTTPException(status_code=404, detail="Run produced no report")
+    return {
+        "run_id": run.run_id,
+        "thread_id": run.thread_id,
+        "status": run.status,
+        "final_report": run.final_report,
+    }
+
+
+def _get_run(run_id: str) -> Run:
+    run = run_manager.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+
+def _start_run(request: ChatRequest) -> Run:
+    """Validate a chat request and start its workflow as a background run."""
     # Check if MCP server configuration is enabled
     mcp_enabled = get_bool_env("ENABLE_MCP_SERVER_CONFIGURATION", False)
 
@@ -93,8 +228,8 @@ async def chat_stream(request: ChatRequest):
     if thread_id == "__default__":
         thread_id = str(uuid4())
 
-    return StreamingResponse(
-        _astream_workflow_generator(
+    def make_events(run: Run):
+        return _astream_workflow_generator(
             request.model_dump()["messages"],
             thread_id,
             request.resources,
@@ -107,9 +242,21 @@ async def chat_stream(request: ChatRequest):
             request.enable_background_investigation,
             request.report_style,
             request.enable_deep_thinking,
-        ),
-        media_type="text/event-stream",
-    )
+            request.coalesce_ms,
+            request.max_batch_bytes,
+            enable_parallel_steps=request.enable_parallel_steps,
+            max_parallel_steps=request.max_parallel_steps,
+            bypass_search_cache=request.bypass_search_cache,
+            on_update=run.record_update,
+        )
+
+    try:
+        return run_manager.start(thread_id, make_events)
+    except RunConflictError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Thread {thread_id} is already running as run {e.run.run_id}.",
+        )
 
 
 def _process_tool_call_chunks(tool_call_chunks):
@@ -138,19 +285,14 @@ def _get_agent_name(agent, message_metadata):
     return agent_name
 
 
-def _create_event_stream_message(
-    message_chunk, message_metadata, thread_id, agent_name
-):
-    """Create base event stream message."""
+def _create_event_stream_message(message_chunk):
+    """Create the per-chunk fields of an event stream message.
+
+    Stream-level fields (thread_id, agent, role, checkpoint metadata) are added
+    by the stream's StreamEventEncoder.
+    """
     event_stream_message = {
-        "thread_id": thread_id,
-        "agent": agent_name,
         "id": message_chunk.id,
-        "role": "assistant",
-        "checkpoint_ns": message_metadata.get("checkpoint_ns", ""),
-        "langgraph_node": message_metadata.get("langgraph_node", ""),
-        "langgraph_path": message_metadata.get("langgraph_path", ""),
-        "langgraph_step": message_metadata.get("langgraph_step", ""),
         "content": message_chunk.content,
     }
 
@@ -203,49 +345,68 @@ def _process_initial_messages(message, thread_id):
     )
 
 
-async def _process_message_chunk(message_chunk, message_metadata, thread_id, agent):
+async def _process_message_chunk(
+    message_chunk, message_metadata, thread_id, agent, encoder=None
+):
     """Process a single message chunk and yield appropriate events."""
+    if encoder is None:
+        encoder = StreamEventEncoder(thread_id)
     agent_name = _get_agent_name(agent, message_metadata)
-    event_stream_message = _create_event_stream_message(
-        message_chunk, message_metadata, thread_id, agent_name
-    )
+    event_stream_message = _create_event_stream_message(message_chunk)
 
     if isinstance(message_chunk, ToolMessage):
         # Tool Message - Return the result of the tool call
         event_stream_message["tool_call_id"] = message_chunk.tool_call_id
-        yield _make_event("tool_call_result", event_stream_message)
+        event_type = "tool_call_result"
     elif isinstance(message_chunk, AIMessageChunk):
         # AI Message - Raw message tokens
         if message_chunk.tool_calls:
             # AI Message - Tool Call
             event_stream_message["tool_calls"] = message_chunk.tool_calls
-            event_stream_message["tool_call_chunks"] = message_chunk.tool_call_chunks
             event_stream_message["tool_call_chunks"] = _process_tool_call_chunks(
                 message_chunk.tool_call_chunks
             )
-            yield _make_event("tool_calls", event_stream_message)
+            event_type = "tool_calls"
         elif message_chunk.tool_call_chunks:
             # AI Message - Tool Call Chunks
             event_stream_message["tool_call_chunks"] = _process_tool_call_chunks(
                 message_chunk.tool_call_chunks
             )
-            yield _make_event("tool_call_chunks", event_stream_message)
+            event_type = "tool_call_chunks"
         else:
             # AI Message - Raw message tokens
-            yield _make_event("message_chunk", event_stream_message)
+            event_type = "message_chunk"
+    else:
+        return
+
+    yield _make_message_event(
+        encoder, agent_name, message_metadata, event_type, event_stream_message
+    )
 
 
 async def _stream_graph_events(
-    graph_instance, workflow_input, workflow_config, thread_id
+    graph_instance,
+    workflow_input,
+    workflow_config,
+    thread_id,
+    coalesce_ms: int = 0,
+    max_batch_bytes: int = 4096,
+    on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
 ):
     """Stream events from the graph and process them."""
-    async for agent, _, event_data in graph_instance.astream(
+    encoder = StreamEventEncoder(thread_id)
+    stream = graph_instance.astream(
         workflow_input,
         config=workflow_config,
         stream_mode=["messages", "updates"],
         subgraphs=True,
-    ):
+    )
+    # Optionally merge bursts of tokens of the same message into one event
+    stream = coalesce_message_chunks(stream, coalesce_ms, max_batch_bytes)
+    async for agent, _, event_data in stream:
         if isinstance(event_data, dict):
+            if on_update is not None:
+                on_update(event_data)
             if "__interrupt__" in event_data:
                 yield _create_interrupt_event(thread_id, event_data)
             continue
@@ -255,7 +416,7 @@ async def _stream_graph_events(
         )
 
         async for event in _process_message_chunk(
-            message_chunk, message_metadata, thread_id, agent
+            message_chunk, message_metadata, thread_id, agent, encoder
         ):
             yield event
 
@@ -273,6 +434,12 @@ async def _astream_workflow_generator(
     enable_background_investigation: bool,
     report_style: ReportStyle,
     enable_deep_thinking: bool,
+    coalesce_ms: int = 0,
+    max_batch_bytes: int = 4096,
+    enable_parallel_steps: bool = False,
+    max_parallel_steps: int = 3,
+    bypass_search_cache: bool = False,
+    on_update: Optional[Callable[[Dict[str, Any]], None]] = None,
 ):
     # Process initial messages
     for message in messages:
@@ -307,71 +474,69 @@ async def _astream_workflow_generator(
         "mcp_settings": mcp_settings,
         "report_style": report_style.value,
         "enable_deep_thinking": enable_deep_thinking,
+        "enable_parallel_steps": enable_parallel_steps,
+        "max_parallel_steps": max_parallel_steps,
+        "bypass_search_cache": bypass_search_cache,
         "recursion_limit": get_recursion_limit(),
     }
 
-    checkpoint_saver = get_bool_env("LANGGRAPH_CHECKPOINT_SAVER", False)
-    checkpoint_url = get_str_env("LANGGRAPH_CHECKPOINT_DB_URL", "")
-    # Handle checkpointer if configured
-    connection_kwargs = {
-        "autocommit": True,
-        "row_factory": "dict_row",
-        "prepare_threshold": 0,
-    }
-    if checkpoint_saver and checkpoint_url != "":
-        if checkpoint_url.startswith("postgresql://"):
-            logger.info("start async postgres checkpointer.")
-            async with AsyncConnectionPool(
-                checkpoint_url, kwargs=connection_kwargs
-            ) as conn:
-                checkpointer = AsyncPostgresSaver(conn)
-                await checkpointer.setup()
-                graph.checkpointer = checkpointer
-                graph.store = in_memory_store
-                async for event in _stream_graph_events(
-                    graph, workflow_input, workflow_config, thread_id
-                ):
-                    yield event
-
-        if checkpoint_url.startswith("mongodb://"):
-            logger.info("start async mongodb checkpointer.")
-            async with AsyncMongoDBSaver.from_conn_string(
-                checkpoint_url
-            ) as checkpointer:
-                graph.checkpointer = checkpointer
-                graph.store = in_memory_store
-                async for event in _stream_graph_events(
-                    graph, workflow_input, workflow_config, thread_id
-                ):
-                    yield event
+    # Handle checkpointer if configured; it is shared across requests and each
+    # checkpoint operation checks a connection out of its pool
+    checkpointer = await get_checkpointer()
+    if checkpointer is not None:
+        async for event in _stream_graph_events(
+            graph_registry.get(checkpointer),
+            workflow_input,
+            workflow_config,
+            thread_id,
+            coalesce_ms,
+            max_batch_bytes,
+            on_update,
+        ):
+            yield event
     else:
         # Use graph without MongoDB checkpointer
         async for event in _stream_graph_events(
-            graph, workflow_input, workflow_config, thread_id
+            graph,
+            workflow_input,
+            workflow_config,
+            thread_id,
+            coalesce_ms,
+            max_batch_bytes,
+            on_update,
         ):
             yield event
 
 
 def _make_event(event_type: str, data: dict[str, any]):
-    if data.get("content") == "":
-        data.pop("content")
-    # Ensure JSON serialization with proper encoding
+    # Serialize once; the same frame is captured and returned
     try:
-        json_data = json.dumps(data, ensure_ascii=False)
+        event = encode_event(event_type, data)
+    except (TypeError, ValueError) as e:
+        logger.error(f"Error serializing event data: {e}")
+        # Return a safe error event
+        return SERIALIZATION_ERROR_FRAME
 
-        finish_reason = data.get("finish_reason", "")
-        chat_stream_message(
-            data.get("thread_id", ""),
-            f"event: {event_type}\ndata: {json_data}\n\n",
-            finish_reason,
-        )
+    chat_stream_message(data.get("thread_id", ""), event, data.get("finish_reason", ""))
+    return event
 
-        return f"event: {event_type}\ndata: {json_data}\n\n"
+
+def _make_message_event(
+    encoder: StreamEventEncoder,
+    agent_name: str,
+    message_metadata: dict[str, any],
+    event_type: str,
+    data: dict[str, any],
+):
+    """Encode a message event with the stream's cached header fields."""
+    try:
+        event = encoder.encode_message(event_type, agent_name, message_metadata, data)
     except (TypeError, ValueError) as e:
         logger.error(f"Error serializing event data: {e}")
-        # Return a safe error event
-        error_data = json.dumps({"error": "Serialization failed"}, ensure_ascii=False)
-        return f"event: error\ndata: {error_data}\n\n"
+        return SERIALIZATION_ERROR_FRAME
+
+    chat_stream_message(encoder.thread_id, event, data.get("finish_reason", ""))
+    return event
 
 
 @app.post("/api/tts")
@@ -514,7 +679,7 @@ async def enhance_prompt(request: EnhancePromptRequest):
             report_style = ReportStyle.ACADEMIC
 
         workflow = build_prompt_enhancer_graph()
-        final_state = workflow.invoke(
+        final_state = await workflow.ainvoke(
             {
                 "prompt": request.prompt,
                 "context": request.context,
@@ -554,6 +719,7 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
             env=request.env,
             headers=request.headers,
             timeout_seconds=timeout,
+            refresh=request.refresh,
         )
 
         # Create the response with tools
@@ -573,6 +739,32 @@ async def mcp_server_metadata(request: MCPServerMetadataRequest):
         raise HTTPException(status_code=500, detail=INTERNAL_SERVER_ERROR_DETAIL)
 
 
+@app.post(
+    "/api/mcp/server/metadata/invalidate",
+    response_model=MCPServerCacheInvalidateResponse,
+)
+async def mcp_server_metadata_invalidate(
+    request: Optional[MCPServerCacheInvalidateRequest] = None,
+):
+    """Drop the cached tools of an MCP server, or of every server."""
+    if not get_bool_env("ENABLE_MCP_SERVER_CONFIGURATION", False):
+        raise HTTPException(
+            status_code=403,
+            detail="MCP server configuration is disabled. Set ENABLE_MCP_SERVER_CONFIGURATION=true to enable MCP features.",
+        )
+
+    request = request or MCPServerCacheInvalidateRequest()
+    invalidated = invalidate_mcp_tools(
+        server_type=request.transport,
+        command=request.command,
+        args=request.args,
+        url=request.url,
+        env=request.env,
+        headers=request.headers,
+    )
+    return MCPServerCacheInvalidateResponse(invalidated=invalidated)
+
+
 @app.get("/api/rag/config", response_model=RAGConfigResponse)
 async def rag_config():
     """Get the config of the RAG."""
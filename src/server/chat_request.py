@@ -65,6 +65,26 @@ class ChatRequest(BaseModel):
     enable_deep_thinking: Optional[bool] = Field(
         False, description="Whether to enable deep thinking"
     )
+    enable_parallel_steps: Optional[bool] = Field(
+        False, description="Whether to run independent plan steps concurrently"
+    )
+    max_parallel_steps: Optional[int] = Field(
+        3, ge=1, le=10, description="Maximum number of plan steps run at once"
+    )
+    bypass_search_cache: Optional[bool] = Field(
+        False, description="Whether to search again instead of using cached results"
+    )
+    coalesce_ms: int = Field(
+        0,
+        ge=0,
+        le=1000,
+        description="Merge consecutive message chunks of the same message sent within this many milliseconds into one event (0 disables)",
+    )
+    max_batch_bytes: int = Field(
+        4096,
+        gt=0,
+        description="Maximum size in bytes of a merged message chunk before it is sent",
+    )
 
 
 class TTSRequest(BaseModel):
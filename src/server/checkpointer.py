@@ -0,0 +1,160 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from typing import Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.mongodb import AsyncMongoDBSaver
+from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from src.config.configuration import get_bool_env, get_int_env, get_str_env
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointerManager:
+    """
+    Owns the LangGraph checkpointer shared by all chat stream requests.
+
+    The checkpointer (and, for PostgreSQL, its connection pool) is created once,
+    either from the FastAPI lifespan or lazily by the first request, and closed
+    on shutdown. Requests only check a connection out of the pool for the
+    duration of each checkpoint read/write.
+
+    PostgreSQL connections are health-checked on checkout. MongoDB pool options
+    such as ``maxPoolSize`` are taken from the connection string.
+
+    Attributes:
+        db_uri: Checkpoint database URI (mongodb:// or postgresql://)
+        min_size: Minimum number of pooled PostgreSQL connections
+        max_size: Maximum number of pooled PostgreSQL connections
+        max_idle: Seconds an idle pooled connection is kept before closing
+        timeout: Seconds a request waits for a pooled connection
+    """
+
+    def __init__(
+        self,
+        db_uri: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: float = 300.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.db_uri = db_uri
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, self.min_size, max_size)
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.pool: Optional[AsyncConnectionPool] = None
+        self._checkpointer: Optional[BaseCheckpointSaver] = None
+        self._stack: Optional[AsyncExitStack] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get(self) -> Optional[BaseCheckpointSaver]:
+        """Return the shared checkpointer, opening it on first use."""
+        if self._checkpointer is not None:
+            return self._checkpointer
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._checkpointer is None:
+                await self._open()
+        return self._checkpointer
+
+    async def _open(self) -> None:
+        stack = AsyncExitStack()
+        try:
+            if self.db_uri.startswith("postgresql://") or self.db_uri.startswith(
+                "postgres://"
+            ):
+                logger.info("start async postgres checkpointer.")
+                self.pool = AsyncConnectionPool(
+                    self.db_uri,
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    max_idle=self.max_idle,
+                    timeout=self.timeout,
+                    kwargs={
+                        "autocommit": True,
+                        "row_factory": dict_row,
+                        "prepare_threshold": 0,
+                    },
+                    check=AsyncConnectionPool.check_connection,
+                    open=False,
+                )
+                await self.pool.open()
+                stack.push_async_callback(self.pool.close)
+                checkpointer = AsyncPostgresSaver(self.pool)
+                await checkpointer.setup()
+            elif self.db_uri.startswith("mongodb://"):
+                logger.info("start async mongodb checkpointer.")
+                checkpointer = await stack.enter_async_context(
+                    AsyncMongoDBSaver.from_conn_string(self.db_uri)
+                )
+            else:
+                logger.warning(
+                    f"Unsupported checkpoint database URI scheme: {self.db_uri}. "
+                    "Supported schemes: mongodb://, postgresql://, postgres://"
+                )
+                return
+        except Exception:
+            self.pool = None
+            await stack.aclose()
+            raise
+
+        self._stack = stack
+        self._checkpointer = checkpointer
+
+    async def aclose(self) -> None:
+        """Close the checkpointer and its connection pool."""
+        stack, self._stack = self._stack, None
+        self._checkpointer = None
+        self.pool = None
+        if stack is not None:
+            try:
+                await stack.aclose()
+            except Exception as e:
+                logger.error(f"Error closing checkpointer: {e}")
+
+
+_checkpointer_manager: Optional[CheckpointerManager] = None
+
+
+def get_checkpointer_manager() -> Optional[CheckpointerManager]:
+    """Return the process-wide checkpointer manager, or None if checkpoints are off."""
+    global _checkpointer_manager
+    if not get_bool_env("LANGGRAPH_CHECKPOINT_SAVER", False):
+        return None
+    db_uri = get_str_env("LANGGRAPH_CHECKPOINT_DB_URL", "")
+    if not db_uri:
+        return None
+    if _checkpointer_manager is None:
+        _checkpointer_manager = CheckpointerManager(
+            db_uri,
+            min_size=get_int_env("LANGGRAPH_CHECKPOINT_POOL_MIN_SIZE", 1),
+            max_size=get_int_env("LANGGRAPH_CHECKPOINT_POOL_MAX_SIZE", 10),
+            max_idle=get_int_env("LANGGRAPH_CHECKPOINT_POOL_MAX_IDLE", 300),
+            timeout=get_int_env("LANGGRAPH_CHECKPOINT_POOL_TIMEOUT", 30),
+        )
+    return _checkpointer_manager
+
+
+async def get_checkpointer() -> Optional[BaseCheckpointSaver]:
+    """Return the shared checkpointer configured by the environment, if any."""
+    manager = get_checkpointer_manager()
+    if manager is None:
+        return None
+    return await manager.get()
+
+
+async def close_checkpointer() -> None:
+    """Close the shared checkpointer, if one was opened."""
+    global _checkpointer_manager
+    manager, _checkpointer_manager = _checkpointer_manager, None
+    if manager is not None:
+        await manager.aclose()
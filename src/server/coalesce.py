@@ -0,0 +1,192 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Token coalescing for the chat stream.
+
+``coalesce_message_chunks`` wraps the ``(agent, mode, data)`` items produced by
+``graph.astream(stream_mode=["messages", "updates"], subgraphs=True)`` and merges
+consecutive plain-text ``AIMessageChunk`` items of the same message into one,
+so a burst of tokens is sent to the client as a single SSE frame. Tool calls,
+tool results and graph updates are never merged and are passed through in
+order.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from langchain_core.messages import AIMessageChunk
+
+logger = logging.getLogger(__name__)
+
+StreamItem = Tuple[Any, Any, Any]
+
+_DONE = object()
+
+
+class _PendingChunk:
+    """Text of consecutive chunks of one message, waiting to be flushed."""
+
+    __slots__ = (
+        "agent",
+        "mode",
+        "first",
+        "metadata",
+        "contents",
+        "reasoning",
+        "response_metadata",
+        "nbytes",
+        "deadline",
+    )
+
+    def __init__(self, item: StreamItem, deadline: float) -> None:
+        self.agent, self.mode, (self.first, self.metadata) = item
+        self.contents: List[str] = []
+        self.reasoning: List[str] = []
+        self.response_metadata: dict = {}
+        self.nbytes = 0
+        self.deadline = deadline
+        self.add(self.first)
+
+    def accepts(self, item: StreamItem) -> bool:
+        agent, mode, (chunk, metadata) = item
+        return (
+            chunk.id == self.first.id
+            and agent == self.agent
+            and mode == self.mode
+            and metadata.get("langgraph_node") == self.metadata.get("langgraph_node")
+            and metadata.get("checkpoint_ns") == self.metadata.get("checkpoint_ns")
+        )
+
+    def add(self, chunk: AIMessageChunk) -> None:
+        self.contents.append(chunk.content)
+        self.nbytes += len(chunk.content.encode("utf-8"))
+        reasoning = chunk.additional_kwargs.get("reasoning_content")
+        if reasoning:
+            self.reasoning.append(reasoning)
+            self.nbytes += len(reasoning.encode("utf-8"))
+        if chunk.response_metadata:
+            self.response_metadata.update(chunk.response_metadata)
+
+    def finished(self) -> bool:
+        return bool(self.response_metadata.get("finish_reason"))
+
+    def flush(self) -> StreamItem:
+        if len(self.contents) == 1:
+            return self.agent, self.mode, (self.first, self.metadata)
+        additional_kwargs = dict(self.first.additional_kwargs)
+        if self.reasoning:
+            additional_kwargs["reasoning_content"] = "".join(self.reasoning)
+        merged = AIMessageChunk(
+            content="".join(self.contents),
+            id=self.first.id,
+            additional_kwargs=additional_kwargs,
+            response_metadata=self.response_metadata,
+        )
+        return self.agent, self.mode, (merged, self.metadata)
+
+
+def _is_mergeable(item: StreamItem) -> bool:
+    """Only plain text chunks of an identified AI message are merged."""
+    data = item[2]
+    if not isinstance(data, tuple) or len(data) != 2:
+        return False
+    chunk = data[0]
+    return (
+        isinstance(chunk, AIMessageChunk)
+        and chunk.id is not None
+        and isinstance(chunk.content, str)
+        and not chunk.tool_calls
+        and not chunk.tool_call_chunks
+    )
+
+
+async def _pump(source: AsyncIterator[StreamItem], queue: asyncio.Queue) -> None:
+    """Drive ``source`` from a single task so its context stays consistent."""
+    try:
+        async for item in source:
+            await queue.put(item)
+    except Exception as e:
+        await queue.put(e)
+        return
+    await queue.put(_DONE)
+
+
+async def coalesce_message_chunks(
+    source: AsyncIterator[StreamItem],
+    coalesce_ms: int = 0,
+    max_batch_bytes: int = 4096,
+) -> AsyncIterator[StreamItem]:
+    """
+    Merge consecutive text chunks of the same message within a time window.
+
+    A merged chunk is emitted when ``coalesce_ms`` has elapsed since its first
+    token, when it reaches ``max_batch_bytes`` (UTF-8), when the message
+    finishes, or as soon as any other item arrives. With ``coalesce_ms <= 0``
+    items are passed through unchanged.
+    """
+    if not coalesce_ms or coalesce_ms <= 0:
+        async for item in source:
+            yield item
+        return
+
+    window = coalesce_ms / 1000
+    loop = asyncio.get_running_loop()
+    # A small queue keeps backpressure on the graph while allowing the timer
+    # below to fire without cancelling the upstream iteration
+    queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+    pump = asyncio.create_task(_pump(source, queue))
+    get_task: Optional[asyncio.Task] = None
+    pending: Optional[_PendingChunk] = None
+
+    try:
+        while True:
+            if get_task is None:
+                get_task = asyncio.ensure_future(queue.get())
+            if pending is not None:
+                timeout = pending.deadline - loop.time()
+                if timeout > 0:
+                    await asyncio.wait({get_task}, timeout=timeout)
+                if not get_task.done():
+                    # Window elapsed while the graph was still producing
+                    yield pending.flush()
+                    pending = None
+                    continue
+
+            item = await get_task
+            get_task = None
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                if pending is not None:
+                    yield pending.flush()
+                    pending = None
+                raise item
+
+            if pending is not None and _is_mergeable(item) and pending.accepts(item):
+                pending.add(item[2][0])
+            else:
+                if pending is not None:
+                    yield pending.flush()
+                    pending = None
+                if not _is_mergeable(item):
+                    yield item
+                    continue
+                pending = _PendingChunk(item, loop.time() + window)
+
+            if pending.nbytes >= max_batch_bytes or pending.finished():
+                yield pending.flush()
+                pending = None
+
+        if pending is not None:
+            yield pending.flush()
+    finally:
+        if get_task is not None and not get_task.done():
+            get_task.cancel()
+        if not pump.done():
+            pump.cancel()
+            try:
+                await pump
+            except asyncio.CancelledError:
+                pass
@@ -33,6 +33,10 @@ class MCPServerMetadataRequest(BaseModel):
     timeout_seconds: Optional[int] = Field(
         None, description="Optional custom timeout in seconds for the operation"
     )
+    refresh: bool = Field(
+        False,
+        description="Whether to ask the server again instead of using cached tools",
+    )
 
 
 class MCPServerMetadataResponse(BaseModel):
@@ -62,3 +66,35 @@ class MCPServerMetadataResponse(BaseModel):
     tools: List = Field(
         default_factory=list, description="Available tools from the MCP server"
     )
+
+
+class MCPServerCacheInvalidateRequest(BaseModel):
+    """Request model for dropping cached MCP server metadata."""
+
+    transport: Optional[str] = Field(
+        None,
+        description=(
+            "The type of MCP server connection; leave empty to drop every server"
+        ),
+    )
+    command: Optional[str] = Field(
+        None, description="The command to execute (for stdio type)"
+    )
+    args: Optional[List[str]] = Field(
+        None, description="Command arguments (for stdio type)"
+    )
+    url: Optional[str] = Field(
+        None, description="The URL of the SSE server (for sse type)"
+    )
+    env: Optional[Dict[str, str]] = Field(
+        None, description="Environment variables (for stdio type)"
+    )
+    headers: Optional[Dict[str, str]] = Field(
+        None, description="HTTP headers (for sse/streamable_http type)"
+    )
+
+
+class MCPServerCacheInvalidateResponse(BaseModel):
+    """Response model for dropping cached MCP server metadata."""
+
+    invalidated: int = Field(..., description="Number of cached tool listings dropped")
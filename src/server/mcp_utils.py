@@ -1,44 +1,111 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
-from datetime import timedelta
 from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.sse import sse_client
-from mcp.client.stdio import stdio_client
-from mcp.client.streamable_http import streamablehttp_client
+
+from src.config.configuration import get_int_env
+from src.tools.mcp_session_pool import connection_key, mcp_session_pool
+from src.utils.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Tool listings by normalized server connection config; the UI asks for the
+# same servers over and over while they are being configured
+_tool_listings: LRUCache = LRUCache(
+    max_size=get_int_env("MCP_METADATA_CACHE_SIZE", 128),
+    ttl=get_int_env("MCP_METADATA_CACHE_TTL_SECONDS", 300),
+)
+_listing_locks: Dict[str, asyncio.Lock] = {}
 
-async def _get_tools_from_client_session(
-    client_context_manager: Any, timeout_seconds: int = 10
-) -> List:
+
+async def _list_tools(connection: Dict[str, Any]) -> List:
+    """List the tools of a server over its pooled session."""
+    async with mcp_session_pool.session(connection) as session:
+        listed_tools = await session.list_tools()
+        return listed_tools.tools
+
+
+async def _cached_list_tools(connection: Dict[str, Any], refresh: bool) -> List:
     """
-    Helper function to get tools from a client session.
+    List the tools of a server, reusing a cached listing unless ``refresh``.
 
-    Args:
-        client_context_manager: A context manager that returns (read, write) functions
-        timeout_seconds: Timeout in seconds for the read operation
+    Concurrent requests for the same server share a single listing.
+    """
+    key = connection_key(connection)
+    if not refresh:
+        tools = _tool_listings.get(key)
+        if tools is not None:
+            return list(tools)
+
+    lock = _listing_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        tools = None if refresh else _tool_listings.get(key)
+        if tools is None:
+            tools = list(await _list_tools(connection))
+            _tool_listings.set(key, tools)
+    if not lock.locked():
+        _listing_locks.pop(key, None)
+    return list(tools)
+
+
+def _build_connection(
+    server_type: str,
+    command: Optional[str] = None,
+    args: Optional[List[str]] = None,
+    url: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Build the connection config of a server, validating its parameters."""
+    if server_type == "stdio":
+        if not command:
+            raise HTTPException(
+                status_code=400, detail="Command is required for stdio type"
+            )
+        return {
+            "transport": server_type,
+            "command": command,
+            "args": args or [],
+            "env": env,
+        }
+
+    if server_type in ("sse", "streamable_http"):
+        if not url:
+            raise HTTPException(
+                status_code=400, detail=f"URL is required for {server_type} type"
+            )
+        return {"transport": server_type, "url": url, "headers": headers}
 
-    Returns:
-        List of available tools from the MCP server
+    raise HTTPException(
+        status_code=400, detail=f"Unsupported server type: {server_type}"
+    )
 
-    Raises:
-        Exception: If there's an error during the process
+
+def invalidate_mcp_tools(
+    server_type: Optional[str] = None,
+    command: Optional[str] = None,
+    args: Optional[List[str]] = None,
+    url: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> int:
     """
-    async with client_context_manager as (read, write, _):
-        async with ClientSession(
-            read, write, read_timeout_seconds=timedelta(seconds=timeout_seconds)
-        ) as session:
-            # Initialize the connection
-            await session.initialize()
-            # List available tools
-            listed_tools = await session.list_tools()
-            return listed_tools.tools
+    Forget the cached tool listing of a server, or of every server when no
+    ``server_type`` is given.
+
+    Returns:
+        The number of listings dropped
+    """
+    if server_type is None:
+        count = len(_tool_listings)
+        _tool_listings.clear()
+        return count
+    connection = _build_connection(server_type, command, args, url, env, headers)
+    return int(_tool_listings.pop(connection_key(connection)) is not None)
 
 
 async def load_mcp_tools(
@@ -49,6 +116,7 @@ async def load_mcp_tools(
     env: Optional[Dict[str, str]] = None,
     headers: Optional[Dict[str, str]] = None,
     timeout_seconds: int = 60,  # Longer default timeout for first-time executions
+    refresh: bool = False,
 ) -> List:
     """
     Load tools from an MCP server.
@@ -61,6 +129,7 @@ async def load_mcp_tools(
         env: Environment variables (for stdio type)
         headers: HTTP headers (for sse/streamable_http type)
         timeout_seconds: Timeout in seconds (default: 60 for first-time executions)
+        refresh: Ask the server again instead of using a cached listing
 
     Returns:
         List of available tools from the MCP server
@@ -69,46 +138,12 @@ async def load_mcp_tools(
         HTTPException: If there's an error loading the tools
     """
     try:
-        if server_type == "stdio":
-            if not command:
-                raise HTTPException(
-                    status_code=400, detail="Command is required for stdio type"
-                )
-
-            server_params = StdioServerParameters(
-                command=command,  # Executable
-                args=args,  # Optional command line arguments
-                env=env,  # Optional environment variables
-            )
-
-            return await _get_tools_from_client_session(
-                stdio_client(server_params), timeout_seconds
-            )
-
-        elif server_type == "sse":
-            if not url:
-                raise HTTPException(
-                    status_code=400, detail="URL is required for sse type"
-                )
-
-            return await _get_tools_from_client_session(
-                sse_client(url=url, headers=headers, timeout=timeout_seconds), timeout_seconds
-            )
-
-        elif server_type == "streamable_http":
-            if not url:
-                raise HTTPException(
-                    status_code=400, detail="URL is required for streamable_http type"
-                )
-
-            return await _get_tools_from_client_session(
-                streamablehttp_client(url=url, headers=headers, timeout=timeout_seconds), timeout_seconds,
-            )
-
-        else:
-            raise HTTPException(
-                status_code=400, detail=f"Unsupported server type: {server_type}"
-            )
+        connection = _build_connection(server_type, command, args, url, env, headers)
+        # Sessions are kept warm in the pool and shared with the agents' MCP
+        # tools, so only a cold start pays for the server startup
+        return await asyncio.wait_for(
+            _cached_list_tools(connection, refresh), timeout_seconds
+        )
 
     except Exception as e:
         if not isinstance(e, HTTPException):
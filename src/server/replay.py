@@ -0,0 +1,200 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Replay logs for resumable chat streams.
+
+Every SSE frame produced for a thread is appended to that thread's
+:class:`ReplayLog` with a monotonically increasing id and sent with an
+``id:`` line. A client that lost its connection reconnects with the id of the
+last event it received (the ``Last-Event-ID`` header) and gets every retained
+event after it, followed by the live tail of the still-running graph.
+When the log has already dropped events the client has not received, a
+``replay_gap`` event naming the missing ids is sent in their place, so the
+client knows the stream is incomplete.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Deque, List, Optional, Tuple
+
+from src.server.sse import encode_event
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayLog:
+    """
+    Bounded log of the SSE frames of one thread.
+
+    The oldest frames are dropped once ``max_events`` or ``max_bytes`` is
+    exceeded; ids keep increasing across runs of the same thread.
+    """
+
+    def __init__(
+        self, thread_id: str, max_events: int = 5000, max_bytes: int = 2 << 20
+    ):
+        self.thread_id = thread_id
+        self.max_events = max(1, max_events)
+        self.max_bytes = max(1, max_bytes)
+        self.last_id = 0
+        self.done = True
+        self.finished_at: Optional[float] = time.monotonic()
+        self._events: Deque[Tuple[int, str]] = deque()
+        self._nbytes = 0
+        self._changed: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def first_id(self) -> int:
+        """Id of the oldest retained event, or ``last_id + 1`` if empty."""
+        return self._events[0][0] if self._events else self.last_id + 1
+
+    def start(self) -> int:
+        """Mark a new run of the thread as started and return the current id."""
+        self.done = False
+        self.finished_at = None
+        return self.last_id
+
+    def append(self, frame: str) -> int:
+        """Append a frame, prefixed with its ``id:`` line, and return its id."""
+        self.last_id += 1
+        framed = f"id: {self.last_id}\n{frame}"
+        self._events.append((self.last_id, framed))
+        self._nbytes += len(framed)
+        while len(self._events) > 1 and (
+            len(self._events) > self.max_events or self._nbytes > self.max_bytes
+        ):
+            _, dropped = self._events.popleft()
+            self._nbytes -= len(dropped)
+        self._notify()
+        return self.last_id
+
+    def finish(self) -> None:
+        """Mark the current run as finished and wake up subscribers."""
+        self.done = True
+        self.finished_at = time.monotonic()
+        self._notify()
+
+    def since(self, last_event_id: int) -> List[Tuple[int, str]]:
+        """Return the retained events with an id greater than ``last_event_id``."""
+        if last_event_id >= self.last_id:
+            return []
+        start = max(0, last_event_id + 1 - self.first_id)
+        return [self._events[i] for i in range(start, len(self._events))]
+
+    async def subscribe(self, last_event_id: int = 0) -> AsyncIterator[str]:
+        """
+        Yield framed events after ``last_event_id``, then follow the live run
+        until it finishes.
+        """
+        cursor = last_event_id
+        while True:
+            # Slow readers fall behind the bounded log, at the start or later
+            if cursor + 1 < self.first_id and cursor < self.last_id:
+                yield self._gap(cursor + 1, self.first_id - 1)
+                cursor = self.first_id - 1
+            for event_id, framed in self.since(cursor):
+                cursor = event_id
+                yield framed
+            # Events appended while the caller held the last one are sent
+            # right away; only wait when caught up
+            if cursor >= self.last_id:
+                if self.done:
+                    return
+                await self._wait()
+
+    def _gap(self, first_missed_id: int, last_missed_id: int) -> str:
+        logger.warning(
+            f"Replay log of thread {self.thread_id} no longer holds events "
+            f"{first_missed_id}..{last_missed_id}"
+        )
+        return encode_event(
+            "replay_gap",
+            {
+                "thread_id": self.thread_id,
+                "first_missed_id": first_missed_id,
+                "last_missed_id": last_missed_id,
+            },
+        )
+
+    async def _wait(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._changed is None or self._loop is not loop:
+            self._changed = asyncio.Event()
+            self._loop = loop
+        await self._changed.wait()
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+
+class ReplayRegistry:
+    """
+    Replay logs of recent threads.
+
+    Logs of running threads are always kept. Finished ones are evicted after
+    ``ttl`` seconds, or earlier (oldest first) when more than ``max_threads``
+    logs exist.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 256,
+        ttl: float = 900,
+        max_events: int = 5000,
+        max_bytes: int = 2 << 20,
+    ) -> None:
+        self.max_threads = max(1, max_threads)
+        self.ttl = ttl
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self._logs: "OrderedDict[str, ReplayLog]" = OrderedDict()
+
+    def get(self, thread_id: str) -> Optional[ReplayLog]:
+        return self._logs.get(thread_id)
+
+    def get_or_create(self, thread_id: str) -> ReplayLog:
+        log = self._logs.get(thread_id)
+        if log is None:
+            self._evict()
+            log = self._logs[thread_id] = ReplayLog(
+                thread_id, max_events=self.max_events, max_bytes=self.max_bytes
+            )
+        else:
+            self._logs.move_to_end(thread_id)
+        return log
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for thread_id in list(self._logs):
+            log = self._logs[thread_id]
+            if log.done and self.ttl and now - log.finished_at >= self.ttl:
+                del self._logs[thread_id]
+        if len(self._logs) < self.max_threads:
+            return
+        for thread_id in list(self._logs):
+            if len(self._logs) < self.max_threads:
+                break
+            if self._logs[thread_id].done:
+                del self._logs[thread_id]
+
+    def __contains__(self, thread_id: str) -> bool:
+        return thread_id in self._logs
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+
+def parse_last_event_id(value: Optional[str]) -> int:
+    """Parse a ``Last-Event-ID`` value; anything invalid means "from the start"."""
+    if not value:
+        return 0
+    try:
+        return max(0, int(value.strip()))
+    except ValueError:
+        return 0
@@ -0,0 +1,36 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class RunResponse(BaseModel):
+    """Response model for the status of a background run."""
+
+    run_id: str = Field(..., description="The ID of the run")
+    thread_id: str = Field(..., description="The thread the run belongs to")
+    status: str = Field(
+        ...,
+        description=(
+            "The status of the run "
+            "(pending, running, success, interrupted, error or cancelled)"
+        ),
+    )
+    error: Optional[str] = Field(None, description="The error of a failed run")
+    created_at: float = Field(..., description="When the run was started (epoch)")
+    finished_at: Optional[float] = Field(
+        None, description="When the run finished (epoch)"
+    )
+    event_count: int = Field(..., description="The number of events produced so far")
+    has_report: bool = Field(..., description="Whether the final report is available")
+
+
+class RunReportResponse(BaseModel):
+    """Response model for the final report of a run."""
+
+    run_id: str = Field(..., description="The ID of the run")
+    thread_id: str = Field(..., description="The thread the run belongs to")
+    status: str = Field(..., description="The status of the run")
+    final_report: str = Field(..., description="The final report of the run")
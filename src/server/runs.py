@@ -0,0 +1,199 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Background execution of research workflow runs.
+
+A run drives the workflow's SSE frames from its own asyncio task and appends
+them to the thread's :class:`~src.server.replay.ReplayLog`. Clients attach to
+the log instead of the task, so the graph proceeds at LLM speed no matter how
+fast (or whether) anybody reads it, and a run can be inspected, cancelled or
+asked for its final report after the connection that started it is gone.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+from uuid import uuid4
+
+from src.server.replay import ReplayLog, ReplayRegistry
+from src.server.sse import encode_event
+
+logger = logging.getLogger(__name__)
+
+RUN_PENDING = "pending"
+RUN_RUNNING = "running"
+RUN_SUCCESS = "success"
+RUN_INTERRUPTED = "interrupted"
+RUN_ERROR = "error"
+RUN_CANCELLED = "cancelled"
+FINISHED_RUN_STATUSES = (RUN_SUCCESS, RUN_INTERRUPTED, RUN_ERROR, RUN_CANCELLED)
+
+
+class RunConflictError(Exception):
+    """Raised when a run is started on a thread that is still running."""
+
+    def __init__(self, run: "Run") -> None:
+        super().__init__(f"Thread {run.thread_id} is already running ({run.run_id})")
+        self.run = run
+
+
+class Run:
+    """
+    State of one workflow run.
+
+    Attributes:
+        run_id: Unique id of the run
+        thread_id: Conversation thread the run belongs to
+        log: Replay log of the thread, shared with its other runs
+        start_id: Last event id of the log before the run started; the run's
+            own events follow it
+        status: One of pending, running, success, interrupted, error, cancelled
+        final_report: Report written by the reporter node, once available
+    """
+
+    def __init__(self, thread_id: str, log: ReplayLog) -> None:
+        self.run_id = str(uuid4())
+        self.thread_id = thread_id
+        self.log = log
+        self.start_id = log.start()
+        self.status = RUN_PENDING
+        self.error: Optional[str] = None
+        self.final_report = ""
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.interrupted = False
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_RUN_STATUSES
+
+    @property
+    def event_count(self) -> int:
+        return self.log.last_id - self.start_id
+
+    def record_update(self, update: Dict[str, Any]) -> None:
+        """Track the graph's ``updates`` stream for the status and report."""
+        if "__interrupt__" in update:
+            self.interrupted = True
+            return
+        for node_update in update.values():
+            if isinstance(node_update, dict) and node_update.get("final_report"):
+                self.final_report = node_update["final_report"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "thread_id": self.thread_id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "event_count": self.event_count,
+            "has_report": bool(self.final_report),
+        }
+
+
+class RunManager:
+    """
+    Starts runs as background tasks and keeps the recent ones for lookup.
+
+    At most one run per thread is active at a time. Finished runs are kept,
+    oldest dropped first, up to ``max_runs``; their events stay available for
+    as long as the replay registry retains the thread's log.
+    """
+
+    def __init__(self, replay_registry: ReplayRegistry, max_runs: int = 1000) -> None:
+        self.replay_registry = replay_registry
+        self.max_runs = max(1, max_runs)
+        self._runs: "OrderedDict[str, Run]" = OrderedDict()
+        self._active: Dict[str, Run] = {}
+
+    def start(
+        self,
+        thread_id: str,
+        make_events: Callable[[Run], AsyncIterator[str]],
+    ) -> Run:
+        """
+        Start a run of ``thread_id``.
+
+        ``make_events`` receives the new run (e.g. to pass ``run.record_update``
+        to the workflow) and returns the SSE frames to record.
+
+        Raises:
+            RunConflictError: If the thread already has an active run
+        """
+        active = self._active.get(thread_id)
+        if active is not None:
+            raise RunConflictError(active)
+
+        run = Run(thread_id, self.replay_registry.get_or_create(thread_id))
+        self._active[thread_id] = run
+        self._runs[run.run_id] = run
+        self._evict()
+        run.task = asyncio.create_task(self._execute(run, make_events(run)))
+        # Also runs when the task is cancelled before it got to start
+        run.task.add_done_callback(lambda _: self._finish(run))
+        return run
+
+    def get(self, run_id: str) -> Optional[Run]:
+        return self._runs.get(run_id)
+
+    def active_run(self, thread_id: str) -> Optional[Run]:
+        return self._active.get(thread_id)
+
+    async def cancel(self, run_id: str) -> bool:
+        """Cancel a run and wait for it to stop. Returns False if it had finished."""
+        run = self._runs.get(run_id)
+        if run is None or run.done or run.task is None:
+            return False
+        run.task.cancel()
+        await asyncio.gather(run.task, return_exceptions=True)
+        return True
+
+    async def shutdown(self) -> None:
+        """Cancel every active run, e.g. before the checkpointer is closed."""
+        tasks = [run.task for run in self._active.values() if run.task is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _execute(self, run: Run, events: AsyncIterator[str]) -> None:
+        run.status = RUN_RUNNING
+        try:
+            async for frame in events:
+                run.log.append(frame)
+            run.status = RUN_INTERRUPTED if run.interrupted else RUN_SUCCESS
+        except asyncio.CancelledError:
+            logger.info(f"Run {run.run_id} of thread {run.thread_id} was cancelled")
+            run.status = RUN_CANCELLED
+            raise
+        except Exception as e:
+            logger.exception(f"Run {run.run_id} of thread {run.thread_id} failed: {e}")
+            run.status = RUN_ERROR
+            run.error = "Internal Server Error"
+            run.log.append(
+                encode_event("error", {"thread_id": run.thread_id, "error": run.error})
+            )
+
+    def _finish(self, run: Run) -> None:
+        if not run.done:
+            run.status = RUN_CANCELLED
+        run.finished_at = time.time()
+        if self._active.get(run.thread_id) is run:
+            del self._active[run.thread_id]
+        run.log.finish()
+
+    def _evict(self) -> None:
+        for run_id in list(self._runs):
+            if len(self._runs) <= self.max_runs:
+                break
+            if self._runs[run_id].done:
+                del self._runs[run_id]
+
+    def __len__(self) -> int:
+        return len(self._runs)
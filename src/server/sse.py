@@ -0,0 +1,129 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Server-sent event encoding for the chat stream.
+
+Every event is serialized exactly once. ``orjson`` is used when it is installed
+and the standard library ``json`` module otherwise; both produce compact JSON
+with non-ASCII characters left as-is.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+SERIALIZATION_ERROR_FRAME = 'event: error\ndata: {"error":"Serialization failed"}\n\n'
+
+# "event: <type>\ndata: " prefixes, built once per event type
+_FRAME_PREFIXES: Dict[str, str] = {}
+
+
+def dumps(data: Any) -> str:
+    """Serialize ``data`` to compact JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            # e.g. non-str keys or integers beyond 64 bits: let json decide
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def frame_prefix(event_type: str) -> str:
+    """Return the cached ``event:``/``data:`` prefix of an event type."""
+    prefix = _FRAME_PREFIXES.get(event_type)
+    if prefix is None:
+        prefix = _FRAME_PREFIXES[event_type] = f"event: {event_type}\ndata: "
+    return prefix
+
+
+def encode_event(event_type: str, data: Dict[str, Any]) -> str:
+    """
+    Encode one SSE frame. Empty ``content`` is omitted from the payload.
+
+    Raises:
+        TypeError, ValueError: If ``data`` is not JSON serializable
+    """
+    if data.get("content") == "":
+        data.pop("content")
+    return frame_prefix(event_type) + dumps(data) + "\n\n"
+
+
+class StreamEventEncoder:
+    """
+    Per-stream encoder for message events.
+
+    Fields shared by consecutive events of a stream (thread_id, agent, role and
+    the LangGraph checkpoint/node metadata) are serialized once per distinct
+    combination and the cached JSON fragment is reused; only the per-chunk
+    fields are serialized for each event.
+    """
+
+    def __init__(self, thread_id: str, role: str = "assistant", max_headers: int = 256):
+        self.thread_id = thread_id
+        self.role = role
+        self.max_headers = max_headers
+        self._headers: Dict[Hashable, str] = {}
+
+    def _header(self, agent: str, metadata: Dict[str, Any]) -> str:
+        checkpoint_ns = metadata.get("checkpoint_ns", "")
+        node = metadata.get("langgraph_node", "")
+        path = metadata.get("langgraph_path", "")
+        step = metadata.get("langgraph_step", "")
+
+        key: Optional[Tuple] = (agent, checkpoint_ns, node, path, step)
+        try:
+            header = self._headers.get(key)
+        except TypeError:
+            # Unhashable metadata values are serialized every time
+            key, header = None, None
+        if header is not None:
+            return header
+
+        header = dumps(
+            {
+                "thread_id": self.thread_id,
+                "agent": agent,
+                "role": self.role,
+                "checkpoint_ns": checkpoint_ns,
+                "langgraph_node": node,
+                "langgraph_path": path,
+                "langgraph_step": step,
+            }
+        )[:-1]
+        if key is not None:
+            if len(self._headers) >= self.max_headers:
+                self._headers.clear()
+            self._headers[key] = header
+        return header
+
+    def encode_message(
+        self,
+        event_type: str,
+        agent: str,
+        metadata: Dict[str, Any],
+        fields: Dict[str, Any],
+    ) -> str:
+        """
+        Encode a message event from the stream header and per-chunk ``fields``.
+
+        Raises:
+            TypeError, ValueError: If ``fields`` is not JSON serializable
+        """
+        if fields.get("content") == "":
+            fields.pop("content")
+        header = self._header(agent, metadata)
+        body = dumps(fields)
+        if body == "{}":
+            payload = header + "}"
+        else:
+            payload = header + "," + body[1:]
+        return frame_prefix(event_type) + payload + "\n\n"
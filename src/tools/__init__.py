@@ -1,7 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .crawl import crawl_tool
+from .crawl import crawl_many_tool, crawl_tool, read_crawled_page_tool
 from .python_repl import python_repl_tool
 from .retriever import get_retriever_tool
 from .search import get_web_search_tool
@@ -9,6 +9,8 @@ from .tts import VolcengineTTS
 
 __all__ = [
     "crawl_tool",
+    "crawl_many_tool",
+    "read_crawled_page_tool",
     "python_repl_tool",
     "get_web_search_tool",
     "get_retriever_tool",
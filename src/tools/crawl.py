@@ -2,24 +2,65 @@
 # SPDX-License-Identifier: MIT
 
 import logging
-from typing import Annotated
+from typing import Annotated, List, Optional
 
 from langchain_core.tools import tool
 
+from src.config.configuration import get_int_env
 from src.crawler import Crawler
+from src.crawler.chunking import ChunkedDocument
+from src.utils.cache import LRUCache
 
 from .decorators import log_io
 
 logger = logging.getLogger(__name__)
 
+# Chunked pages, so follow-up reads don't crawl them again
+_documents: LRUCache[ChunkedDocument] = LRUCache(
+    max_size=get_int_env("CRAWL_DOCUMENT_CACHE_SIZE", 64),
+    ttl=get_int_env("CRAWL_DOCUMENT_CACHE_TTL_SECONDS", 1800),
+)
+
+
+def _chunked_document(url: str) -> ChunkedDocument:
+    document = _documents.get(url)
+    if document is None:
+        article = Crawler().crawl(url)
+        document = ChunkedDocument.from_article(
+            url, article, max_chars=get_int_env("CRAWL_CHUNK_CHARS", 1200)
+        )
+        _documents.set(url, document)
+    return document
+
+
+def _chunks_result(document: ChunkedDocument, chunks) -> dict:
+    return {
+        "url": document.url,
+        "title": document.title,
+        "total_chunks": len(document.chunks),
+        "chunks": [chunk.to_dict() for chunk in chunks],
+    }
+
 
 @tool
 @log_io
 def crawl_tool(
     url: Annotated[str, "The url to crawl."],
+    query: Annotated[
+        Optional[str],
+        "What to look for on the page. When given, the sections of the page most relevant to it are returned instead of its beginning.",
+    ] = None,
 ) -> str:
     """Use this to crawl a url and get a readable content in markdown format."""
     try:
+        if query:
+            document = _chunked_document(url)
+            chunks = document.search(
+                query,
+                top_k=get_int_env("CRAWL_TOP_K_CHUNKS", 5),
+                budget=get_int_env("CRAWL_RESULT_CHARS", 4000),
+            )
+            return _chunks_result(document, chunks)
         crawler = Crawler()
         article = crawler.crawl(url)
         return {"url": url, "crawled_content": article.to_markdown()[:1000]}
@@ -27,3 +68,46 @@ def crawl_tool(
         error_msg = f"Failed to crawl. Error: {repr(e)}"
         logger.error(error_msg)
         return error_msg
+
+
+@tool
+@log_io
+def read_crawled_page_tool(
+    url: Annotated[str, "The url of the page to read."],
+    offset: Annotated[int, "Offset of the first chunk to read."] = 0,
+) -> str:
+    """Use this to read a page chunk by chunk, from the offset of a chunk returned by crawl_tool."""
+    try:
+        document = _chunked_document(url)
+        chunks = document.read(offset, budget=get_int_env("CRAWL_RESULT_CHARS", 4000))
+        result = _chunks_result(document, chunks)
+        next_offset = chunks[-1].index + 1 if chunks else len(document.chunks)
+        if next_offset < len(document.chunks):
+            result["next_offset"] = next_offset
+        return result
+    except BaseException as e:
+        error_msg = f"Failed to crawl. Error: {repr(e)}"
+        logger.error(error_msg)
+        return error_msg
+
+
+@tool
+@log_io
+async def crawl_many_tool(
+    urls: Annotated[List[str], "The urls to crawl."],
+) -> list:
+    """Use this to crawl several urls at once and get their readable content in markdown format."""
+    results = []
+    # Pages are crawled concurrently and listed in the order they finished
+    async for result in Crawler().crawl_many(urls):
+        if result.ok:
+            try:
+                content = result.article.to_markdown()[:1000]
+                results.append({"url": result.url, "crawled_content": content})
+                continue
+            except Exception as e:
+                result.error = e
+        error_msg = f"Failed to crawl. Error: {repr(result.error)}"
+        logger.error(error_msg)
+        results.append({"url": result.url, "error": error_msg})
+    return results
@@ -0,0 +1,75 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config.configuration import get_int_env
+from src.utils.cache import LRUCache, stable_hash
+
+logger = logging.getLogger(__name__)
+
+
+class MCPToolRegistry:
+    """
+    Process-wide registry of the LangChain tools exposed by MCP servers.
+
+    Tool listings are cached per set of server connection configs, so steps
+    of the same or later runs don't start the servers again just to list
+    their tools. The tools themselves don't hold a session of their own,
+    which makes them safe to share. Concurrent lookups of the same servers are
+    deduplicated.
+
+    Attributes:
+        ttl: Seconds a listing is reused before the servers are asked again
+        max_size: Maximum number of cached server sets
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 64) -> None:
+        self._tools: LRUCache = LRUCache(max_size=max_size, ttl=ttl)
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def key(servers: Dict[str, Dict[str, Any]]) -> str:
+        return stable_hash(servers)
+
+    async def get_tools(
+        self,
+        servers: Dict[str, Dict[str, Any]],
+        client_factory: Callable[[Dict[str, Dict[str, Any]]], Any],
+    ) -> List:
+        """
+        Return the tools of ``servers``, listing them with
+        ``client_factory(servers).get_tools()`` on a miss.
+        """
+        key = self.key(servers)
+        tools = self._tools.get(key)
+        if tools is not None:
+            return tools
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            tools = self._tools.get(key)
+            if tools is None:
+                client = client_factory(servers)
+                tools = list(await client.get_tools())
+                self._tools.set(key, tools)
+                logger.info(
+                    f"Loaded {len(tools)} MCP tool(s) from {', '.join(servers)}"
+                )
+        if not lock.locked():
+            self._locks.pop(key, None)
+        return tools
+
+    def invalidate(self, servers: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Forget the tools of ``servers``, or of every server set."""
+        if servers is None:
+            self._tools.clear()
+        else:
+            self._tools.pop(self.key(servers))
+
+
+mcp_tool_registry = MCPToolRegistry(
+    ttl=get_int_env("MCP_TOOL_CACHE_TTL_SECONDS", 300),
+)
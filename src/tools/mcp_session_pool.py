@@ -0,0 +1,313 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Warm MCP client sessions shared across steps and requests.
+
+Starting an MCP server (for stdio, spawning e.g. ``uvx mcp-github-trending``)
+and running the initialize handshake is far more expensive than a tool call.
+:class:`MCPSessionPool` keeps one initialized session per server connection
+config and lets every caller use it; MCP sessions multiplex concurrent
+requests, so a session is shared rather than checked out exclusively.
+
+Each pooled session is owned by a dedicated task, because the transports'
+context managers must be entered and exited by the same task.
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.sessions import create_session
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+
+from src.config.configuration import get_int_env
+from src.utils.cache import stable_hash
+
+logger = logging.getLogger(__name__)
+
+
+def connection_key(connection: Dict[str, Any]) -> str:
+    """Hash of a connection config; unset and empty values are ignored."""
+    return stable_hash(
+        {k: v for k, v in connection.items() if v is not None and v != {} and v != []}
+    )
+
+
+def _describe(connection: Dict[str, Any]) -> str:
+    return connection.get("url") or " ".join(
+        [connection.get("command", "")] + list(connection.get("args") or [])
+    )
+
+
+class _PooledSession:
+    """An initialized session kept open by its own task until closed."""
+
+    def __init__(self, key: str, connection: Dict[str, Any]) -> None:
+        self.key = key
+        self.connection = connection
+        self.session: Optional[ClientSession] = None
+        self.loop = asyncio.get_running_loop()
+        self.users = 0
+        self.last_used = self.last_checked = time.monotonic()
+        self._ready: asyncio.Future = self.loop.create_future()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and not self._task.done()
+
+    async def open(self, timeout: float) -> None:
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._ready), timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _run(self) -> None:
+        try:
+            # create_session may add PATH to the env it is given
+            async with create_session(copy.deepcopy(self.connection)) as session:
+                await session.initialize()
+                self.session = session
+                self._ready.set_result(None)
+                await self._stop.wait()
+        except asyncio.CancelledError:
+            if not self._ready.done():
+                self._ready.cancel()
+            raise
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                logger.warning(
+                    f"MCP session to {_describe(self.connection)} closed: {e}"
+                )
+        finally:
+            self.session = None
+
+    async def ping(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception as e:
+            logger.warning(
+                f"MCP session to {_describe(self.connection)} failed health check: {e}"
+            )
+            return False
+
+    async def close(self) -> None:
+        self._stop.set()
+        task = self._task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(task), 5)
+        except BaseException:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """
+    Pool of warm MCP sessions keyed by server connection config.
+
+    Attributes:
+        max_sessions: Maximum number of pooled sessions; when every pooled
+            session is in use, extra servers get a one-off session
+        idle_timeout: Seconds an unused session is kept open
+        health_check_interval: Seconds after which a session is pinged before
+            it is handed out again
+        open_timeout: Seconds to wait for a server to start and initialize
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 16,
+        idle_timeout: float = 300,
+        health_check_interval: float = 60,
+        open_timeout: float = 60,
+        ping_timeout: float = 5,
+    ) -> None:
+        self.max_sessions = max(1, max_sessions)
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.open_timeout = open_timeout
+        self.ping_timeout = ping_timeout
+        self._sessions: Dict[str, _PooledSession] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def session(self, connection: Dict[str, Any]) -> AsyncIterator[ClientSession]:
+        """
+        Use the pooled session of ``connection``, opening it if needed.
+
+        A session that fails with anything but an MCP protocol error is
+        discarded, so the next caller gets a fresh one.
+        """
+        key = connection_key(connection)
+        pooled = await self._acquire(key, connection)
+        if pooled is None:
+            # Pool is full of busy sessions
+            async with create_session(copy.deepcopy(connection)) as session:
+                await session.initialize()
+                yield session
+            return
+
+        pooled.users += 1
+        try:
+            yield pooled.session
+        except McpError:
+            raise
+        except Exception:
+            await self._discard(pooled)
+            raise
+        finally:
+            pooled.users -= 1
+            pooled.last_used = time.monotonic()
+
+    async def _acquire(
+        self, key: str, connection: Dict[str, Any]
+    ) -> Optional[_PooledSession]:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            pooled = self._sessions.get(key)
+            if pooled is not None and not await self._usable(pooled):
+                await self._discard(pooled)
+                pooled = None
+            if pooled is not None:
+                return pooled
+
+            if (
+                len(self._sessions) >= self.max_sessions
+                and not await self._evict_idle()
+            ):
+                return None
+            pooled = _PooledSession(key, connection)
+            await pooled.open(self.open_timeout)
+            self._sessions[key] = pooled
+            logger.info(f"Opened MCP session to {_describe(connection)}")
+            self._ensure_reaper()
+            return pooled
+
+    async def _usable(self, pooled: _PooledSession) -> bool:
+        if pooled.loop is not asyncio.get_running_loop():
+            return False
+        if not pooled.alive:
+            return False
+        now = time.monotonic()
+        if now - pooled.last_checked < self.health_check_interval:
+            return True
+        pooled.last_checked = now
+        return await pooled.ping(self.ping_timeout)
+
+    async def _discard(self, pooled: _PooledSession) -> None:
+        if self._sessions.get(pooled.key) is pooled:
+            del self._sessions[pooled.key]
+        if pooled.loop is asyncio.get_running_loop():
+            await pooled.close()
+
+    async def _evict_idle(self) -> bool:
+        idle = [p for p in self._sessions.values() if p.users == 0]
+        if not idle:
+            return False
+        await self._discard(min(idle, key=lambda p: p.last_used))
+        return True
+
+    async def close_idle(self) -> int:
+        """Close sessions unused for longer than ``idle_timeout``."""
+        now = time.monotonic()
+        expired = [
+            p
+            for p in self._sessions.values()
+            if p.users == 0 and now - p.last_used >= self.idle_timeout
+        ]
+        for pooled in expired:
+            await self._discard(pooled)
+            logger.info(f"Closed idle MCP session to {_describe(pooled.connection)}")
+        return len(expired)
+
+    def _ensure_reaper(self) -> None:
+        if self.idle_timeout and (self._reaper is None or self._reaper.done()):
+            self._reaper = asyncio.create_task(self._reap())
+
+    async def _reap(self) -> None:
+        interval = max(1.0, self.idle_timeout / 2)
+        while self._sessions:
+            await asyncio.sleep(interval)
+            await self.close_idle()
+
+    async def aclose(self) -> None:
+        """Close every pooled session."""
+        if self._reaper is not None and not self._reaper.done():
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+        self._reaper = None
+        for pooled in list(self._sessions.values()):
+            await self._discard(pooled)
+        self._locks.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self._sessions),
+            "in_use": sum(1 for p in self._sessions.values() if p.users),
+        }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class _PoolSession:
+    """Session-like view of a server that runs every request on the pool."""
+
+    def __init__(self, pool: MCPSessionPool, connection: Dict[str, Any]) -> None:
+        self.pool = pool
+        self.connection = connection
+
+    async def list_tools(self, cursor: Optional[str] = None):
+        async with self.pool.session(self.connection) as session:
+            return await session.list_tools(cursor=cursor)
+
+    async def call_tool(self, name: str, arguments: Optional[dict] = None, **kwargs):
+        async with self.pool.session(self.connection) as session:
+            return await session.call_tool(name, arguments, **kwargs)
+
+
+class PooledMCPClient:
+    """
+    Drop-in for ``MultiServerMCPClient.get_tools`` whose tools call their
+    servers through the session pool instead of a new session per call.
+    """
+
+    def __init__(
+        self,
+        connections: Dict[str, Dict[str, Any]],
+        pool: Optional[MCPSessionPool] = None,
+    ) -> None:
+        self.connections = connections
+        self.pool = pool or mcp_session_pool
+
+    async def get_tools(self) -> List[BaseTool]:
+        tools_list = await asyncio.gather(
+            *[
+                load_mcp_tools(_PoolSession(self.pool, connection))
+                for connection in self.connections.values()
+            ]
+        )
+        return [tool for tools in tools_list for tool in tools]
+
+
+mcp_session_pool = MCPSessionPool(
+    max_sessions=get_int_env("MCP_SESSION_POOL_MAX_SESSIONS", 16),
+    idle_timeout=get_int_env("MCP_SESSION_IDLE_TIMEOUT_SECONDS", 300),
+    health_check_interval=get_int_env("MCP_SESSION_HEALTH_CHECK_SECONDS", 60),
+)
@@ -19,18 +19,24 @@ from langchain_community.utilities import (
 
 from src.config import SELECTED_SEARCH_ENGINE, SearchEngine, load_yaml_config
 from src.tools.decorators import create_logged_tool
+from src.tools.search_cache import create_cached_search_tool
 from src.tools.tavily_search.tavily_search_results_with_images import (
     TavilySearchWithImages,
 )
 
 logger = logging.getLogger(__name__)
 
-# Create logged versions of the search tools
-LoggedTavilySearch = create_logged_tool(TavilySearchWithImages)
-LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults)
-LoggedBraveSearch = create_logged_tool(BraveSearch)
-LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
-LoggedWikipediaSearch = create_logged_tool(WikipediaQueryRun)
+# Create logged versions of the search tools, serving repeated searches from
+# the search cache
+LoggedTavilySearch = create_logged_tool(
+    create_cached_search_tool(TavilySearchWithImages)
+)
+LoggedDuckDuckGoSearch = create_logged_tool(
+    create_cached_search_tool(DuckDuckGoSearchResults)
+)
+LoggedBraveSearch = create_logged_tool(create_cached_search_tool(BraveSearch))
+LoggedArxivSearch = create_logged_tool(create_cached_search_tool(ArxivQueryRun))
+LoggedWikipediaSearch = create_logged_tool(create_cached_search_tool(WikipediaQueryRun))
 
 
 def get_search_config():
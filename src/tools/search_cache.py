@@ -0,0 +1,332 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Cache of web search results shared by every search tool.
+
+Researchers and the background investigation often search for the same
+thing, within a run and across users. Results are cached per engine,
+normalized query and the options that shape the results (max results,
+include/exclude domains, raw content, images, ...), in memory and optionally
+in a SQLite file that survives restarts.
+"""
+
+import copy
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Protocol
+
+from src.config.configuration import get_bool_env, get_int_env, get_str_env
+from src.utils.cache import LRUCache, stable_hash
+
+logger = logging.getLogger(__name__)
+
+# Tool fields that change what a search returns, beyond the query itself
+_RESULT_FIELDS = (
+    "max_results",
+    "num_results",
+    "include_domains",
+    "exclude_domains",
+    "search_depth",
+    "include_answer",
+    "include_raw_content",
+    "include_images",
+    "include_image_descriptions",
+    "output_format",
+    "backend",
+)
+_WRAPPER_RESULT_FIELDS = (
+    "top_k_results",
+    "load_max_docs",
+    "load_all_available_meta",
+    "doc_content_chars_max",
+    "lang",
+    "search_kwargs",
+)
+
+_bypass: ContextVar[bool] = ContextVar("search_cache_bypass", default=False)
+_in_cached_call: ContextVar[bool] = ContextVar("search_cache_in_call", default=False)
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, Unicode forms and whitespace, which don't change results."""
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def search_cache_key(engine: str, query: str, **options: Any) -> str:
+    """
+    Key of a search; domain lists are order-insensitive and unset options are
+    ignored.
+    """
+    normalized = {}
+    for name, value in options.items():
+        if value is None or value == [] or value == {}:
+            continue
+        if name in ("include_domains", "exclude_domains"):
+            value = sorted({domain.strip().lower() for domain in value})
+        normalized[name] = value
+    return stable_hash(
+        {"engine": engine, "query": normalize_query(query), "options": normalized}
+    )
+
+
+@contextmanager
+def bypass_search_cache(bypass: bool = True) -> Iterator[None]:
+    """Skip cached results for the searches made inside the block."""
+    token = _bypass.set(bypass)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+class SearchCacheBackend(Protocol):
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemorySearchCache:
+    """In-process LRU backend."""
+
+    def __init__(self, max_size: int = 512, ttl: float = 3600) -> None:
+        self._entries: LRUCache = LRUCache(max_size=max_size, ttl=ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        # Callers get their own copy of the results, as with the other backends
+        return copy.deepcopy(self._entries.get(key))
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries.set(key, copy.deepcopy(value))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteSearchCache:
+    """
+    On-disk backend; values are stored as JSON, so tuples come back as lists.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600) -> None:
+        self.path = path
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at and expires_at <= time.time():
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl if self.ttl else 0
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM search_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SearchCache:
+    """
+    Tiered search cache; a hit in a slower backend is copied to the faster
+    ones.
+
+    Attributes:
+        backends: Backends from fastest to slowest
+        enabled: Whether searches are cached at all
+    """
+
+    def __init__(
+        self, backends: List[SearchCacheBackend], enabled: bool = True
+    ) -> None:
+        self.backends = backends
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+
+    @property
+    def bypassed(self) -> bool:
+        return not self.enabled or _bypass.get()
+
+    def get(self, key: str) -> Optional[Any]:
+        if self.bypassed:
+            with self._lock:
+                self._bypassed += 1
+            return None
+        for index, backend in enumerate(self.backends):
+            try:
+                value = backend.get(key)
+            except Exception as e:
+                logger.warning(f"Search cache lookup failed: {e}")
+                continue
+            if value is not None:
+                for faster in self.backends[:index]:
+                    faster.set(key, value)
+                with self._lock:
+                    self._hits += 1
+                return value
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        # Bypassed searches still refresh the cache for later ones
+        if not self.enabled:
+            return
+        for backend in self.backends:
+            try:
+                backend.set(key, value)
+            except Exception as e:
+                logger.warning(f"Search cache write failed: {e}")
+
+    def clear(self) -> None:
+        for backend in self.backends:
+            backend.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "bypassed": self._bypassed,
+            }
+
+
+def _build_search_cache() -> SearchCache:
+    ttl = get_int_env("SEARCH_CACHE_TTL_SECONDS", 3600)
+    backends: List[SearchCacheBackend] = [
+        MemorySearchCache(max_size=get_int_env("SEARCH_CACHE_SIZE", 512), ttl=ttl)
+    ]
+    sqlite_path = get_str_env("SEARCH_CACHE_SQLITE_PATH", "")
+    if sqlite_path:
+        try:
+            backends.append(SQLiteSearchCache(sqlite_path, ttl=ttl))
+        except Exception as e:
+            logger.error(f"Failed to open search cache at {sqlite_path}: {e}")
+    return SearchCache(backends, enabled=get_bool_env("SEARCH_CACHE_ENABLED", True))
+
+
+search_cache = _build_search_cache()
+
+
+def _is_error_result(result: Any) -> bool:
+    # Tavily reports failures as (repr(error), {})
+    return (
+        isinstance(result, tuple)
+        and len(result) == 2
+        and isinstance(result[0], str)
+        and not result[1]
+    )
+
+
+class CachedSearchToolMixin:
+    """A mixin that serves repeated searches of a tool from ``search_cache``."""
+
+    def _search_cache_key(self, query: str) -> str:
+        options = {
+            name: getattr(self, name)
+            for name in _RESULT_FIELDS
+            if isinstance(getattr(self, name, None), (int, str, bool, list))
+        }
+        wrapper = getattr(self, "api_wrapper", None) or getattr(
+            self, "search_wrapper", None
+        )
+        for name in _WRAPPER_RESULT_FIELDS:
+            value = getattr(wrapper, name, None)
+            if isinstance(value, (int, str, bool, list, dict)):
+                options[f"wrapper.{name}"] = value
+        engine = next(
+            cls.__name__
+            for cls in type(self).__mro__
+            if not cls.__name__.startswith(("Logged", "Cached"))
+        )
+        return search_cache_key(engine, query, **options)
+
+    def _restore(self, value: Any) -> Any:
+        if getattr(self, "response_format", None) == "content_and_artifact":
+            return tuple(value)
+        return value
+
+    def _run(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        if _in_cached_call.get():
+            return super()._run(query, *args, **kwargs)
+        key = self._search_cache_key(query)
+        cached = search_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Search cache hit for {query!r}")
+            return self._restore(cached)
+        token = _in_cached_call.set(True)
+        try:
+            result = super()._run(query, *args, **kwargs)
+        finally:
+            _in_cached_call.reset(token)
+        if not _is_error_result(result):
+            search_cache.set(key, result)
+        return result
+
+    async def _arun(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        key = self._search_cache_key(query)
+        cached = search_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Search cache hit for {query!r}")
+            return self._restore(cached)
+        token = _in_cached_call.set(True)
+        try:
+            result = await super()._arun(query, *args, **kwargs)
+        finally:
+            _in_cached_call.reset(token)
+        if not _is_error_result(result):
+            search_cache.set(key, result)
+        return result
+
+
+def create_cached_search_tool(base_tool_class):
+    """Create a version of a search tool class that caches its results."""
+
+    class CachedSearchTool(CachedSearchToolMixin, base_tool_class):
+        pass
+
+    CachedSearchTool.__name__ = f"Cached{base_tool_class.__name__}"
+    return CachedSearchTool
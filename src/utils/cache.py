@@ -0,0 +1,114 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+
+from pydantic import BaseModel
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if callable(value):
+        # Functions are compared by identity: same code object, same behavior
+        return f"<{getattr(value, '__qualname__', type(value).__qualname__)}@{id(value):x}>"
+    return f"<{type(value).__module__}.{type(value).__qualname__}>"
+
+
+def stable_hash(value: Any) -> str:
+    """
+    Return a SHA-256 hex digest of ``value`` that does not depend on dict
+    ordering.
+
+    Pydantic models are hashed by their JSON dump, callables by identity and
+    other non-JSON objects by type only.
+    """
+    payload = json.dumps(
+        value, sort_keys=True, default=_json_default, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUCache(Generic[V]):
+    """
+    Thread-safe least-recently-used cache with an optional time to live.
+
+    Attributes:
+        max_size: Maximum number of entries; 0 disables the cache
+        ttl: Seconds an entry stays valid after it was set; 0 keeps it until
+            it is evicted
+    """
+
+    def __init__(self, max_size: int = 128, ttl: float = 0) -> None:
+        self.max_size = max(0, max_size)
+        self.ttl = max(0.0, ttl)
+        self._entries: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        if not self.max_size:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def pop(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return False
+        return not entry[0] or entry[0] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,79 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+Process-wide HTTP clients for the tools.
+
+Search and other API calls share keep-alive connection pools (HTTP/2 when the
+``h2`` package is installed) instead of opening a connection, and a TLS
+handshake, per call. The async client is bound to the event loop it was
+created on, so one is kept per running loop.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import weakref
+from typing import Optional
+
+import httpx
+
+from src.config.configuration import get_bool_env, get_int_env
+
+logger = logging.getLogger(__name__)
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_sync_client: Optional[httpx.Client] = None
+_sync_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _client_options() -> dict:
+    return {
+        "http2": _HTTP2_AVAILABLE and get_bool_env("TOOLS_HTTP2", True),
+        "trust_env": True,
+        "timeout": httpx.Timeout(
+            get_int_env("TOOLS_HTTP_TIMEOUT_SECONDS", 60),
+            connect=get_int_env("TOOLS_HTTP_CONNECT_TIMEOUT_SECONDS", 10),
+        ),
+        "limits": httpx.Limits(
+            max_connections=get_int_env("TOOLS_HTTP_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=get_int_env(
+                "TOOLS_HTTP_MAX_KEEPALIVE_CONNECTIONS", 20
+            ),
+            keepalive_expiry=get_int_env("TOOLS_HTTP_KEEPALIVE_SECONDS", 30),
+        ),
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared blocking client, for callers that can't await."""
+    global _sync_client
+    with _sync_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**_client_options())
+        return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the shared async client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**_client_options())
+        _async_clients[loop] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the shared clients; they are recreated on next use."""
+    global _sync_client
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+    with _sync_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
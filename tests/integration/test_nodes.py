@@ -1,12 +1,15 @@
 import json
 from collections import namedtuple
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from src.graph.nodes import (
     _execute_agent_step,
     _setup_and_execute_agent_step,
+    acoordinator_node,
+    aplanner_node,
+    areporter_node,
     coordinator_node,
     human_feedback_node,
     planner_node,
@@ -20,7 +23,10 @@ with patch("src.llms.llm.get_llm_by_type", return_value=MagicMock()):
     from langgraph.types import Command
 
     from src.config import SearchEngine
-    from src.graph.nodes import background_investigation_node
+    from src.graph.nodes import (
+        abackground_investigation_node,
+        background_investigation_node,
+    )
 
 
 # Mock data
@@ -139,6 +145,36 @@ def test_background_investigation_node_malformed_response(
         assert json.loads(results) is None
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("search_engine", [SearchEngine.TAVILY.value, "other"])
+async def test_abackground_investigation_node(
+    mock_state,
+    mock_tavily_search,
+    mock_web_search_tool,
+    search_engine,
+    patch_config_from_runnable_config,
+    mock_config,
+):
+    """Test the async background_investigation_node awaits the search tool"""
+    for mock in (mock_tavily_search, mock_web_search_tool):
+        mock.return_value.ainvoke = AsyncMock(return_value=MOCK_SEARCH_RESULTS)
+
+    with patch("src.graph.nodes.SELECTED_SEARCH_ENGINE", search_engine):
+        result = await abackground_investigation_node(mock_state, mock_config)
+
+    results = result["background_investigation_results"]
+    if search_engine == SearchEngine.TAVILY.value:
+        mock_tavily_search.return_value.ainvoke.assert_awaited_once_with("test query")
+        mock_tavily_search.return_value.invoke.assert_not_called()
+        assert (
+            results
+            == "## Test Title 1\n\nTest Content 1\n\n## Test Title 2\n\nTest Content 2"
+        )
+    else:
+        mock_web_search_tool.return_value.ainvoke.assert_awaited_once_with("test query")
+        assert len(json.loads(results)) == 2
+
+
 @pytest.fixture
 def mock_plan():
     return {
@@ -392,6 +428,64 @@ def test_planner_node_json_decode_error_second_iteration(mock_state_planner):
         assert result.goto == "reporter"
 
 
+@pytest.mark.asyncio
+async def test_aplanner_node_basic_has_enough_context(
+    mock_state_planner,
+    patch_config_from_runnable_config_planner,
+    patch_apply_prompt_template,
+    patch_repair_json_output,
+    patch_plan_model_validate,
+    patch_ai_message,
+    mock_plan,
+):
+    with (
+        patch("src.graph.nodes.AGENT_LLM_MAP", {"planner": "basic"}),
+        patch("src.graph.nodes.get_llm_by_type") as mock_get_llm,
+    ):
+        mock_llm = MagicMock()
+        mock_llm.with_structured_output.return_value = mock_llm
+        mock_response = MagicMock()
+        mock_response.model_dump_json.return_value = json.dumps(mock_plan)
+        mock_llm.ainvoke = AsyncMock(return_value=mock_response)
+        mock_get_llm.return_value = mock_llm
+
+        result = await aplanner_node(mock_state_planner, MagicMock())
+        assert result.goto == "reporter"
+        assert result.update["current_plan"]["has_enough_context"] is True
+        mock_llm.ainvoke.assert_awaited_once()
+        mock_llm.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_aplanner_node_stream_mode_not_enough_context(
+    mock_state_planner,
+    patch_config_from_runnable_config_planner,
+    patch_apply_prompt_template,
+    patch_repair_json_output,
+    patch_plan_model_validate,
+    patch_ai_message,
+):
+    plan = {"has_enough_context": False, "title": "Test Plan", "steps": []}
+    with (
+        patch("src.graph.nodes.AGENT_LLM_MAP", {"planner": "other"}),
+        patch("src.graph.nodes.get_llm_by_type") as mock_get_llm,
+    ):
+        text = json.dumps(plan)
+
+        async def astream(messages):
+            for part in (text[:10], text[10:]):
+                yield MagicMock(content=part)
+
+        mock_llm = MagicMock()
+        mock_llm.astream = astream
+        mock_get_llm.return_value = mock_llm
+
+        result = await aplanner_node(mock_state_planner, MagicMock())
+        assert result.goto == "human_feedback"
+        assert result.update["current_plan"] == text
+        mock_llm.stream.assert_not_called()
+
+
 # Patch Plan.model_validate and repair_json_output globally for these tests
 @pytest.fixture(autouse=True)
 def patch_plan_and_repair(monkeypatch):
@@ -697,6 +791,36 @@ def test_coordinator_node_tool_calls_exception_handling(
         assert result.update["resources"] == ["resource1", "resource2"]
 
 
+@pytest.mark.asyncio
+async def test_acoordinator_node_with_tool_calls_planner(
+    mock_state_coordinator,
+    patch_config_from_runnable_config_coordinator,
+    patch_apply_prompt_template_coordinator,
+    patch_handoff_to_planner,
+    patch_logger,
+):
+    tool_calls = [
+        {
+            "name": "handoff_to_planner",
+            "args": {"locale": "zh-CN", "research_topic": "topic"},
+        }
+    ]
+    with (
+        patch("src.graph.nodes.AGENT_LLM_MAP", {"coordinator": "basic"}),
+        patch("src.graph.nodes.get_llm_by_type") as mock_get_llm,
+    ):
+        mock_llm = MagicMock()
+        mock_llm.bind_tools.return_value = mock_llm
+        mock_llm.ainvoke = AsyncMock(return_value=make_mock_llm_response(tool_calls))
+        mock_get_llm.return_value = mock_llm
+
+        result = await acoordinator_node(mock_state_coordinator, MagicMock())
+        assert result.goto == "planner"
+        assert result.update["locale"] == "zh-CN"
+        assert result.update["research_topic"] == "topic"
+        mock_llm.invoke.assert_not_called()
+
+
 @pytest.fixture
 def mock_state_reporter():
     # Simulate a plan object with title and thought attributes
@@ -845,6 +969,32 @@ def test_reporter_node_locale_default(
         assert result["final_report"] == "Default Locale Report"
 
 
+@pytest.mark.asyncio
+async def test_areporter_node(
+    mock_state_reporter_with_observations,
+    patch_config_from_runnable_config_reporter,
+    patch_apply_prompt_template_reporter,
+    patch_human_message,
+    patch_logger_reporter,
+):
+    with (
+        patch("src.graph.nodes.AGENT_LLM_MAP", {"reporter": "basic"}),
+        patch("src.graph.nodes.get_llm_by_type") as mock_get_llm,
+    ):
+        mock_llm = MagicMock()
+        mock_llm.ainvoke = AsyncMock(
+            return_value=make_mock_llm_response_reporter("Async Report")
+        )
+        mock_get_llm.return_value = mock_llm
+
+        result = await areporter_node(
+            mock_state_reporter_with_observations, MagicMock()
+        )
+        assert result == {"final_report": "Async Report"}
+        # Template message, format reminder and one message per observation
+        assert len(mock_llm.ainvoke.await_args.args[0]) == 4
+
+
 # Create the real Step class for the tests
 class Step:
     def __init__(self, title, description, execution_res=None):
@@ -1102,7 +1252,7 @@ def patch_execute_agent_step():
 
 @pytest.fixture
 def patch_multiserver_mcp_client():
-    # Patch MultiServerMCPClient as async context manager
+    # Patch PooledMCPClient as async context manager
     class FakeTool:
         def __init__(self, name, description="desc"):
             self.name = name
@@ -1122,9 +1272,7 @@ def patch_multiserver_mcp_client():
                 FakeTool("toolC", "descC"),
             ]
 
-    with patch(
-        "src.graph.nodes.MultiServerMCPClient", return_value=FakeClient()
-    ) as mock:
+    with patch("src.graph.nodes.PooledMCPClient", return_value=FakeClient()) as mock:
         yield mock
 
 
@@ -1236,7 +1384,7 @@ async def test_setup_and_execute_agent_step_with_mcp_tools_description_update(
     default_tools = [MagicMock(name="default_tool")]
     agent_type = "researcher"
 
-    # Patch MultiServerMCPClient to check description update
+    # Patch PooledMCPClient to check description update
     class FakeTool:
         def __init__(self, name, description="desc"):
             self.name = name
@@ -1252,7 +1400,7 @@ async def test_setup_and_execute_agent_step_with_mcp_tools_description_update(
         async def get_tools(self):
             return [FakeTool("toolA", "descA")]
 
-    with patch("src.graph.nodes.MultiServerMCPClient", return_value=FakeClient()):
+    with patch("src.graph.nodes.PooledMCPClient", return_value=FakeClient()):
         await _setup_and_execute_agent_step(
             mock_state_with_steps,
             mock_config,
@@ -0,0 +1,60 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agents import agents as agents_mod
+from src.tools import crawl_tool, get_web_search_tool
+
+
+@pytest.fixture(autouse=True)
+def _clear_agent_cache():
+    agents_mod.clear_agent_cache()
+    yield
+    agents_mod.clear_agent_cache()
+
+
+@pytest.fixture
+def mock_react_agent():
+    llm = MagicMock(name="llm")
+    with (
+        patch.object(agents_mod, "get_llm_by_type", return_value=llm),
+        patch.object(
+            agents_mod,
+            "create_react_agent",
+            side_effect=lambda **kwargs: MagicMock(name=kwargs["name"]),
+        ) as mock,
+    ):
+        yield mock
+
+
+def test_create_agent_reuses_agent_for_same_tools(mock_react_agent):
+    first = agents_mod.create_agent(
+        "researcher", "researcher", [get_web_search_tool(3), crawl_tool], "researcher"
+    )
+    second = agents_mod.create_agent(
+        "researcher", "researcher", [get_web_search_tool(3), crawl_tool], "researcher"
+    )
+    assert first is second
+    assert mock_react_agent.call_count == 1
+
+
+def test_create_agent_distinguishes_tool_configuration(mock_react_agent):
+    first = agents_mod.create_agent(
+        "researcher", "researcher", [get_web_search_tool(3)], "researcher"
+    )
+    second = agents_mod.create_agent(
+        "researcher", "researcher", [get_web_search_tool(5)], "researcher"
+    )
+    third = agents_mod.create_agent("coder", "coder", [get_web_search_tool(3)], "coder")
+    assert len({id(first), id(second), id(third)}) == 3
+    assert mock_react_agent.call_count == 3
+
+
+def test_create_agent_rebuilds_when_llm_changes(mock_react_agent):
+    first = agents_mod.create_agent("coder", "coder", [crawl_tool], "coder")
+    with patch.object(agents_mod, "get_llm_by_type", return_value=MagicMock()):
+        second = agents_mod.create_agent("coder", "coder", [crawl_tool], "coder")
+    assert first is not second
@@ -52,10 +52,8 @@ def test_process_stream_partial_buffer_postgres(monkeypatch):
     )
     result = manager.process_stream_message("t1", "hello", finish_reason="partial")
     assert result is True
-    # Verify the chunk was stored in the in-memory store
-    items = manager.store.search(("messages", "t1"), limit=10)
-    values = [it.dict()["value"] for it in items]
-    assert "hello" in values
+    # Verify the chunk was buffered in memory
+    assert manager.buffers.get("t1") == ["hello"]
 
 
 def test_process_stream_partial_buffer_mongo(monkeypatch):
@@ -76,10 +74,8 @@ def test_process_stream_partial_buffer_mongo(monkeypatch):
     )
     result = manager.process_stream_message("t2", "hello", finish_reason="partial")
     assert result is True
-    # Verify the chunk was stored in the in-memory store
-    items = manager.store.search(("messages", "t2"), limit=10)
-    values = [it.dict()["value"] for it in items]
-    assert "hello" in values
+    # Verify the chunk was buffered in memory
+    assert manager.buffers.get("t2") == ["hello"]
 
 
 def test_persist_postgresql_local_db():
@@ -263,49 +259,59 @@ def test_mongodb_ping_failure(monkeypatch):
     assert getattr(manager, "mongo_db", None) is None
 
 
-def test_store_namespace_consistency():
-    """Test that store namespace is consistently used across methods."""
+def test_buffer_appends_chunks_in_order():
+    """Test that chunks of a thread are buffered in arrival order."""
     manager = checkpoint.ChatStreamManager(checkpoint_saver=False)
 
-    # Process a partial message
     assert (
-        manager.process_stream_message("ns_test", "chunk1", finish_reason="partial")
+        manager.process_stream_message("buf_test", "chunk1", finish_reason="partial")
         is True
     )
-
-    # Verify cursor is stored correctly
-    cursor = manager.store.get(("messages", "ns_test"), "cursor")
-    assert cursor is not None
-    assert cursor.value["index"] == 0
-
-    # Add another chunk
     assert (
-        manager.process_stream_message("ns_test", "chunk2", finish_reason="partial")
+        manager.process_stream_message("buf_test", "chunk2", finish_reason="partial")
         is True
     )
 
-    # Verify cursor is incremented
-    cursor = manager.store.get(("messages", "ns_test"), "cursor")
-    assert cursor.value["index"] == 1
+    assert manager.buffers.get("buf_test") == ["chunk1", "chunk2"]
 
 
-def test_cursor_initialization_edge_cases():
-    """Test cursor handling edge cases."""
-    manager = checkpoint.ChatStreamManager(checkpoint_saver=False)
+def test_buffer_evicted_after_persist(monkeypatch):
+    """Test that a thread's buffer is released once its chunks are persisted."""
+    manager = checkpoint.ChatStreamManager(checkpoint_saver=True, db_uri=POSTGRES_URL)
+    calls = []
+    manager.postgres_conn = object()
+    monkeypatch.setattr(
+        manager,
+        "_persist_to_postgresql",
+        lambda thread_id, messages: calls.append((thread_id, messages)) or True,
+    )
+
+    manager.process_stream_message("evict", "a", finish_reason="partial")
+    assert manager.process_stream_message("evict", "b", finish_reason="stop") is True
+    assert "evict" not in manager.buffers
+
+    # A resumed conversation only persists the chunks streamed since
+    assert manager.process_stream_message("evict", "c", finish_reason="stop") is True
+    assert calls == [("evict", ["a", "b"]), ("evict", ["c"])]
 
-    # Manually set a cursor with missing index
-    namespace = ("messages", "edge_test")
-    manager.store.put(namespace, "cursor", {})  # Missing 'index' key
 
-    # Should handle missing index gracefully
-    result = manager.process_stream_message(
-        "edge_test", "test", finish_reason="partial"
+def test_buffer_restored_when_persist_fails(monkeypatch):
+    """Test that chunks are kept for the next attempt when persisting fails."""
+    manager = checkpoint.ChatStreamManager(checkpoint_saver=True, db_uri=POSTGRES_URL)
+    calls = []
+    results = iter([False, True])
+    manager.postgres_conn = object()
+    monkeypatch.setattr(
+        manager,
+        "_persist_to_postgresql",
+        lambda thread_id, messages: calls.append(list(messages)) or next(results),
     )
-    assert result is True
 
-    # Should default to 0 and increment to 1
-    cursor = manager.store.get(namespace, "cursor")
-    assert cursor.value["index"] == 1
+    assert manager.process_stream_message("retry", "a", finish_reason="stop") is False
+    assert manager.buffers.get("retry") == ["a"]
+    assert manager.process_stream_message("retry", "b", finish_reason="stop") is True
+    assert calls == [["a"], ["a", "b"]]
+    assert "retry" not in manager.buffers
 
 
 def test_multiple_threads_isolation():
@@ -327,76 +333,51 @@ def test_multiple_threads_isolation():
     )
 
     # Verify isolation
-    thread1_items = manager.store.search(("messages", "thread1"), limit=10)
-    thread2_items = manager.store.search(("messages", "thread2"), limit=10)
-
-    thread1_values = [
-        item.dict()["value"]
-        for item in thread1_items
-        if isinstance(item.dict()["value"], str)
-    ]
-    thread2_values = [
-        item.dict()["value"]
-        for item in thread2_items
-        if isinstance(item.dict()["value"], str)
-    ]
-
-    assert "msg1" in thread1_values
-    assert "msg3" in thread1_values
-    assert "msg2" in thread2_values
-    assert "msg1" not in thread2_values
-    assert "msg2" not in thread1_values
+    assert manager.buffers.get("thread1") == ["msg1", "msg3"]
+    assert manager.buffers.get("thread2") == ["msg2"]
 
 
 def test_mongodb_insert_and_update_paths(monkeypatch):
-    """Exercise MongoDB insert, update, and exception branches."""
+    """Exercise MongoDB upsert (insert and append) and exception branches."""
 
     # Fake Mongo classes
     class FakeUpdateResult:
-        def __init__(self, modified_count):
+        def __init__(self, modified_count, upserted_id=None):
             self.modified_count = modified_count
-
-    class FakeInsertResult:
-        def __init__(self, inserted_id):
-            self.inserted_id = inserted_id
+            self.upserted_id = upserted_id
 
     class FakeCollection:
         def __init__(self, mode="insert_success"):
             self.mode = mode
+            self.calls = []
 
-        def find_one(self, query):
-            if self.mode.startswith("insert"):
-                return None
-            return {"thread_id": query["thread_id"]}
-
-        def update_one(self, q, s):
+        def update_one(self, q, s, upsert=False):
+            self.calls.append((q, s, upsert))
+            if self.mode == "insert_success":
+                return FakeUpdateResult(0, upserted_id="ok")
             if self.mode == "update_success":
                 return FakeUpdateResult(1)
+            if self.mode == "raise":
+                raise RuntimeError("boom")
             return FakeUpdateResult(0)
 
-        def insert_one(self, doc):
-            if self.mode == "insert_success":
-                return FakeInsertResult("ok")
-            if self.mode == "insert_none":
-                return FakeInsertResult(None)
-            raise RuntimeError("boom")
-
     class FakeMongoDB:
         def __init__(self, mode):
             self.chat_streams = FakeCollection(mode)
 
     manager = checkpoint.ChatStreamManager(checkpoint_saver=True, db_uri=MONGO_URL)
 
-    # Insert success
+    # Insert success, in a single upsert that appends the new range
     manager.mongo_db = FakeMongoDB("insert_success")
-    assert manager._persist_to_mongodb("th1", ["a"]) is True
-
-    # Insert returns None id => False
-    manager.mongo_db = FakeMongoDB("insert_none")
-    assert manager._persist_to_mongodb("th2", ["a"]) is False
-
-    # Insert raises => False
-    manager.mongo_db = FakeMongoDB("insert_raise")
+    assert manager._persist_to_mongodb("th1", ["a", "b"]) is True
+    query, update, upsert = manager.mongo_db.chat_streams.calls[0]
+    assert query == {"thread_id": "th1"}
+    assert update["$push"] == {"messages": {"$each": ["a", "b"]}}
+    assert "id" in update["$setOnInsert"]
+    assert upsert is True
+
+    # Raises => False
+    manager.mongo_db = FakeMongoDB("raise")
     assert manager._persist_to_mongodb("th3", ["a"]) is False
 
     # Update success
@@ -409,7 +390,7 @@ def test_mongodb_insert_and_update_paths(monkeypatch):
 
 
 def test_postgresql_insert_update_and_error_paths():
-    """Exercise PostgreSQL update, insert, and error/rollback branches."""
+    """Exercise PostgreSQL upsert and error/rollback branches."""
     calls = {"executed": []}
 
     class FakeCursor:
@@ -424,20 +405,10 @@ def test_postgresql_insert_update_and_error_paths():
             return False
 
         def execute(self, sql, params=None):
-            calls["executed"].append(sql.strip().split()[0])
-            if "SELECT" in sql:
-                if self.mode == "update":
-                    self._fetch = {"id": "x"}
-                elif self.mode == "error":
-                    raise RuntimeError("sql error")
-                else:
-                    self._fetch = None
-            else:
-                # UPDATE or INSERT
-                self.rowcount = 1
-
-        def fetchone(self):
-            return getattr(self, "_fetch", None)
+            calls["executed"].append((sql, params))
+            if self.mode == "error":
+                raise RuntimeError("sql error")
+            self.rowcount = 1
 
     class FakeConn:
         def __init__(self, mode):
@@ -456,15 +427,15 @@ def test_postgresql_insert_update_and_error_paths():
 
     manager = checkpoint.ChatStreamManager(checkpoint_saver=True, db_uri=POSTGRES_URL)
 
-    # Update path
-    manager.postgres_conn = FakeConn("update")
-    assert manager._persist_to_postgresql("t", ["m"]) is True
-    assert manager.postgres_conn.commit_called is True
-
-    # Insert path
-    manager.postgres_conn = FakeConn("insert")
+    # Upsert path: one statement, no lookup
+    manager.postgres_conn = FakeConn("upsert")
     assert manager._persist_to_postgresql("t", ["m"]) is True
     assert manager.postgres_conn.commit_called is True
+    assert len(calls["executed"]) == 1
+    sql, params = calls["executed"][0]
+    assert "ON CONFLICT (thread_id)" in sql
+    assert "chat_streams.messages || EXCLUDED.messages" in sql
+    assert params[1:3] == ("t", '["m"]')
 
     # Error path with rollback
     manager.postgres_conn = FakeConn("error")
@@ -472,6 +443,73 @@ def test_postgresql_insert_update_and_error_paths():
     assert manager.postgres_conn.rollback_called is True
 
 
+def test_chunks_storage_mode_appends_rows():
+    """In chunks mode each chunk becomes its own row/document."""
+
+    class FakeCursor:
+        def __init__(self):
+            self.rows = None
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def executemany(self, sql, rows):
+            assert "chat_stream_chunks" in sql
+            self.rows = list(rows)
+
+    class FakeConn:
+        def __init__(self):
+            self.cursor_obj = FakeCursor()
+            self.commit_called = False
+
+        def cursor(self):
+            return self.cursor_obj
+
+        def commit(self):
+            self.commit_called = True
+
+    class FakeInsertManyResult:
+        def __init__(self, ids):
+            self.inserted_ids = ids
+
+    class FakeChunkCollection:
+        def __init__(self):
+            self.documents = []
+
+        def insert_many(self, documents, ordered=True):
+            self.documents.extend(documents)
+            return FakeInsertManyResult(list(range(len(documents))))
+
+    class FakeMongoDB:
+        def __init__(self):
+            self.chat_stream_chunks = FakeChunkCollection()
+
+    manager = checkpoint.ChatStreamManager(
+        checkpoint_saver=True, db_uri=POSTGRES_URL, storage_mode="chunks"
+    )
+    manager.postgres_conn = FakeConn()
+    assert manager._persist_to_postgresql("t", ["a", "b"]) is True
+    assert [row[:2] for row in manager.postgres_conn.cursor_obj.rows] == [
+        ("t", "a"),
+        ("t", "b"),
+    ]
+    assert manager.postgres_conn.commit_called is True
+
+    manager.mongo_db = FakeMongoDB()
+    assert manager._persist_to_mongodb("t", ["a", "b"]) is True
+    assert [
+        doc["message"] for doc in manager.mongo_db.chat_stream_chunks.documents
+    ] == ["a", "b"]
+
+
+def test_unsupported_storage_mode_falls_back_to_blob():
+    manager = checkpoint.ChatStreamManager(checkpoint_saver=False, storage_mode="rows")
+    assert manager.storage_mode == "blob"
+
+
 def test_create_chat_streams_table_success_and_error():
     """Ensure table creation commits on success and rolls back on failure."""
 
@@ -658,3 +696,15 @@ def test_chat_stream_message_wrapper(monkeypatch):
     called["args"] = None
     assert checkpoint.chat_stream_message("tid", "msg", "stop") is False
     assert called["args"] is None
+
+
+def test_manager_stats_reports_buffer_metrics():
+    manager = checkpoint.ChatStreamManager(checkpoint_saver=False, buffer_max_threads=1)
+    manager.process_stream_message("s1", "abc", finish_reason="partial")
+    manager.process_stream_message("s2", "de", finish_reason="partial")
+
+    stats = manager.stats()
+    assert stats["resident_threads"] == 1
+    assert stats["resident_bytes"] == 2
+    assert stats["evictions"] == 1
+    assert stats["writer_pending_threads"] == 0
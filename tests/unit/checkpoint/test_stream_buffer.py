@@ -0,0 +1,127 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.graph.stream_buffer import StreamBufferStore
+
+
+def test_append_returns_buffered_count():
+    buffers = StreamBufferStore()
+    assert buffers.append("t1", "a") == 1
+    assert buffers.append("t1", "b") == 2
+    assert buffers.append("t2", "c") == 1
+    assert len(buffers) == 2
+    assert sorted(buffers) == ["t1", "t2"]
+
+
+def test_get_unknown_thread_returns_empty_list():
+    buffers = StreamBufferStore()
+    assert buffers.get("missing") == []
+    assert "missing" not in buffers
+
+
+def test_pop_detaches_chunks_and_evicts_thread():
+    buffers = StreamBufferStore()
+    buffers.append("t1", "a")
+    buffers.append("t1", "b")
+    chunks = buffers.get("t1")
+
+    popped = buffers.pop("t1")
+
+    assert popped is chunks
+    assert popped == ["a", "b"]
+    assert "t1" not in buffers
+    assert buffers.pop("t1") == []
+
+
+def test_restore_puts_chunks_before_newer_ones():
+    buffers = StreamBufferStore()
+    buffers.append("t1", "c")
+
+    buffers.restore("t1", ["a", "b"])
+    buffers.restore("t2", ["x"])
+    buffers.restore("t3", [])
+
+    assert buffers.get("t1") == ["a", "b", "c"]
+    assert buffers.get("t2") == ["x"]
+    assert "t3" not in buffers
+
+
+def test_max_threads_evicts_least_recently_updated():
+    buffers = StreamBufferStore(max_threads=2)
+    buffers.append("t1", "a")
+    buffers.append("t2", "b")
+    buffers.append("t1", "c")
+    buffers.append("t3", "d")
+
+    assert sorted(buffers) == ["t1", "t3"]
+    stats = buffers.stats()
+    assert stats["evictions"] == 1
+    assert stats["dropped_chunks"] == 1
+    assert stats["resident_threads"] == 2
+
+
+def test_max_bytes_tracks_resident_size():
+    buffers = StreamBufferStore(max_bytes=10)
+    buffers.append("t1", "12345")
+    buffers.append("t2", "1234")
+    assert buffers.stats()["resident_bytes"] == 9
+
+    buffers.append("t2", "12")
+    assert "t1" not in buffers
+    assert buffers.stats()["resident_bytes"] == 6
+
+    buffers.pop("t2")
+    assert buffers.stats()["resident_bytes"] == 0
+
+
+def test_oversized_active_stream_is_kept_without_spill_dir():
+    buffers = StreamBufferStore(max_bytes=4)
+    buffers.append("t1", "123456")
+    assert buffers.get("t1") == ["123456"]
+
+
+def test_ttl_expires_idle_threads():
+    buffers = StreamBufferStore(ttl=60)
+    buffers.append("t1", "a")
+    buffers.append("t2", "b")
+    buffers._buffers["t1"].updated_at -= 120
+
+    assert buffers.expire() == 1
+    assert list(buffers) == ["t2"]
+    assert buffers.stats()["expirations"] == 1
+
+
+def test_evicted_threads_spill_and_reload(tmp_path):
+    buffers = StreamBufferStore(max_threads=1, spill_dir=str(tmp_path))
+    buffers.append("t1", "a")
+    buffers.append("t1", "b")
+    buffers.append("t2", "x")
+
+    assert "t1" not in buffers
+    assert buffers.stats()["spilled_threads"] == 1
+    assert buffers.get("t1") == ["a", "b"]
+
+    # Resumed stream: spilled chunks come back in front of new ones
+    buffers.append("t1", "c")
+    assert buffers.pop("t1") == ["a", "b", "c"]
+    assert buffers.pop("t2") == ["x"]
+    assert buffers.stats()["spilled_threads"] == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spilled_chunks_survive_restart(tmp_path):
+    buffers = StreamBufferStore(ttl=1, spill_dir=str(tmp_path))
+    buffers.append("t1", "a")
+    buffers.expire(buffers._buffers["t1"].updated_at + 5)
+
+    reloaded = StreamBufferStore(spill_dir=str(tmp_path))
+    assert reloaded.pop("t1") == ["a"]
+
+
+def test_oversized_active_stream_spills(tmp_path):
+    buffers = StreamBufferStore(max_bytes=4, spill_dir=str(tmp_path))
+    buffers.append("t1", "123456")
+    buffers.append("t1", "7")
+
+    assert buffers.stats()["resident_bytes"] == 1
+    assert buffers.pop("t1") == ["123456", "7"]
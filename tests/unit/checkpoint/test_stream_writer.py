@@ -0,0 +1,198 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+import src.graph.checkpoint as checkpoint
+from src.graph.stream_writer import (
+    AsyncMongoStreamBackend,
+    AsyncPostgresStreamBackend,
+    BatchedStreamWriter,
+    create_stream_backend,
+)
+
+
+class FakeBackend:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.opened = 0
+        self.closed = 0
+        self.fail_times = fail_times
+
+    async def open(self):
+        self.opened += 1
+
+    async def write_batch(self, batch):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise RuntimeError("db down")
+        self.batches.append(list(batch))
+
+    async def close(self):
+        self.closed += 1
+
+
+def test_create_stream_backend_by_scheme():
+    assert isinstance(
+        create_stream_backend("postgresql://localhost/db"), AsyncPostgresStreamBackend
+    )
+    assert isinstance(
+        create_stream_backend("postgres://localhost/db"), AsyncPostgresStreamBackend
+    )
+    assert isinstance(
+        create_stream_backend("mongodb://localhost:27017"), AsyncMongoStreamBackend
+    )
+    assert create_stream_backend("redis://localhost:6379/0") is None
+
+
+@pytest.mark.asyncio
+async def test_writer_coalesces_ranges_of_same_thread():
+    backend = FakeBackend()
+    writer = BatchedStreamWriter(lambda: backend, flush_interval=0.01)
+
+    assert writer.submit("t1", ["a"]) is True
+    assert writer.submit("t1", ["b", "c"]) is True
+    assert writer.submit("t2", ["d"]) is True
+    await writer.flush()
+
+    assert backend.opened == 1
+    assert backend.batches == [[("t1", ["a", "b", "c"]), ("t2", ["d"])]]
+    await writer.aclose()
+    assert backend.closed == 1
+
+
+@pytest.mark.asyncio
+async def test_writer_splits_batches_by_size():
+    backend = FakeBackend()
+    writer = BatchedStreamWriter(lambda: backend, batch_size=2, flush_interval=0.01)
+
+    for i in range(5):
+        writer.submit(f"t{i}", [str(i)])
+    await writer.flush()
+
+    assert [len(batch) for batch in backend.batches] == [2, 2, 1]
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_writer_retries_failed_batches():
+    backend = FakeBackend(fail_times=1)
+    writer = BatchedStreamWriter(lambda: backend, flush_interval=0)
+
+    writer.submit("t1", ["a"])
+    await writer.aclose()
+
+    assert backend.batches == [[("t1", ["a"])]]
+    assert writer.pending_count == 0
+
+
+@pytest.mark.asyncio
+async def test_writer_requeues_failed_range_before_newer_chunks():
+    backend = FakeBackend()
+    writer = BatchedStreamWriter(lambda: backend, flush_interval=0)
+    writer._pending["t1"] = ["c"]
+
+    writer._requeue([("t1", ["a", "b"])])
+
+    assert writer._pending["t1"] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_writer_drops_after_max_retries():
+    backend = FakeBackend(fail_times=10)
+    writer = BatchedStreamWriter(lambda: backend, flush_interval=0, max_retries=2)
+
+    writer.submit("t1", ["a"])
+    await writer.aclose()
+
+    assert backend.batches == []
+    assert writer.pending_count == 0
+
+
+@pytest.mark.asyncio
+async def test_writer_rejects_submissions_while_closing():
+    backend = FakeBackend()
+    writer = BatchedStreamWriter(lambda: backend)
+    writer._closing = True
+    assert writer.submit("t1", ["a"]) is False
+
+
+@pytest.mark.asyncio
+async def test_manager_hands_completed_conversation_to_writer(monkeypatch):
+    def _no_pg(self):
+        self.postgres_conn = None
+
+    monkeypatch.setattr(
+        checkpoint.ChatStreamManager, "_init_postgresql", _no_pg, raising=True
+    )
+    backend = FakeBackend()
+    manager = checkpoint.ChatStreamManager(
+        checkpoint_saver=True,
+        db_uri="postgresql://localhost/db",
+        async_writer=True,
+        writer_flush_interval=0.01,
+    )
+    manager.writer.backend_factory = lambda: backend
+
+    assert manager.process_stream_message("thd", "Hello", "partial") is True
+    assert manager.process_stream_message("thd", " World", "stop") is True
+    await manager.aclose()
+
+    assert backend.batches == [[("thd", ["Hello", " World"])]]
+
+
+def test_manager_without_running_loop_persists_synchronously(monkeypatch):
+    def _no_pg(self):
+        self.postgres_conn = None
+
+    monkeypatch.setattr(
+        checkpoint.ChatStreamManager, "_init_postgresql", _no_pg, raising=True
+    )
+    manager = checkpoint.ChatStreamManager(
+        checkpoint_saver=True,
+        db_uri="postgresql://localhost/db",
+        async_writer=True,
+    )
+    calls = []
+    manager.postgres_conn = object()
+    monkeypatch.setattr(
+        manager,
+        "_persist_to_postgresql",
+        lambda thread_id, messages: calls.append((thread_id, messages)) or True,
+    )
+
+    assert manager.process_stream_message("thd", "Hello", "stop") is True
+    assert calls == [("thd", ["Hello"])]
+    assert manager.writer.pending_count == 0
+
+
+def test_manager_without_async_writer_has_no_writer():
+    manager = checkpoint.ChatStreamManager(checkpoint_saver=False, async_writer=True)
+    assert manager.writer is None
+
+
+@pytest.mark.asyncio
+async def test_writer_rebinds_to_new_event_loop():
+    backend = FakeBackend()
+    writer = BatchedStreamWriter(lambda: backend, flush_interval=0)
+    writer.submit("t1", ["a"])
+    await writer.flush()
+
+    def run_in_new_loop():
+        async def _submit():
+            writer.submit("t2", ["b"])
+            await writer.flush()
+
+        asyncio.run(_submit())
+
+    await asyncio.to_thread(run_in_new_loop)
+    assert backend.batches[-1] == [("t2", ["b"])]
+
+
+def test_create_stream_backend_passes_storage_mode():
+    backend = create_stream_backend("postgresql://localhost/db", "chunks")
+    assert backend.storage_mode == "chunks"
+    backend = create_stream_backend("mongodb://localhost:27017", "chunks")
+    assert backend.storage_mode == "chunks"
@@ -0,0 +1,88 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.crawler import Article
+from src.crawler.chunking import BM25, ChunkedDocument, split_markdown, tokenize
+
+MARKDOWN = """Intro paragraph about the site.
+
+## Installation
+
+Install the package with pip.
+
+Then configure the API key.
+
+## Pricing
+
+The free plan allows 100 requests per day.
+
+中文说明
+----
+
+深度研究框架
+"""
+
+
+def test_tokenize():
+    assert tokenize("Deer-Flow 研究 v2.0") == ["deer", "flow", "研", "究", "v2", "0"]
+
+
+def test_split_markdown_by_section():
+    chunks = split_markdown(MARKDOWN)
+    assert [c.heading for c in chunks] == ["", "Installation", "Pricing", "中文说明"]
+    assert [c.index for c in chunks] == [0, 1, 2, 3]
+    assert (
+        chunks[1].text == "Install the package with pip.\n\nThen configure the API key."
+    )
+
+
+def test_split_markdown_respects_max_chars():
+    markdown = "\n\n".join(["word " * 30] * 4) + "\n\n" + "long " * 100
+    chunks = split_markdown(markdown, max_chars=200)
+    assert len(chunks) > 4
+    assert all(len(c.text) <= 200 for c in chunks)
+    assert "".join(c.text for c in chunks).count("long") == 100
+
+
+def test_bm25_prefers_rarer_terms():
+    bm25 = BM25([["free", "plan"], ["plan", "pricing", "plan"], ["install"]])
+    scores = bm25.scores(["pricing", "plan"])
+    assert scores[1] > scores[0] > scores[2] == 0
+
+
+def test_search_returns_relevant_chunks_in_order():
+    document = ChunkedDocument("https://a.com", "Title", split_markdown(MARKDOWN))
+    chunks = document.search("how much does the free plan cost", top_k=1)
+    assert [c.heading for c in chunks] == ["Pricing"]
+
+    chunks = document.search("install pricing", top_k=2)
+    assert [c.heading for c in chunks] == ["Installation", "Pricing"]
+
+    assert [c.heading for c in document.search("研究")] == ["中文说明"]
+
+
+def test_search_without_matches_reads_from_start():
+    document = ChunkedDocument("https://a.com", "Title", split_markdown(MARKDOWN))
+    chunks = document.search("unrelated", budget=100)
+    assert [c.index for c in chunks] == [0, 1]
+
+
+def test_search_respects_budget():
+    document = ChunkedDocument("https://a.com", "Title", split_markdown(MARKDOWN))
+    chunks = document.search("install plan", budget=10)
+    assert len(chunks) == 1
+
+
+def test_read_from_offset():
+    document = ChunkedDocument("https://a.com", "Title", split_markdown(MARKDOWN))
+    assert [c.index for c in document.read(1, budget=100)] == [1, 2]
+    assert [c.index for c in document.read(3)] == [3]
+    assert document.read(10) == []
+
+
+def test_from_article():
+    article = Article("Title", "<h2>Section</h2><p>Body text</p>")
+    document = ChunkedDocument.from_article("https://a.com", article)
+    assert document.title == "Title"
+    assert document.chunks[0].heading == "Section"
+    assert document.chunks[0].text == "Body text"
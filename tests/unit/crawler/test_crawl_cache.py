@@ -0,0 +1,131 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.crawler import Article, Crawler
+from src.crawler.cache import CrawlCache, content_hash
+from src.crawler.jina_client import JinaResponse
+
+HTML = "<html><body><h1>Title</h1><p>Body</p></body></html>"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CrawlCache(str(tmp_path / "crawl" / "cache.db"), ttl=60)
+    with patch("src.crawler.crawler.get_crawl_cache", return_value=cache):
+        yield cache
+    cache.close()
+
+
+@pytest.fixture
+def extractor():
+    calls = []
+
+    def extract_article(self, html):
+        calls.append(html)
+        return Article("Title", "<p>Body</p>")
+
+    with patch(
+        "src.crawler.crawler.ReadabilityExtractor.extract_article", extract_article
+    ):
+        yield calls
+
+
+@pytest.fixture
+def fetch():
+    with patch(
+        "src.crawler.crawler.JinaClient.fetch",
+        return_value=JinaResponse(200, HTML, etag='"v1"'),
+    ) as mock:
+        yield mock
+
+
+def test_store_and_lookup(tmp_path):
+    cache = CrawlCache(str(tmp_path / "cache.db"))
+    page = cache.store_page("https://a.com", HTML, etag='"v1"')
+    assert page.content_hash == content_hash(HTML)
+    assert page.etag == '"v1"'
+    assert not page.has_article
+
+    cache.store_article(page.content_hash, "Title", "<p>Body</p>", "Body")
+    page = cache.lookup("https://a.com")
+    assert page.has_article
+    assert page.markdown == "Body"
+    assert cache.lookup("https://b.com") is None
+    cache.close()
+
+
+def test_identical_content_shares_article(tmp_path):
+    cache = CrawlCache(str(tmp_path / "cache.db"))
+    page = cache.store_page("https://a.com/x", HTML)
+    cache.store_article(page.content_hash, "Title", "<p>Body</p>", "Body")
+    other = cache.store_page("https://mirror.com/x", HTML)
+    assert other.has_article
+    cache.close()
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = CrawlCache(str(tmp_path / "cache.db"), max_bytes=250)
+    cache.store_page("https://a.com", "a" * 100)
+    cache.store_page("https://b.com", "b" * 100)
+    cache.lookup("https://a.com")
+    cache.store_page("https://c.com", "c" * 100)
+    assert cache.lookup("https://b.com") is None
+    assert cache.lookup("https://a.com") is not None
+    assert cache.lookup("https://c.com") is not None
+
+    # A page larger than the whole cache is still returned
+    page = cache.store_page("https://big.com", "x" * 1000)
+    assert page.html == "x" * 1000
+    cache.close()
+
+
+def test_crawl_uses_cache(cache, extractor, fetch):
+    first = Crawler().crawl("https://a.com")
+    second = Crawler().crawl("https://a.com")
+
+    assert fetch.call_count == 1
+    assert extractor == [HTML]
+    assert first.url == second.url == "https://a.com"
+    assert second.to_markdown() == first.to_markdown()
+
+
+def test_crawl_revalidates_stale_page(cache, extractor, fetch):
+    Crawler().crawl("https://a.com")
+    cache.ttl = 0.000001
+
+    fetch.return_value = JinaResponse(304, "")
+    article = Crawler().crawl("https://a.com")
+
+    assert fetch.call_args.kwargs == {"etag": '"v1"', "last_modified": None}
+    assert article.title == "Title"
+    assert extractor == [HTML]
+
+
+def test_crawl_refetches_changed_page(cache, extractor, fetch):
+    Crawler().crawl("https://a.com")
+    cache.ttl = 0.000001
+
+    fetch.return_value = JinaResponse(200, HTML + "<p>new</p>", etag='"v2"')
+    Crawler().crawl("https://a.com")
+
+    assert len(extractor) == 2
+    assert cache.lookup("https://a.com").etag == '"v2"'
+
+
+@pytest.mark.asyncio
+async def test_acrawl_uses_cache(cache, extractor):
+    with patch(
+        "src.crawler.crawler.JinaClient.afetch",
+        new_callable=AsyncMock,
+        return_value=JinaResponse(200, HTML),
+    ) as afetch:
+        await Crawler().acrawl("https://a.com")
+        article = await Crawler().acrawl("https://a.com")
+
+    afetch.assert_awaited_once()
+    assert extractor == [HTML]
+    assert article.url == "https://a.com"
@@ -0,0 +1,74 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.crawler import Article, Crawler
+
+
+@pytest.fixture
+def fake_acrawl(monkeypatch):
+    state = {"running": {}, "peak": {}, "peak_total": 0, "delays": {}}
+
+    async def acrawl(self, url):
+        host = url.split("/")[2]
+        state["running"][host] = state["running"].get(host, 0) + 1
+        state["peak"][host] = max(state["peak"].get(host, 0), state["running"][host])
+        total = sum(state["running"].values())
+        state["peak_total"] = max(state["peak_total"], total)
+        try:
+            await asyncio.sleep(state["delays"].get(url, 0.01))
+            if "fail" in url:
+                raise RuntimeError(f"cannot crawl {url}")
+            article = Article(title=url, html_content="<p>content</p>")
+            article.url = url
+            return article
+        finally:
+            state["running"][host] -= 1
+
+    monkeypatch.setattr(Crawler, "acrawl", acrawl)
+    return state
+
+
+async def collect(crawler, urls):
+    return [result async for result in crawler.crawl_many(urls)]
+
+
+@pytest.mark.asyncio
+async def test_crawl_many_yields_results_as_they_complete(fake_acrawl):
+    fake_acrawl["delays"] = {"https://a.com/slow": 0.2, "https://b.com/fast": 0.01}
+    results = await collect(Crawler(), ["https://a.com/slow", "https://b.com/fast"])
+    assert [r.url for r in results] == ["https://b.com/fast", "https://a.com/slow"]
+    assert all(r.ok for r in results)
+    assert results[0].article.title == "https://b.com/fast"
+
+
+@pytest.mark.asyncio
+async def test_crawl_many_limits_concurrency(fake_acrawl):
+    urls = [f"https://a.com/{i}" for i in range(6)] + [
+        f"https://b.com/{i}" for i in range(6)
+    ]
+    results = await collect(Crawler(max_concurrency=3, per_host_concurrency=2), urls)
+    assert len(results) == 12
+    assert fake_acrawl["peak"]["a.com"] <= 2
+    assert fake_acrawl["peak"]["b.com"] <= 2
+    assert fake_acrawl["peak_total"] <= 3
+
+
+@pytest.mark.asyncio
+async def test_crawl_many_reports_failures(fake_acrawl):
+    results = await collect(
+        Crawler(), ["https://a.com/fail", "https://a.com/ok", "https://a.com/ok"]
+    )
+    by_url = {r.url: r for r in results}
+    assert len(results) == 2
+    assert not by_url["https://a.com/fail"].ok
+    assert "cannot crawl" in str(by_url["https://a.com/fail"].error)
+    assert by_url["https://a.com/ok"].ok
+
+
+@pytest.mark.asyncio
+async def test_crawl_many_empty(fake_acrawl):
+    assert await collect(Crawler(), []) == []
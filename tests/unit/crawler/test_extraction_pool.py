@@ -0,0 +1,101 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.crawler import Article, Crawler
+from src.crawler import extraction
+from src.crawler.extraction import ExtractionPool, get_extraction_pool, limit_html
+
+
+# Run in forked workers, so they must be importable module-level functions
+def fake_extract(html):
+    return "Title", f"<p>{len(html)}</p>", f"{len(html)} chars"
+
+
+def slow_extract(html):
+    if "slow" in html:
+        time.sleep(30)
+    return fake_extract(html)
+
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(max_workers=2, timeout=5, max_html_bytes=1000)
+    with patch("src.crawler.extraction._extract_in_worker", fake_extract):
+        yield pool
+    pool.shutdown()
+
+
+def test_limit_html():
+    assert limit_html("<p>short</p>", 1000) == "<p>short</p>"
+    assert limit_html("x" * 2000, 1000) == "x" * 1000
+    # Multi-byte characters are not split
+    assert limit_html("数" * 1000, 1000) == "数" * 333
+    assert limit_html("x" * 2000, 0) == "x" * 2000
+
+
+def test_extract(pool):
+    article = pool.extract("<html>page</html>")
+    assert isinstance(article, Article)
+    assert article.title == "Title"
+    assert article.to_markdown(including_title=False) == "17 chars"
+
+
+def test_extract_truncates_large_pages(pool):
+    article = pool.extract("x" * 5000)
+    assert article.html_content == "<p>1000</p>"
+
+
+@pytest.mark.asyncio
+async def test_aextract_concurrently(pool):
+    pages = [f"<p>{'x' * i}</p>" for i in range(6)]
+    articles = await asyncio.gather(*(pool.aextract(html) for html in pages))
+    assert [a.html_content for a in articles] == [f"<p>{len(p)}</p>" for p in pages]
+
+
+@pytest.mark.asyncio
+async def test_aextract_timeout_restarts_pool():
+    pool = ExtractionPool(max_workers=1, timeout=0.5)
+    with patch("src.crawler.extraction._extract_in_worker", slow_extract):
+        with pytest.raises(TimeoutError):
+            await pool.aextract("slow")
+        # A fresh worker takes the next page
+        article = await pool.aextract("fast")
+    assert article.title == "Title"
+    pool.shutdown()
+
+
+def test_get_extraction_pool_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("CRAWL_EXTRACTION_WORKERS", raising=False)
+    assert get_extraction_pool() is None
+
+
+def test_get_extraction_pool(monkeypatch):
+    monkeypatch.setenv("CRAWL_EXTRACTION_WORKERS", "3")
+    monkeypatch.setenv("CRAWL_EXTRACTION_TIMEOUT_SECONDS", "7")
+    try:
+        pool = get_extraction_pool()
+        assert pool.max_workers == 3
+        assert pool.timeout == 7
+        assert get_extraction_pool() is pool
+    finally:
+        extraction.shutdown_extraction_pool()
+
+
+@pytest.mark.asyncio
+async def test_crawler_submits_to_pool(pool):
+    with (
+        patch("src.crawler.crawler.get_extraction_pool", return_value=pool),
+        patch("src.crawler.crawler.get_crawl_cache", return_value=None),
+        patch("src.crawler.crawler.JinaClient.acrawl", return_value="<p>page</p>"),
+        patch("src.crawler.crawler.JinaClient.crawl", return_value="<p>page</p>"),
+    ):
+        article = await Crawler().acrawl("https://a.com")
+        assert article.url == "https://a.com"
+        assert article.title == "Title"
+        assert Crawler().crawl("https://b.com").url == "https://b.com"
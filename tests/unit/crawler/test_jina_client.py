@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.crawler.jina_client import JinaClient
+
+
+def make_response(status_code, text="<html></html>"):
+    return httpx.Response(
+        status_code, text=text, request=httpx.Request("POST", "https://r.jina.ai/")
+    )
+
+
+@pytest.fixture
+def client_post():
+    client = MagicMock()
+    client.post = AsyncMock()
+    with (
+        patch("src.crawler.jina_client.get_async_http_client", return_value=client),
+        patch("src.crawler.jina_client.asyncio.sleep", new_callable=AsyncMock),
+    ):
+        yield client.post
+
+
+@pytest.mark.asyncio
+async def test_acrawl_success(client_post):
+    client_post.return_value = make_response(200, "<p>page</p>")
+    html = await JinaClient(timeout=5).acrawl("https://example.com")
+    assert html == "<p>page</p>"
+    kwargs = client_post.call_args.kwargs
+    assert kwargs["json"] == {"url": "https://example.com"}
+    assert kwargs["headers"]["X-Return-Format"] == "html"
+    assert kwargs["timeout"] == 5
+
+
+@pytest.mark.asyncio
+async def test_acrawl_retries_transient_failures(client_post):
+    client_post.side_effect = [
+        httpx.ConnectError("reset"),
+        make_response(503),
+        make_response(200, "ok"),
+    ]
+    assert await JinaClient(max_retries=2).acrawl("https://example.com") == "ok"
+    assert client_post.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_acrawl_gives_up_after_retries(client_post):
+    client_post.return_value = make_response(429)
+    with pytest.raises(httpx.HTTPStatusError):
+        await JinaClient(max_retries=1).acrawl("https://example.com")
+    assert client_post.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_acrawl_does_not_retry_client_errors(client_post):
+    client_post.return_value = make_response(404)
+    with pytest.raises(httpx.HTTPStatusError):
+        await JinaClient(max_retries=3).acrawl("https://example.com")
+    assert client_post.await_count == 1
@@ -8,6 +8,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 import src.graph.builder as builder_mod
+from src.prompts.planner_model import Plan, Step, StepType
 
 
 @pytest.fixture
@@ -86,6 +87,69 @@ def test_continue_to_running_research_team_default_planner(mock_state):
     assert builder_mod.continue_to_running_research_team(state) == "planner"
 
 
+def _plan(*steps):
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="",
+        title="Plan",
+        steps=[
+            Step(need_search=True, title=f"Step {i + 1}", description="", **step)
+            for i, step in enumerate(steps)
+        ],
+    )
+
+
+PARALLEL_CONFIG = {
+    "configurable": {"enable_parallel_steps": True, "max_parallel_steps": 2}
+}
+
+
+def test_continue_to_running_research_team_fans_out_ready_steps():
+    plan = _plan(
+        {"step_type": StepType.RESEARCH},
+        {"step_type": StepType.PROCESSING, "depends_on": []},
+        {"step_type": StepType.RESEARCH},
+    )
+    plan.steps[1].depends_on = [1]
+    state = {"current_plan": plan, "observations": []}
+
+    sends = builder_mod.continue_to_running_research_team(state, PARALLEL_CONFIG)
+
+    assert [send.node for send in sends] == ["researcher", "researcher"]
+    assert [send.arg["step_index"] for send in sends] == [0, 2]
+    assert sends[0].arg["current_plan"] is plan
+
+
+def test_continue_to_running_research_team_parallel_caps_fan_out():
+    plan = _plan(*[{"step_type": StepType.RESEARCH}] * 4)
+    sends = builder_mod.continue_to_running_research_team(
+        {"current_plan": plan}, PARALLEL_CONFIG
+    )
+    assert [send.arg["step_index"] for send in sends] == [0, 1]
+
+
+def test_continue_to_running_research_team_parallel_breaks_cycles():
+    plan = _plan(
+        {"step_type": StepType.RESEARCH, "depends_on": [2]},
+        {"step_type": StepType.PROCESSING, "depends_on": [1]},
+    )
+    sends = builder_mod.continue_to_running_research_team(
+        {"current_plan": plan}, PARALLEL_CONFIG
+    )
+    assert [(send.node, send.arg["step_index"]) for send in sends] == [
+        ("researcher", 0)
+    ]
+
+
+def test_continue_to_running_research_team_serial_by_default():
+    plan = _plan(*[{"step_type": StepType.RESEARCH}] * 2)
+    assert (
+        builder_mod.continue_to_running_research_team({"current_plan": plan})
+        == "researcher"
+    )
+
+
 @patch("src.graph.builder.StateGraph")
 def test_build_base_graph_adds_nodes_and_edges(MockStateGraph):
     mock_builder = MagicMock()
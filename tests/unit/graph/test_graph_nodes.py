@@ -0,0 +1,141 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command
+
+from src.graph.builder import continue_to_running_research_team
+from src.graph.nodes import _execute_agent_step, research_team_node
+from src.graph.types import State, merge_step_results
+from src.prompts.planner_model import Plan, Step, StepType
+
+
+def _plan(count):
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="",
+        title="Plan",
+        steps=[
+            Step(
+                need_search=True,
+                title=f"Step {i + 1}",
+                description="",
+                step_type=StepType.RESEARCH,
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def test_merge_step_results():
+    assert merge_step_results({}, {1: "b"}) == {1: "b"}
+    assert merge_step_results({0: "a"}, {1: "b"}) == {0: "a", 1: "b"}
+    assert merge_step_results({0: "a"}, None) == {}
+
+
+def test_research_team_node_without_results_is_noop():
+    assert research_team_node({"current_plan": _plan(1)}) is None
+
+
+def test_research_team_node_folds_results_in_plan_order():
+    plan = _plan(3)
+    update = research_team_node(
+        {
+            "current_plan": plan,
+            "observations": ["background"],
+            "step_results": {2: "third", 0: "first"},
+        }
+    )
+    assert update["observations"] == ["background", "first", "third"]
+    assert update["step_results"] is None
+    assert [step.execution_res for step in plan.steps] == ["first", None, "third"]
+
+
+@pytest.mark.asyncio
+async def test_parallel_steps_run_concurrently_and_merge_deterministically():
+    running = 0
+    peak = 0
+
+    async def researcher(state):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        index = state["step_index"]
+        # Later steps finish first
+        await asyncio.sleep(0.01 * (5 - index))
+        running -= 1
+        return Command(
+            update={"step_results": {index: f"result {index}"}},
+            goto="research_team",
+        )
+
+    builder = StateGraph(State)
+    builder.add_node("research_team", research_team_node)
+    builder.add_node("researcher", researcher)
+    builder.add_node("coder", researcher)
+    builder.add_node("planner", lambda state: None)
+    builder.add_edge(START, "research_team")
+    builder.add_conditional_edges(
+        "research_team",
+        continue_to_running_research_team,
+        ["planner", "researcher", "coder"],
+    )
+    builder.add_edge("planner", END)
+    graph = builder.compile()
+
+    result = await graph.ainvoke(
+        {"messages": [], "current_plan": _plan(5), "observations": []},
+        config={"enable_parallel_steps": True, "max_parallel_steps": 3},
+    )
+
+    assert peak == 3
+    assert result["observations"] == [f"result {i}" for i in range(5)]
+    assert all(step.execution_res for step in result["current_plan"].steps)
+
+
+class _RecordingAgent:
+    def __init__(self):
+        self.inputs = []
+
+    async def ainvoke(self, input, config=None):
+        self.inputs.append(input)
+        return {"messages": [AIMessage(content="finding")]}
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_step_passes_only_upstream_findings():
+    plan = _plan(3)
+    plan.steps[0].execution_res = "first finding"
+    plan.steps[1].execution_res = "second finding"
+    plan.steps[2].depends_on = [2]
+    agent = _RecordingAgent()
+
+    command = await _execute_agent_step(
+        {"current_plan": plan, "observations": []}, agent, "coder"
+    )
+
+    prompt = agent.inputs[0]["messages"][0].content
+    assert "second finding" in prompt
+    assert "first finding" not in prompt
+    assert plan.steps[2].execution_res == "finding"
+    assert command.update["observations"] == ["finding"]
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_step_flat_plan_passes_all_findings():
+    plan = _plan(3)
+    plan.steps[0].execution_res = "first finding"
+    plan.steps[1].execution_res = "second finding"
+    agent = _RecordingAgent()
+
+    await _execute_agent_step(
+        {"current_plan": plan, "observations": []}, agent, "coder"
+    )
+
+    prompt = agent.inputs[0]["messages"][0].content
+    assert "first finding" in prompt and "second finding" in prompt
@@ -0,0 +1,106 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import gc
+import operator
+import random
+from typing import Annotated, List, TypedDict
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from src.graph.registry import GraphRegistry
+
+
+class EchoState(TypedDict):
+    request: str
+    trace: Annotated[List[str], operator.add]
+
+
+async def _echo_node(state: EchoState, config):
+    # Yield to other streams between reading and writing state
+    await asyncio.sleep(random.random() / 100)
+    thread_id = config["configurable"]["thread_id"]
+    return {"trace": [f"{thread_id}:{state['request']}"]}
+
+
+def _compile_echo_graph(checkpointer, store):
+    builder = StateGraph(EchoState)
+    builder.add_node("first", _echo_node)
+    builder.add_node("second", _echo_node)
+    builder.add_edge(START, "first")
+    builder.add_edge("first", "second")
+    builder.add_edge("second", END)
+    return builder.compile(checkpointer=checkpointer, store=store)
+
+
+def test_registry_compiles_once_per_checkpointer():
+    compiled = []
+
+    def compile_graph(checkpointer, store):
+        compiled.append(checkpointer)
+        return MagicMock()
+
+    registry = GraphRegistry(compile_graph)
+    saver_a, saver_b = MemorySaver(), MemorySaver()
+
+    assert registry.get(saver_a) is registry.get(saver_a)
+    assert registry.get(saver_b) is not registry.get(saver_a)
+    assert compiled == [saver_a, saver_b]
+
+    registry.discard(saver_a)
+    registry.get(saver_a)
+    assert compiled == [saver_a, saver_b, saver_a]
+
+
+def test_registry_drops_collected_checkpointers():
+    registry = GraphRegistry(lambda checkpointer, store: MagicMock())
+    saver = MemorySaver()
+    registry.get(saver)
+    assert len(registry) == 1
+
+    del saver
+    gc.collect()
+    assert len(registry) == 0
+
+
+@patch("src.graph.registry.build_graph_with_checkpointer")
+def test_registry_passes_store(mock_build):
+    store = object()
+    saver = MemorySaver()
+    registry = GraphRegistry(mock_build, store=store)
+    registry.get(saver)
+    mock_build.assert_called_once_with(saver, store)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_streams_do_not_cross_talk():
+    registry = GraphRegistry(_compile_echo_graph)
+    savers = [MemorySaver(), MemorySaver()]
+    streams = 32
+
+    async def run(i: int):
+        checkpointer = savers[i % len(savers)]
+        graph = registry.get(checkpointer)
+        config = {"configurable": {"thread_id": f"thread-{i}"}}
+        seen = []
+        async for update in graph.astream(
+            {"request": f"req-{i}", "trace": []},
+            config=config,
+            stream_mode="updates",
+        ):
+            for node_update in update.values():
+                seen.extend(node_update["trace"])
+        state = await graph.aget_state(config)
+        return i, seen, state.values["trace"]
+
+    results = await asyncio.gather(*(run(i) for i in range(streams)))
+
+    assert len(registry) == len(savers)
+    for i, seen, persisted in results:
+        expected = [f"thread-{i}:req-{i}"] * 2
+        assert seen == expected
+        assert persisted == expected
@@ -0,0 +1,83 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from src.graph.scheduler import StepScheduler
+from src.prompts.planner_model import Plan, Step, StepType
+
+RESEARCH = {"step_type": StepType.RESEARCH}
+PROCESSING = {"step_type": StepType.PROCESSING}
+
+
+def _plan(*steps):
+    return Plan(
+        locale="en-US",
+        has_enough_context=False,
+        thought="",
+        title="Plan",
+        steps=[
+            Step(need_search=True, title=f"Step {i + 1}", description="", **step)
+            for i, step in enumerate(steps)
+        ],
+    )
+
+
+def test_ready_steps_follow_dependencies():
+    plan = _plan(RESEARCH, RESEARCH, {**RESEARCH, "depends_on": [1]}, PROCESSING)
+    assert StepScheduler.from_plan(plan).ready() == [0, 1]
+
+    plan.steps[0].execution_res = "done"
+    assert StepScheduler.from_plan(plan).ready() == [1, 2]
+
+    plan.steps[1].execution_res = "done"
+    plan.steps[2].execution_res = "done"
+    # Processing steps without dependencies wait for every earlier step
+    assert StepScheduler.from_plan(plan).ready() == [3]
+
+
+def test_invalid_references_are_ignored():
+    scheduler = StepScheduler.from_plan(
+        _plan({**RESEARCH, "depends_on": [0, 1, 9]}, RESEARCH)
+    )
+    assert scheduler.dependencies == [[], []]
+    assert scheduler.ready() == [0, 1]
+
+
+def test_forward_dependency_is_kept_unless_cyclic():
+    scheduler = StepScheduler.from_plan(
+        _plan({**RESEARCH, "depends_on": [2]}, RESEARCH)
+    )
+    assert scheduler.ready() == [1]
+
+    scheduler = StepScheduler.from_plan(
+        _plan({**RESEARCH, "depends_on": [2]}, {**RESEARCH, "depends_on": [1]})
+    )
+    assert scheduler.dependencies == [[], [0]]
+    assert scheduler.ready() == [0]
+
+
+def test_critical_path_is_scheduled_first():
+    # Step 3 starts a chain of three steps; steps 1 and 2 have no dependents
+    plan = _plan(
+        RESEARCH,
+        RESEARCH,
+        RESEARCH,
+        {**RESEARCH, "depends_on": [3]},
+        {**RESEARCH, "depends_on": [4]},
+    )
+    scheduler = StepScheduler.from_plan(plan)
+    assert scheduler.priority == [0, 0, 2, 1, 0]
+    assert scheduler.ready() == [2, 0, 1]
+
+
+def test_upstream_lists_direct_dependencies():
+    plan = _plan(
+        RESEARCH,
+        RESEARCH,
+        {**PROCESSING, "depends_on": [2]},
+        {**PROCESSING, "depends_on": [3, 1]},
+    )
+    scheduler = StepScheduler.from_plan(plan)
+    assert scheduler.has_declared_dependencies
+    assert scheduler.upstream(2) == [1]
+    assert scheduler.upstream(3) == [0, 2]
+    assert not StepScheduler.from_plan(_plan(RESEARCH)).has_declared_dependencies
@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from typing import List
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.llms import cache as cache_mod
+from src.llms.cache import LLMResponseCache, with_llm_cache
+
+
+class CountingChatModel(BaseChatModel):
+    temperature: float = 0
+    calls: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls.append(messages[-1].content)
+        reply = f"reply {len(self.calls)} {kwargs.get('tag', '')}".strip()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(reply))])
+
+
+@pytest.fixture
+def llm_cache(monkeypatch):
+    cache = LLMResponseCache(max_size=16)
+    monkeypatch.setattr(cache_mod, "llm_response_cache", cache)
+    monkeypatch.setattr(cache_mod, "_cached_models", {})
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    return cache
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("LLM_CACHE_ENABLED", raising=False)
+    llm = CountingChatModel(calls=[])
+    assert with_llm_cache(llm, "planner") is llm
+
+
+def test_deterministic_responses_are_cached(llm_cache):
+    llm = CountingChatModel(calls=[])
+    cached = with_llm_cache(llm, "planner")
+    assert cached is with_llm_cache(llm, "planner")
+
+    first = cached.invoke("hello")
+    second = cached.invoke("hello")
+    assert first.content == second.content == "reply 1"
+    assert llm.calls == ["hello"]
+    assert llm_cache.stats() == {"hits": 1, "misses": 1}
+
+    cached.invoke("other")
+    assert llm.calls == ["hello", "other"]
+    # The shared instance is left uncached
+    llm.invoke("hello")
+    assert len(llm.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_async_calls_share_the_cache(llm_cache):
+    llm = CountingChatModel(calls=[])
+    cached = with_llm_cache(llm, "prompt_enhancer")
+    cached.invoke("hello")
+    assert (await cached.ainvoke("hello")).content == "reply 1"
+    assert llm.calls == ["hello"]
+
+
+def test_bound_arguments_are_part_of_the_key(llm_cache):
+    llm = CountingChatModel(calls=[])
+    cached = with_llm_cache(llm, "coordinator")
+    assert cached.bind(tag="a").invoke("hello").content == "reply 1 a"
+    assert cached.bind(tag="b").invoke("hello").content == "reply 2 b"
+    assert cached.bind(tag="a").invoke("hello").content == "reply 1 a"
+
+
+def test_non_deterministic_models_are_not_cached(llm_cache):
+    llm = CountingChatModel(calls=[], temperature=0.7)
+    assert with_llm_cache(llm, "planner") is llm
+
+
+def test_agents_not_opted_in_are_not_cached(llm_cache):
+    llm = CountingChatModel(calls=[])
+    assert with_llm_cache(llm, "researcher") is llm
+    assert with_llm_cache(llm, "unknown_agent") is llm
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache" / "llm.db")
+    generations = [ChatGeneration(message=AIMessage("stored"))]
+    LLMResponseCache(sqlite_path=path).update("prompt", "model", generations)
+
+    reopened = LLMResponseCache(sqlite_path=path)
+    result = reopened.lookup("prompt", "model")
+    assert result[0].message.content == "stored"
+    assert reopened.lookup("prompt", "other model") is None
+    assert reopened.stats() == {"hits": 1, "misses": 1}
+
+    reopened.clear()
+    assert reopened.lookup("prompt", "model") is None
@@ -0,0 +1,202 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import httpx
+import openai
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableBinding
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+
+from src.llms import llm as llm_module
+from src.llms.router import OPEN, RoutedChatModel, is_retryable
+
+
+def _status_error(status_code: int) -> openai.APIStatusError:
+    response = httpx.Response(
+        status_code, request=httpx.Request("POST", "https://llm.example.com")
+    )
+    if status_code == 429:
+        return openai.RateLimitError("rate limited", response=response, body=None)
+    return openai.InternalServerError("server error", response=response, body=None)
+
+
+class FakeEndpoint(BaseChatModel):
+    name: str
+    errors: list = []
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-endpoint"
+
+    def _next(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.name
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        message = AIMessage(self._next())
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._generate(messages)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        name = self._next()
+        for part in (name[:1], name[1:]):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=part))
+
+
+def _router(*endpoints, **kwargs) -> RoutedChatModel:
+    return RoutedChatModel(models=list(endpoints), **kwargs)
+
+
+def test_retryable_errors():
+    assert is_retryable(_status_error(429))
+    assert is_retryable(_status_error(503))
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert not is_retryable(ValueError("bad request"))
+
+
+def test_calls_are_spread_across_endpoints():
+    a, b = FakeEndpoint(name="a"), FakeEndpoint(name="b")
+    router = _router(a, b)
+    answers = {router.invoke("hi").content for _ in range(4)}
+    assert answers == {"a", "b"}
+    assert a.calls == b.calls == 2
+
+
+def test_least_loaded_endpoint_comes_first():
+    router = _router(FakeEndpoint(name="a"), FakeEndpoint(name="b"), weights=[1, 3])
+    router._health[1].outstanding = 2
+    # (0 + 1) / 1 for a, (2 + 1) / 3 for b: tied, either may come first
+    assert set(router._order()) == {0, 1}
+    router._health[1].outstanding = 3
+    assert router._order() == [0, 1]
+    router._health[0].outstanding = 2
+    assert router._order() == [1, 0]
+
+
+def test_rate_limited_endpoint_fails_over_and_opens():
+    a = FakeEndpoint(name="a", errors=[_status_error(429)])
+    b = FakeEndpoint(name="b")
+    router = _router(a, b, weights=[10, 1])
+    assert router.invoke("hi").content == "b"
+    assert router.stats()[0]["state"] == OPEN
+    # Open endpoints are skipped while others are available
+    assert [router.invoke("hi").content for _ in range(3)] == ["b", "b", "b"]
+    assert a.calls == 1
+
+
+def test_circuit_opens_after_threshold_and_recovers():
+    a = FakeEndpoint(name="a", errors=[_status_error(500)] * 3)
+    b = FakeEndpoint(name="b")
+    router = _router(a, b, weights=[10, 1], failure_threshold=2, cooldown=0)
+    assert router.invoke("hi").content == "b"
+    assert router.stats()[0]["state"] == "closed"
+    assert router.invoke("hi").content == "b"
+    assert router.stats()[0]["state"] == OPEN
+    # After the cooldown, a failing probe reopens the circuit at once
+    assert router.invoke("hi").content == "b"
+    assert router.stats()[0]["state"] == OPEN
+    assert router.invoke("hi").content == "a"
+    assert router.stats()[0] == {
+        "name": "endpoint 0",
+        "weight": 10.0,
+        "outstanding": 0,
+        "failures": 0,
+        "state": "closed",
+    }
+
+
+def test_other_errors_are_raised_without_failover():
+    a = FakeEndpoint(name="a", errors=[ValueError("bad request")])
+    b = FakeEndpoint(name="b")
+    router = _router(a, b, weights=[10, 1])
+    with pytest.raises(ValueError):
+        router.invoke("hi")
+    assert b.calls == 0
+    assert router.stats()[0]["failures"] == 0
+
+
+def test_last_error_is_raised_when_every_endpoint_fails():
+    a = FakeEndpoint(name="a", errors=[_status_error(503)])
+    b = FakeEndpoint(name="b", errors=[_status_error(429)])
+    with pytest.raises(openai.APIStatusError):
+        _router(a, b).invoke("hi")
+    assert a.calls == b.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_fails_over():
+    a = FakeEndpoint(name="a", errors=[_status_error(502)])
+    router = _router(a, FakeEndpoint(name="b"), weights=[10, 1])
+    assert (await router.ainvoke("hi")).content == "b"
+
+
+def test_stream_fails_over_before_the_first_chunk():
+    a = FakeEndpoint(name="ab", errors=[_status_error(429)])
+    router = _router(a, FakeEndpoint(name="cd"), weights=[10, 1])
+    assert [chunk.content for chunk in router.stream("hi")] == ["c", "d"]
+
+
+def test_tools_and_structured_output_are_routed():
+    class Answer(BaseModel):
+        text: str
+
+    models = [ChatOpenAI(model="m", api_key="k", base_url=url) for url in "ab"]
+    router = _router(*models)
+
+    bound = router.bind_tools([Answer])
+    assert isinstance(bound, RunnableBinding)
+    assert bound.bound is router
+    assert bound.kwargs["tools"][0]["function"]["name"] == "Answer"
+
+    structured = router.with_structured_output(Answer, method="json_mode")
+    assert structured.first.bound is router
+    assert structured.first.kwargs["response_format"] == {"type": "json_object"}
+
+
+def test_invalid_weights():
+    with pytest.raises(ValueError):
+        _router(FakeEndpoint(name="a"), weights=[1, 2])
+    with pytest.raises(ValueError):
+        _router(FakeEndpoint(name="a"), weights=[0])
+
+
+def test_endpoint_list_creates_routed_model(monkeypatch):
+    monkeypatch.setenv("BASIC_MODEL__API_KEY", "shared")
+    conf = {
+        "BASIC_MODEL": [
+            {"base_url": "https://a.example.com/v1", "model": "m", "weight": 3},
+            {"base_url": "https://b.example.com/v1", "model": "m", "api_key": "b"},
+        ]
+    }
+    router = llm_module._create_llm_use_conf("basic", conf)
+    assert isinstance(router, RoutedChatModel)
+    assert [h["weight"] for h in router.stats()] == [3.0, 1.0]
+    a, b = router.models
+    assert a.openai_api_key.get_secret_value() == "shared"
+    assert b.openai_api_key.get_secret_value() == "b"
+    assert a.max_retries == b.max_retries == 0
+    assert a.http_client is not b.http_client
+
+    with pytest.raises(ValueError):
+        llm_module._create_llm_use_conf("basic", {"BASIC_MODEL": []})
+
+
+def test_configured_models_of_endpoint_lists(monkeypatch):
+    conf = {
+        "BASIC_MODEL": [{"model": "m1"}, {"model": "m2"}, {"model": "m1"}],
+        "REASONING_MODEL": {"model": "r"},
+    }
+    monkeypatch.setattr(llm_module, "load_yaml_config", lambda path: conf)
+    assert llm_module.get_configured_llm_models() == {
+        "basic": ["m1", "m2"],
+        "reasoning": ["r"],
+    }
@@ -0,0 +1,87 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from src.llms import llm as llm_module
+from src.llms import transport
+from src.llms.transport import TransportConfig, get_llm_http_clients
+
+
+class DummyChatModel:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+@pytest.fixture(autouse=True)
+def clients(monkeypatch):
+    monkeypatch.setattr(transport, "_clients", {})
+    monkeypatch.setattr(llm_module, "ChatOpenAI", DummyChatModel)
+    monkeypatch.setattr(llm_module, "ChatDeepSeek", DummyChatModel)
+    for key in ("BASIC_MODEL__API_KEY", "BASIC_MODEL__BASE_URL", "BASIC_MODEL__MODEL"):
+        monkeypatch.delenv(key, raising=False)
+    yield transport._clients
+    for client, async_client in transport._clients.values():
+        client.close()
+
+
+def test_transport_keys_are_popped_from_conf(monkeypatch):
+    monkeypatch.setenv("LLM_HTTP_MAX_CONNECTIONS", "50")
+    conf = {"model": "m", "verify_ssl": False, "proxy": "http://p", "http2": "false"}
+    config = TransportConfig.from_conf(conf)
+    assert conf == {"model": "m"}
+    assert config.verify_ssl is False
+    assert config.proxy == "http://p"
+    assert config.http2 is False
+    assert config.max_connections == 50
+
+    config = TransportConfig.from_conf({"max_connections": "8", "read_timeout": "30"})
+    assert config.max_connections == 8
+    assert config.read_timeout == 30.0
+
+
+def test_clients_are_shared_per_endpoint():
+    config = TransportConfig()
+    first = get_llm_http_clients("https://a.com/v1", config)
+    assert get_llm_http_clients("https://a.com/v1", TransportConfig()) == first
+    assert get_llm_http_clients("https://b.com/v1", config) != first
+    assert (
+        get_llm_http_clients("https://a.com/v1", TransportConfig(verify_ssl=False))
+        != first
+    )
+
+
+def test_closed_clients_are_replaced():
+    client, _ = get_llm_http_clients("https://a.com/v1", TransportConfig())
+    client.close()
+    assert get_llm_http_clients("https://a.com/v1", TransportConfig())[0] is not client
+
+
+def test_models_of_an_endpoint_share_clients():
+    conf = {
+        "BASIC_MODEL": {"api_key": "k", "base_url": "https://a.com/v1"},
+        "CODE_MODEL": {"api_key": "k", "base_url": "https://a.com/v1"},
+        "VISION_MODEL": {"api_key": "k", "base_url": "https://b.com/v1"},
+    }
+    basic = llm_module._create_llm_use_conf("basic", conf)
+    code = llm_module._create_llm_use_conf("code", conf)
+    vision = llm_module._create_llm_use_conf("vision", conf)
+
+    assert basic.kwargs["http_client"] is code.kwargs["http_client"]
+    assert basic.kwargs["http_async_client"] is code.kwargs["http_async_client"]
+    assert basic.kwargs["http_client"] is not vision.kwargs["http_client"]
+    assert "verify_ssl" not in basic.kwargs
+
+
+def test_pool_settings_from_conf():
+    conf = {
+        "BASIC_MODEL": {
+            "api_key": "k",
+            "base_url": "https://a.com/v1",
+            "max_connections": 7,
+        }
+    }
+    model = llm_module._create_llm_use_conf("basic", conf)
+    assert "max_connections" not in model.kwargs
+    pool = model.kwargs["http_client"]._transport._pool
+    assert pool._max_connections == 7
@@ -39,7 +39,7 @@ class TestBuildGraph:
         assert result == mock_compiled_graph
 
     @patch("src.prompt_enhancer.graph.builder.StateGraph")
-    @patch("src.prompt_enhancer.graph.builder.prompt_enhancer_node")
+    @patch("src.prompt_enhancer.graph.builder.aprompt_enhancer_node")
     def test_build_graph_node_function(self, mock_enhancer_node, mock_state_graph):
         """Test that the correct node function is added to the graph."""
         mock_builder = MagicMock()
@@ -1,13 +1,16 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from langchain.schema import HumanMessage, SystemMessage
 
 from src.config.report_style import ReportStyle
-from src.prompt_enhancer.graph.enhancer_node import prompt_enhancer_node
+from src.prompt_enhancer.graph.enhancer_node import (
+    aprompt_enhancer_node,
+    prompt_enhancer_node,
+)
 from src.prompt_enhancer.graph.state import PromptEnhancerState
 
 
@@ -524,3 +527,43 @@ Backslashes: \\n \\t \\r"""
         result = prompt_enhancer_node(state)
 
         assert result == {"output": ""}
+
+
+class TestAsyncPromptEnhancerNode:
+    """Test cases for aprompt_enhancer_node function."""
+
+    @pytest.mark.asyncio
+    @patch("src.prompt_enhancer.graph.enhancer_node.apply_prompt_template")
+    @patch("src.prompt_enhancer.graph.enhancer_node.get_llm_by_type")
+    async def test_async_prompt_enhancement(
+        self, mock_get_llm, mock_apply_template, mock_messages
+    ):
+        llm = MagicMock()
+        llm.ainvoke = AsyncMock(
+            return_value=MagicMock(
+                content="<enhanced_prompt>Enhanced test prompt</enhanced_prompt>"
+            )
+        )
+        mock_get_llm.return_value = llm
+        mock_apply_template.return_value = mock_messages
+
+        result = await aprompt_enhancer_node(PromptEnhancerState(prompt="Write"))
+
+        llm.ainvoke.assert_awaited_once_with(mock_messages)
+        llm.invoke.assert_not_called()
+        assert result == {"output": "Enhanced test prompt"}
+
+    @pytest.mark.asyncio
+    @patch("src.prompt_enhancer.graph.enhancer_node.apply_prompt_template")
+    @patch("src.prompt_enhancer.graph.enhancer_node.get_llm_by_type")
+    async def test_async_error_handling(
+        self, mock_get_llm, mock_apply_template, mock_messages
+    ):
+        llm = MagicMock()
+        llm.ainvoke = AsyncMock(side_effect=Exception("LLM error"))
+        mock_get_llm.return_value = llm
+        mock_apply_template.return_value = mock_messages
+
+        result = await aprompt_enhancer_node(PromptEnhancerState(prompt="Write"))
+
+        assert result == {"output": "Write"}
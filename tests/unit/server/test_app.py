@@ -3,7 +3,7 @@
 
 import base64
 import os
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import AsyncMock, MagicMock, mock_open, patch
 
 import pytest
 from fastapi import HTTPException
@@ -12,6 +12,7 @@ from langchain_core.messages import AIMessageChunk, ToolMessage
 from langgraph.types import Command
 
 from src.config.report_style import ReportStyle
+from src.graph.registry import GraphRegistry
 from src.server.app import _astream_workflow_generator, _make_event, app
 
 
@@ -26,24 +27,30 @@ class TestMakeEvent:
         data = {"content": "Hello", "role": "assistant"}
         result = _make_event(event_type, data)
         expected = (
-            'event: message_chunk\ndata: {"content": "Hello", "role": "assistant"}\n\n'
+            'event: message_chunk\ndata: {"content":"Hello","role":"assistant"}\n\n'
         )
         assert result == expected
 
+    def test_make_event_keeps_non_ascii(self):
+        result = _make_event("message_chunk", {"content": "你好"})
+        assert result == 'event: message_chunk\ndata: {"content":"你好"}\n\n'
+
+    def test_make_event_with_unserializable_data(self):
+        result = _make_event("message_chunk", {"content": object()})
+        assert result.startswith("event: error\n")
+
     def test_make_event_with_empty_content(self):
         event_type = "message_chunk"
         data = {"content": "", "role": "assistant"}
         result = _make_event(event_type, data)
-        expected = 'event: message_chunk\ndata: {"role": "assistant"}\n\n'
+        expected = 'event: message_chunk\ndata: {"role":"assistant"}\n\n'
         assert result == expected
 
     def test_make_event_without_content(self):
         event_type = "tool_calls"
         data = {"role": "assistant", "tool_calls": []}
         result = _make_event(event_type, data)
-        expected = (
-            'event: tool_calls\ndata: {"role": "assistant", "tool_calls": []}\n\n'
-        )
+        expected = 'event: tool_calls\ndata: {"role":"assistant","tool_calls":[]}\n\n'
         assert result == expected
 
 
@@ -214,7 +221,7 @@ class TestEnhancePromptEndpoint:
     def test_enhance_prompt_success(self, mock_build_graph, client):
         mock_workflow = MagicMock()
         mock_build_graph.return_value = mock_workflow
-        mock_workflow.invoke.return_value = {"output": "Enhanced prompt"}
+        mock_workflow.ainvoke = AsyncMock(return_value={"output": "Enhanced prompt"})
 
         request_data = {
             "prompt": "Original prompt",
@@ -231,7 +238,7 @@ class TestEnhancePromptEndpoint:
     def test_enhance_prompt_with_different_styles(self, mock_build_graph, client):
         mock_workflow = MagicMock()
         mock_build_graph.return_value = mock_workflow
-        mock_workflow.invoke.return_value = {"output": "Enhanced prompt"}
+        mock_workflow.ainvoke = AsyncMock(return_value={"output": "Enhanced prompt"})
 
         styles = [
             "ACADEMIC",
@@ -350,6 +357,58 @@ class TestMCPEndpoint:
         )
 
 
+    @patch("src.server.app.load_mcp_tools")
+    @patch.dict(
+        os.environ,
+        {"ENABLE_MCP_SERVER_CONFIGURATION": "true"},
+    )
+    def test_mcp_server_metadata_refresh(self, mock_load_tools, client):
+        mock_load_tools.return_value = []
+
+        request_data = {
+            "transport": "stdio",
+            "command": "test_command",
+            "refresh": True,
+        }
+
+        response = client.post("/api/mcp/server/metadata", json=request_data)
+
+        assert response.status_code == 200
+        assert mock_load_tools.call_args.kwargs["refresh"] is True
+
+    @patch("src.server.app.invalidate_mcp_tools", return_value=1)
+    @patch.dict(
+        os.environ,
+        {"ENABLE_MCP_SERVER_CONFIGURATION": "true"},
+    )
+    def test_mcp_server_metadata_invalidate(self, mock_invalidate, client):
+        response = client.post(
+            "/api/mcp/server/metadata/invalidate",
+            json={"transport": "stdio", "command": "test_command"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"invalidated": 1}
+        assert mock_invalidate.call_args.kwargs["server_type"] == "stdio"
+        assert mock_invalidate.call_args.kwargs["command"] == "test_command"
+
+        response = client.post("/api/mcp/server/metadata/invalidate")
+
+        assert response.status_code == 200
+        assert mock_invalidate.call_args.kwargs["server_type"] is None
+
+    @patch.dict(
+        os.environ,
+        {"ENABLE_MCP_SERVER_CONFIGURATION": ""},
+    )
+    def test_mcp_server_metadata_invalidate_without_enable_configuration(
+        self, client
+    ):
+        response = client.post("/api/mcp/server/metadata/invalidate")
+
+        assert response.status_code == 403
+
+
 class TestRAGEndpoints:
     @patch("src.server.app.SELECTED_RAG_PROVIDER", "test_provider")
     def test_rag_config(self, client):
@@ -542,7 +601,7 @@ class TestAstreamWorkflowGenerator:
         assert "event: message_chunk" in events[0]
         assert "Hello world" in events[0]
         # Check for the actual agent name that appears in the output
-        assert '"agent": "a"' in events[0]
+        assert '"agent":"a"' in events[0]
 
     @pytest.mark.asyncio
     @patch("src.server.app.graph")
@@ -790,6 +849,81 @@ class TestAstreamWorkflowGenerator:
             assert config["report_style"] == ReportStyle.NEWS.value
             yield ("agent1", "messages", [mock_ai_message])
 
+    @pytest.mark.asyncio
+    @patch("src.server.app.graph")
+    async def test_astream_workflow_generator_coalesces_tokens(self, mock_graph):
+        async def mock_astream(*args, **kwargs):
+            for token in ["Hello", " wor", "ld"]:
+                yield (
+                    "agent1",
+                    "messages",
+                    (AIMessageChunk(content=token, id="m1"), {}),
+                )
+
+        mock_graph.astream = mock_astream
+
+        generator = _astream_workflow_generator(
+            messages=[{"role": "user", "content": "Hello"}],
+            thread_id="test_thread",
+            resources=[],
+            max_plan_iterations=3,
+            max_step_num=10,
+            max_search_results=5,
+            auto_accepted_plan=True,
+            interrupt_feedback="",
+            mcp_settings={},
+            enable_background_investigation=False,
+            report_style=ReportStyle.ACADEMIC,
+            enable_deep_thinking=False,
+            coalesce_ms=50,
+        )
+        events = [event async for event in generator]
+
+        assert len(events) == 1
+        assert '"content":"Hello world"' in events[0]
+
+    @pytest.mark.asyncio
+    @patch("src.server.app.get_checkpointer")
+    @patch("src.server.app.graph")
+    async def test_astream_workflow_generator_uses_shared_checkpointer(
+        self, mock_graph, mock_get_checkpointer
+    ):
+        checkpointer = MagicMock()
+        mock_get_checkpointer.return_value = checkpointer
+        compiled = MagicMock()
+        compile_calls = []
+
+        async def mock_astream(*args, **kwargs):
+            yield ("agent1", "step1", {"test": "data"})
+
+        compiled.astream = mock_astream
+        registry = GraphRegistry(
+            lambda cp, store: compile_calls.append((cp, store)) or compiled
+        )
+
+        for _ in range(2):
+            generator = _astream_workflow_generator(
+                messages=[{"role": "user", "content": "Hello"}],
+                thread_id="test_thread",
+                resources=[],
+                max_plan_iterations=3,
+                max_step_num=10,
+                max_search_results=5,
+                auto_accepted_plan=True,
+                interrupt_feedback="",
+                mcp_settings={},
+                enable_background_investigation=False,
+                report_style=ReportStyle.ACADEMIC,
+                enable_deep_thinking=False,
+            )
+            with patch("src.server.app.graph_registry", registry):
+                assert [event async for event in generator] == []
+
+        assert mock_get_checkpointer.await_count == 2
+        # Compiled once for the backend; the module graph is left untouched
+        assert compile_calls == [(checkpointer, None)]
+        assert mock_graph.checkpointer is not checkpointer
+
 
 class TestGenerateProseEndpoint:
     @patch("src.server.app.build_prose_graph")
@@ -1,7 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi import HTTPException
@@ -62,6 +62,20 @@ def test_chat_request_defaults():
     assert req.mcp_settings is None
     assert req.enable_background_investigation is True
     assert req.report_style == ReportStyle.ACADEMIC
+    assert req.coalesce_ms == 0
+    assert req.max_batch_bytes == 4096
+
+
+def test_chat_request_coalescing_bounds():
+    req = ChatRequest(coalesce_ms=30, max_batch_bytes=1024)
+    assert req.coalesce_ms == 30
+    assert req.max_batch_bytes == 1024
+    with pytest.raises(ValidationError):
+        ChatRequest(coalesce_ms=-1)
+    with pytest.raises(ValidationError):
+        ChatRequest(max_batch_bytes=0)
+    with pytest.raises(ValidationError):
+        ChatRequest(coalesce_ms=30, max_batch_bytes=None)
 
 
 def test_chat_request_with_values():
@@ -152,15 +166,11 @@ def test_tts_request_validation_error():
 
 
 @pytest.mark.asyncio
-@patch("src.server.mcp_utils._get_tools_from_client_session", new_callable=AsyncMock)
-@patch("src.server.mcp_utils.StdioServerParameters")
-@patch("src.server.mcp_utils.stdio_client")
+@patch("src.server.mcp_utils._list_tools", new_callable=AsyncMock)
 async def test_load_mcp_tools_exception_handling(
-    mock_stdio_client, mock_StdioServerParameters, mock_get_tools
+    mock_list_tools,
 ):  # Changed to async def
-    mock_get_tools.side_effect = Exception("unexpected error")
-    mock_StdioServerParameters.return_value = MagicMock()
-    mock_stdio_client.return_value = MagicMock()
+    mock_list_tools.side_effect = Exception("unexpected error")
 
     with pytest.raises(HTTPException) as exc:
         await mcp_utils.load_mcp_tools(server_type="stdio", command="foo")  # Use await
@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import src.server.checkpointer as checkpointer_module
+from src.server.checkpointer import CheckpointerManager
+
+
+@pytest.fixture(autouse=True)
+def reset_manager():
+    checkpointer_module._checkpointer_manager = None
+    yield
+    checkpointer_module._checkpointer_manager = None
+
+
+@pytest.mark.asyncio
+@patch("src.server.checkpointer.AsyncPostgresSaver")
+@patch("src.server.checkpointer.AsyncConnectionPool")
+async def test_postgres_checkpointer_is_created_once(mock_pool_cls, mock_saver_cls):
+    pool = MagicMock()
+    pool.open = AsyncMock()
+    pool.close = AsyncMock()
+    mock_pool_cls.return_value = pool
+    mock_pool_cls.check_connection = "check"
+    saver = MagicMock()
+    saver.setup = AsyncMock()
+    mock_saver_cls.return_value = saver
+
+    manager = CheckpointerManager("postgresql://localhost/db", min_size=2, max_size=8)
+    results = await asyncio.gather(*(manager.get() for _ in range(5)))
+
+    assert all(result is saver for result in results)
+    mock_pool_cls.assert_called_once()
+    kwargs = mock_pool_cls.call_args.kwargs
+    assert kwargs["min_size"] == 2
+    assert kwargs["max_size"] == 8
+    assert kwargs["check"] == "check"
+    assert kwargs["open"] is False
+    mock_saver_cls.assert_called_once_with(pool)
+    saver.setup.assert_awaited_once()
+
+    await manager.aclose()
+    pool.close.assert_awaited_once()
+    assert manager.pool is None
+
+
+@pytest.mark.asyncio
+@patch("src.server.checkpointer.AsyncMongoDBSaver")
+async def test_mongo_checkpointer_is_closed_on_aclose(mock_saver_cls):
+    saver = MagicMock()
+    events = []
+
+    @asynccontextmanager
+    async def from_conn_string(uri):
+        events.append("open")
+        yield saver
+        events.append("close")
+
+    mock_saver_cls.from_conn_string = from_conn_string
+
+    manager = CheckpointerManager("mongodb://localhost:27017")
+    assert await manager.get() is saver
+    assert await manager.get() is saver
+    await manager.aclose()
+
+    assert events == ["open", "close"]
+
+
+@pytest.mark.asyncio
+@patch("src.server.checkpointer.AsyncPostgresSaver")
+@patch("src.server.checkpointer.AsyncConnectionPool")
+async def test_failed_setup_closes_pool_and_retries(mock_pool_cls, mock_saver_cls):
+    pool = MagicMock()
+    pool.open = AsyncMock()
+    pool.close = AsyncMock()
+    mock_pool_cls.return_value = pool
+    saver = MagicMock()
+    saver.setup = AsyncMock(side_effect=[RuntimeError("db down"), None])
+    mock_saver_cls.return_value = saver
+
+    manager = CheckpointerManager("postgresql://localhost/db")
+    with pytest.raises(RuntimeError):
+        await manager.get()
+    pool.close.assert_awaited_once()
+
+    assert await manager.get() is saver
+
+
+@pytest.mark.asyncio
+async def test_unsupported_scheme_returns_none():
+    manager = CheckpointerManager("redis://localhost:6379/0")
+    assert await manager.get() is None
+
+
+@pytest.mark.asyncio
+async def test_get_checkpointer_disabled(monkeypatch):
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_SAVER", "false")
+    assert await checkpointer_module.get_checkpointer() is None
+    assert checkpointer_module.get_checkpointer_manager() is None
+
+
+def test_manager_sized_from_env(monkeypatch):
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_SAVER", "true")
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_DB_URL", "postgresql://localhost/db")
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_POOL_MIN_SIZE", "3")
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT_POOL_MAX_SIZE", "12")
+
+    manager = checkpointer_module.get_checkpointer_manager()
+
+    assert manager.min_size == 3
+    assert manager.max_size == 12
+    assert checkpointer_module.get_checkpointer_manager() is manager
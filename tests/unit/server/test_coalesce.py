@@ -0,0 +1,168 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessageChunk, ToolMessage
+
+from src.server.coalesce import coalesce_message_chunks
+
+METADATA = {"langgraph_node": "agent", "checkpoint_ns": "researcher:1"}
+
+
+def _chunk(content, id="m1", **kwargs):
+    return (
+        ("researcher:1",),
+        "messages",
+        (AIMessageChunk(content=content, id=id, **kwargs), METADATA),
+    )
+
+
+async def _source(*items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+def _contents(items):
+    return [item[2][0].content for item in items]
+
+
+@pytest.mark.asyncio
+async def test_disabled_passes_items_through():
+    items = [_chunk("a"), _chunk("b")]
+    result = await _collect(coalesce_message_chunks(_source(*items), 0))
+    assert result == items
+
+
+@pytest.mark.asyncio
+async def test_merges_consecutive_chunks_of_same_message():
+    result = await _collect(
+        coalesce_message_chunks(
+            _source(_chunk("Hel"), _chunk("lo"), _chunk(" you", id="m2")), 1000
+        )
+    )
+    assert _contents(result) == ["Hello", " you"]
+    assert [item[2][0].id for item in result] == ["m1", "m2"]
+
+
+@pytest.mark.asyncio
+async def test_tool_events_and_updates_are_not_merged():
+    tool_call = (
+        ("researcher:1",),
+        "messages",
+        (
+            AIMessageChunk(
+                content="",
+                id="m1",
+                tool_call_chunks=[
+                    {"name": "search", "args": "", "id": "c1", "index": 0}
+                ],
+            ),
+            METADATA,
+        ),
+    )
+    tool_result = (
+        ("researcher:1",),
+        "messages",
+        (ToolMessage(content="done", tool_call_id="c1", id="t1"), METADATA),
+    )
+    update = ((), "updates", {"planner": {"foo": "bar"}})
+
+    result = await _collect(
+        coalesce_message_chunks(
+            _source(
+                _chunk("a"), _chunk("b"), tool_call, tool_call, tool_result, update
+            ),
+            1000,
+        )
+    )
+
+    assert len(result) == 5
+    assert result[0][2][0].content == "ab"
+    assert result[1:] == [tool_call, tool_call, tool_result, update]
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full():
+    result = await _collect(
+        coalesce_message_chunks(
+            _source(_chunk("12"), _chunk("34"), _chunk("5")), 1000, max_batch_bytes=4
+        )
+    )
+    assert _contents(result) == ["1234", "5"]
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_finish_reason_and_keeps_metadata():
+    result = await _collect(
+        coalesce_message_chunks(
+            _source(
+                _chunk("a", additional_kwargs={"reasoning_content": "r1"}),
+                _chunk("b", additional_kwargs={"reasoning_content": "r2"}),
+                _chunk("c", response_metadata={"finish_reason": "stop"}),
+                _chunk("d"),
+            ),
+            1000,
+        )
+    )
+    assert _contents(result) == ["abc", "d"]
+    merged = result[0][2][0]
+    assert merged.additional_kwargs["reasoning_content"] == "r1r2"
+    assert merged.response_metadata["finish_reason"] == "stop"
+    assert result[0][2][1] is METADATA
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_window_elapses():
+    async def slow_source():
+        yield _chunk("a")
+        yield _chunk("b")
+        await asyncio.sleep(0.3)
+        yield _chunk("c")
+
+    start = time.monotonic()
+    arrivals = []
+    async for item in coalesce_message_chunks(slow_source(), 20):
+        arrivals.append((item[2][0].content, time.monotonic() - start))
+
+    assert [content for content, _ in arrivals] == ["ab", "c"]
+    assert arrivals[0][1] < 0.2
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_after_pending_flush():
+    async def failing_source():
+        yield _chunk("a")
+        raise RuntimeError("graph failed")
+
+    received = []
+    with pytest.raises(RuntimeError, match="graph failed"):
+        async for item in coalesce_message_chunks(failing_source(), 1000):
+            received.append(item)
+    assert _contents(received) == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_closing_consumer_cancels_upstream():
+    cancelled = asyncio.Event()
+
+    async def endless_source():
+        try:
+            while True:
+                yield _chunk("x")
+                await asyncio.sleep(0.001)
+        finally:
+            cancelled.set()
+
+    stream = coalesce_message_chunks(endless_source(), 5)
+    await stream.__anext__()
+    await stream.aclose()
+    await asyncio.wait_for(cancelled.wait(), 1)
@@ -1,6 +1,8 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -9,63 +11,52 @@ from fastapi import HTTPException
 import src.server.mcp_utils as mcp_utils
 
 
-@pytest.mark.asyncio
-@patch("src.server.mcp_utils.ClientSession")
-async def test__get_tools_from_client_session_success(mock_ClientSession):
-    mock_read = AsyncMock()
-    mock_write = AsyncMock()
-    mock_callback = AsyncMock()
-    mock_context_manager = AsyncMock()
-    mock_context_manager.__aenter__.return_value = (
-        mock_read,
-        mock_write,
-        mock_callback,
-    )
-    mock_context_manager.__aexit__.return_value = None
-
-    mock_session = AsyncMock()
-    mock_session.__aenter__.return_value = mock_session
-    mock_session.__aexit__.return_value = None
-    mock_session.initialize = AsyncMock()
-    mock_tools_obj = MagicMock()
-    mock_tools_obj.tools = ["tool1", "tool2"]
-    mock_session.list_tools = AsyncMock(return_value=mock_tools_obj)
-    mock_ClientSession.return_value = mock_session
-
-    result = await mcp_utils._get_tools_from_client_session(
-        mock_context_manager, timeout_seconds=5
-    )
-    assert result == ["tool1", "tool2"]
-    mock_session.initialize.assert_awaited_once()
-    mock_session.list_tools.assert_awaited_once()
+@pytest.fixture(autouse=True)
+def clear_tool_listings():
+    mcp_utils.invalidate_mcp_tools()
+    yield
+    mcp_utils.invalidate_mcp_tools()
+
+
+def make_pool(tools=None, error=None):
+    session = MagicMock()
+    listed = MagicMock()
+    listed.tools = tools or []
+    session.list_tools = AsyncMock(return_value=listed, side_effect=error)
+    pool = MagicMock()
+    pool.connections = []
+
+    @asynccontextmanager
+    async def fake_session(connection):
+        pool.connections.append(connection)
+        yield session
+
+    pool.session = fake_session
+    pool.client_session = session
+    return pool
 
 
 @pytest.mark.asyncio
-@patch("src.server.mcp_utils._get_tools_from_client_session", new_callable=AsyncMock)
-@patch("src.server.mcp_utils.StdioServerParameters")
-@patch("src.server.mcp_utils.stdio_client")
-async def test_load_mcp_tools_stdio_success(
-    mock_stdio_client, mock_StdioServerParameters, mock_get_tools
-):
-    mock_get_tools.return_value = ["toolA"]
-    params = MagicMock()
-    mock_StdioServerParameters.return_value = params
-    mock_client = MagicMock()
-    mock_stdio_client.return_value = mock_client
-
-    result = await mcp_utils.load_mcp_tools(
-        server_type="stdio",
-        command="echo",
-        args=["foo"],
-        env={"FOO": "BAR"},
-        timeout_seconds=3,
-    )
+async def test_load_mcp_tools_stdio_success():
+    pool = make_pool(["toolA"])
+    with patch("src.server.mcp_utils.mcp_session_pool", pool):
+        result = await mcp_utils.load_mcp_tools(
+            server_type="stdio",
+            command="echo",
+            args=["foo"],
+            env={"FOO": "BAR"},
+            timeout_seconds=3,
+        )
     assert result == ["toolA"]
-    mock_StdioServerParameters.assert_called_once_with(
-        command="echo", args=["foo"], env={"FOO": "BAR"}
-    )
-    mock_stdio_client.assert_called_once_with(params)
-    mock_get_tools.assert_awaited_once_with(mock_client, 3)
+    assert pool.connections == [
+        {
+            "transport": "stdio",
+            "command": "echo",
+            "args": ["foo"],
+            "env": {"FOO": "BAR"},
+        }
+    ]
+    pool.client_session.list_tools.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -77,26 +68,34 @@ async def test_load_mcp_tools_stdio_missing_command():
 
 
 @pytest.mark.asyncio
-@patch("src.server.mcp_utils._get_tools_from_client_session", new_callable=AsyncMock)
-@patch("src.server.mcp_utils.sse_client")
-async def test_load_mcp_tools_sse_success(mock_sse_client, mock_get_tools):
-    mock_get_tools.return_value = ["toolB"]
-    mock_client = MagicMock()
-    mock_sse_client.return_value = mock_client
-
-    result = await mcp_utils.load_mcp_tools(
-        server_type="sse",
-        url="http://localhost:1234",
-        headers={"Authorization": "Bearer 1234567890"},
-        timeout_seconds=7,
-    )
+async def test_load_mcp_tools_sse_success():
+    pool = make_pool(["toolB"])
+    with patch("src.server.mcp_utils.mcp_session_pool", pool):
+        result = await mcp_utils.load_mcp_tools(
+            server_type="sse",
+            url="http://localhost:1234",
+            headers={"Authorization": "Bearer 1234567890"},
+            timeout_seconds=7,
+        )
     assert result == ["toolB"]
-    mock_sse_client.assert_called_once_with(
-        url="http://localhost:1234",
-        headers={"Authorization": "Bearer 1234567890"},
-        timeout=7,
-    )
-    mock_get_tools.assert_awaited_once_with(mock_client, 7)
+    assert pool.connections == [
+        {
+            "transport": "sse",
+            "url": "http://localhost:1234",
+            "headers": {"Authorization": "Bearer 1234567890"},
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_load_mcp_tools_streamable_http_success():
+    pool = make_pool(["toolC"])
+    with patch("src.server.mcp_utils.mcp_session_pool", pool):
+        result = await mcp_utils.load_mcp_tools(
+            server_type="streamable_http", url="http://localhost:1234/mcp"
+        )
+    assert result == ["toolC"]
+    assert pool.connections[0]["transport"] == "streamable_http"
 
 
 @pytest.mark.asyncio
@@ -116,17 +115,81 @@ async def test_load_mcp_tools_unsupported_type():
 
 
 @pytest.mark.asyncio
-@patch("src.server.mcp_utils._get_tools_from_client_session", new_callable=AsyncMock)
-@patch("src.server.mcp_utils.StdioServerParameters")
-@patch("src.server.mcp_utils.stdio_client")
-async def test_load_mcp_tools_exception_handling(
-    mock_stdio_client, mock_StdioServerParameters, mock_get_tools
-):
-    mock_get_tools.side_effect = Exception("unexpected error")
-    mock_StdioServerParameters.return_value = MagicMock()
-    mock_stdio_client.return_value = MagicMock()
-
-    with pytest.raises(HTTPException) as exc:
-        await mcp_utils.load_mcp_tools(server_type="stdio", command="foo")
+async def test_load_mcp_tools_exception_handling():
+    pool = make_pool(error=Exception("unexpected error"))
+    with patch("src.server.mcp_utils.mcp_session_pool", pool):
+        with pytest.raises(HTTPException) as exc:
+            await mcp_utils.load_mcp_tools(server_type="stdio", command="foo")
     assert exc.value.status_code == 500
     assert "unexpected error" in exc.value.detail
+
+
+@pytest.mark.asyncio
+async def test_load_mcp_tools_caches_listing():
+    pool = make_pool(["toolA"])
+    with patch("src.server.mcp_utils.mcp_session_pool", pool):
+        first = await mcp_utils.load_mcp_tools(
+            server_type="stdio", command="echo", args=["foo"]
+        )
+        # Same server, different spelling of the unset values
+        second = await mcp_utils.load_mcp_tools(
+            server_type="stdio", command="echo", args=["foo"], env={}
+        )
+        refreshed = await mcp_utils.load_mcp_tools(
+            server_type="stdio", command="echo", args=["foo"], refresh=True
+        )
+    assert first == second == refreshed == ["toolA"]
+    assert pool.client_session.list_tools.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_load_mcp_tools_deduplicates_concurrent_requests():
+    pool = make_pool()
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_list_tools():
+        started.set()
+        await release.wait()
+        listed = MagicMock()
+        listed.tools = ["toolA"]
+        return listed
+
+    pool.client_session.list_tools = AsyncMock(side_effect=slow_list_tools)
+    with patch("src.server.mcp_utils.mcp_session_pool", pool):
+        tasks = [
+            asyncio.create_task(
+                mcp_utils.load_mcp_tools(server_type="sse", url="http://host/sse")
+            )
+            for _ in range(3)
+        ]
+        await started.wait()
+        release.set()
+        results = await asyncio.gather(*tasks)
+    assert results == [["toolA"]] * 3
+    pool.client_session.list_tools.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_load_mcp_tools_does_not_cache_errors():
+    pool = make_pool(error=Exception("boom"))
+    with patch("src.server.mcp_utils.mcp_session_pool", pool):
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await mcp_utils.load_mcp_tools(server_type="stdio", command="foo")
+    assert pool.client_session.list_tools.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_mcp_tools():
+    pool = make_pool(["toolA"])
+    with patch("src.server.mcp_utils.mcp_session_pool", pool):
+        await mcp_utils.load_mcp_tools(server_type="stdio", command="echo")
+        await mcp_utils.load_mcp_tools(server_type="sse", url="http://host/sse")
+
+        assert mcp_utils.invalidate_mcp_tools(server_type="stdio", command="echo") == 1
+        assert mcp_utils.invalidate_mcp_tools(server_type="stdio", command="echo") == 0
+        await mcp_utils.load_mcp_tools(server_type="stdio", command="echo")
+        assert pool.client_session.list_tools.await_count == 3
+
+        assert mcp_utils.invalidate_mcp_tools() == 2
@@ -0,0 +1,178 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessageChunk
+
+from src.server.app import app
+from src.server.replay import ReplayLog, ReplayRegistry, parse_last_event_id
+from src.server.runs import RunManager
+
+
+def _frame(n):
+    return f'event: message_chunk\ndata: {{"n":{n}}}\n\n'
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+def test_append_assigns_increasing_ids():
+    log = ReplayLog("t1")
+    log.start()
+    assert log.append(_frame(1)) == 1
+    assert log.append(_frame(2)) == 2
+    assert [event_id for event_id, _ in log.since(0)] == [1, 2]
+    assert log.since(1)[0][1] == "id: 2\n" + _frame(2)
+    assert log.since(2) == []
+
+
+def test_log_is_bounded_by_events_and_bytes():
+    log = ReplayLog("t1", max_events=3)
+    for n in range(5):
+        log.append(_frame(n))
+    assert log.first_id == 3
+    assert [event_id for event_id, _ in log.since(0)] == [3, 4, 5]
+
+    log = ReplayLog("t1", max_bytes=len("id: 1\n" + _frame(1)) * 2)
+    for n in range(5):
+        log.append(_frame(n))
+    assert [event_id for event_id, _ in log.since(0)] == [4, 5]
+
+
+def test_ids_continue_across_runs():
+    log = ReplayLog("t1")
+    assert log.start() == 0
+    log.append(_frame(1))
+    log.finish()
+    assert log.start() == 1
+    assert log.append(_frame(2)) == 2
+
+
+@pytest.mark.asyncio
+async def test_subscribe_replays_then_follows_live_run():
+    log = ReplayLog("t1")
+    log.start()
+    log.append(_frame(1))
+    log.append(_frame(2))
+
+    async def produce():
+        await asyncio.sleep(0.01)
+        log.append(_frame(3))
+        await asyncio.sleep(0.01)
+        log.finish()
+
+    producer = asyncio.create_task(produce())
+    events = await asyncio.wait_for(_collect(log.subscribe(1)), timeout=1)
+    await producer
+    assert events == ["id: 2\n" + _frame(2), "id: 3\n" + _frame(3)]
+
+
+@pytest.mark.asyncio
+async def test_subscribe_to_finished_log_returns_retained_events():
+    log = ReplayLog("t1")
+    log.start()
+    log.append(_frame(1))
+    log.finish()
+    assert await _collect(log.subscribe(0)) == ["id: 1\n" + _frame(1)]
+    assert await _collect(log.subscribe(1)) == []
+
+
+@pytest.mark.asyncio
+async def test_subscribe_reports_dropped_events():
+    log = ReplayLog("t1", max_events=2)
+    log.start()
+    for n in range(1, 5):
+        log.append(_frame(n))
+    log.finish()
+    events = await _collect(log.subscribe(1))
+    assert events[0] == (
+        "event: replay_gap\n"
+        'data: {"thread_id":"t1","first_missed_id":2,"last_missed_id":2}\n\n'
+    )
+    assert events[1:] == ["id: 3\n" + _frame(3), "id: 4\n" + _frame(4)]
+    assert await _collect(log.subscribe(2)) == events[1:]
+
+
+@pytest.mark.asyncio
+async def test_slow_live_reader_is_told_of_dropped_events():
+    log = ReplayLog("t1", max_events=2)
+    log.start()
+    log.append(_frame(1))
+    stream = log.subscribe(0)
+    assert await anext(stream) == "id: 1\n" + _frame(1)
+    for n in range(2, 6):
+        log.append(_frame(n))
+    log.finish()
+    events = await _collect(stream)
+    assert events[0].startswith("event: replay_gap\n")
+    assert '"first_missed_id":2,"last_missed_id":3' in events[0]
+    assert events[1:] == ["id: 4\n" + _frame(4), "id: 5\n" + _frame(5)]
+
+
+def test_registry_keeps_running_logs_and_evicts_finished_ones():
+    registry = ReplayRegistry(max_threads=2, ttl=0)
+    running = registry.get_or_create("running")
+    running.start()
+    registry.get_or_create("finished")
+    registry.get_or_create("new")
+    assert "running" in registry
+    assert "finished" not in registry
+    assert len(registry) == 2
+
+
+def test_registry_expires_finished_logs_after_ttl():
+    registry = ReplayRegistry(ttl=10)
+    log = registry.get_or_create("t1")
+    log.finished_at -= 11
+    registry.get_or_create("t2")
+    assert registry.get("t1") is None
+
+
+def test_parse_last_event_id():
+    assert parse_last_event_id(None) == 0
+    assert parse_last_event_id("") == 0
+    assert parse_last_event_id(" 42 ") == 42
+    assert parse_last_event_id("abc") == 0
+    assert parse_last_event_id("-3") == 0
+
+
+@patch("src.server.app.graph")
+def test_reconnect_replays_events_after_last_event_id(mock_graph):
+    async def mock_astream(*args, **kwargs):
+        for content in ("Hel", "lo"):
+            yield (
+                ("researcher:1",),
+                "messages",
+                (AIMessageChunk(content=content, id="m1"), {}),
+            )
+
+    mock_graph.astream = mock_astream
+    client = TestClient(app)
+    request_data = {
+        "thread_id": "replay-thread",
+        "messages": [{"role": "user", "content": "Hello"}],
+        "auto_accepted_plan": True,
+    }
+
+    with patch("src.server.app.run_manager", RunManager(ReplayRegistry())):
+        response = client.post("/api/chat/stream", json=request_data)
+        assert response.status_code == 200
+        assert response.text.startswith("id: 1\n")
+        assert "id: 2\n" in response.text
+
+        resumed = client.get(
+            "/api/chat/stream/replay-thread", headers={"Last-Event-ID": "1"}
+        )
+        assert resumed.status_code == 200
+        assert resumed.text == response.text[response.text.index("id: 2\n") :]
+
+        resumed = client.get("/api/chat/stream/replay-thread?last_event_id=0")
+        assert resumed.text == response.text
+
+        missing = client.get("/api/chat/stream/unknown-thread")
+        assert missing.status_code == 404
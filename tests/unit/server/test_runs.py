@@ -0,0 +1,183 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessageChunk
+
+from src.server.app import app
+from src.server.replay import ReplayRegistry
+from src.server.runs import (
+    RUN_CANCELLED,
+    RUN_ERROR,
+    RUN_INTERRUPTED,
+    RUN_SUCCESS,
+    RunConflictError,
+    RunManager,
+)
+
+
+def _frames(*frames, delay=0.0, updates=(), run=None):
+    async def events():
+        for update in updates:
+            run.record_update(update)
+        for frame in frames:
+            if delay:
+                await asyncio.sleep(delay)
+            yield frame
+
+    return events()
+
+
+@pytest.mark.asyncio
+async def test_run_records_events_and_report():
+    manager = RunManager(ReplayRegistry())
+    run = manager.start(
+        "t1",
+        lambda run: _frames(
+            "a", "b", updates=[{"reporter": {"final_report": "# Report"}}], run=run
+        ),
+    )
+    await run.task
+    assert run.status == RUN_SUCCESS
+    assert run.final_report == "# Report"
+    assert run.event_count == 2
+    assert manager.active_run("t1") is None
+    assert run.log.done
+
+
+@pytest.mark.asyncio
+async def test_run_is_not_throttled_by_readers():
+    manager = RunManager(ReplayRegistry())
+    run = manager.start("t1", lambda run: _frames(*"abcdef"))
+    # Nobody reads the stream, yet the run completes
+    await asyncio.wait_for(run.task, timeout=1)
+    assert run.event_count == 6
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run():
+    manager = RunManager(ReplayRegistry())
+    run = manager.start(
+        "t1", lambda run: _frames("a", updates=[{"__interrupt__": ()}], run=run)
+    )
+    await run.task
+    assert run.status == RUN_INTERRUPTED
+
+
+@pytest.mark.asyncio
+async def test_failed_run_appends_error_event():
+    async def failing():
+        yield "a"
+        raise RuntimeError("boom")
+
+    manager = RunManager(ReplayRegistry())
+    run = manager.start("t1", lambda run: failing())
+    await run.task
+    assert run.status == RUN_ERROR
+    frames = [frame async for frame in run.log.subscribe(run.start_id)]
+    assert frames[-1].startswith("id: 2\nevent: error\n")
+    assert "boom" not in frames[-1]
+
+
+@pytest.mark.asyncio
+async def test_one_active_run_per_thread():
+    manager = RunManager(ReplayRegistry())
+    run = manager.start("t1", lambda run: _frames("a", delay=0.05))
+    with pytest.raises(RunConflictError) as exc_info:
+        manager.start("t1", lambda run: _frames("b"))
+    assert exc_info.value.run is run
+    await run.task
+
+    second = manager.start("t1", lambda run: _frames("b"))
+    await second.task
+    assert second.start_id == 1
+    assert [frame async for frame in second.log.subscribe(second.start_id)] == [
+        "id: 2\nb"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cancel_run():
+    manager = RunManager(ReplayRegistry())
+    run = manager.start("t1", lambda run: _frames(*"abc", delay=1))
+    await asyncio.sleep(0)
+    assert await manager.cancel(run.run_id)
+    assert run.status == RUN_CANCELLED
+    assert run.log.done
+    assert manager.active_run("t1") is None
+    assert not await manager.cancel(run.run_id)
+
+
+@pytest.mark.asyncio
+async def test_cancel_before_start():
+    manager = RunManager(ReplayRegistry())
+    run = manager.start("t1", lambda run: _frames("a"))
+    assert await manager.cancel(run.run_id)
+    assert run.status == RUN_CANCELLED
+    assert manager.active_run("t1") is None
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_active_runs():
+    manager = RunManager(ReplayRegistry())
+    runs = [manager.start(f"t{i}", lambda run: _frames("a", delay=1)) for i in range(3)]
+    await manager.shutdown()
+    assert all(run.status == RUN_CANCELLED for run in runs)
+
+
+@pytest.mark.asyncio
+async def test_finished_runs_are_bounded():
+    manager = RunManager(ReplayRegistry(), max_runs=2)
+    runs = []
+    for i in range(4):
+        run = manager.start(f"t{i}", lambda run: _frames("a"))
+        await run.task
+        runs.append(run)
+    assert len(manager) == 2
+    assert manager.get(runs[0].run_id) is None
+    assert manager.get(runs[-1].run_id) is runs[-1]
+
+
+@patch("src.server.app.graph")
+def test_run_endpoints(mock_graph):
+    async def mock_astream(*args, **kwargs):
+        yield (
+            ("reporter",),
+            "messages",
+            (AIMessageChunk(content="Report", id="m1"), {}),
+        )
+        yield (("reporter",), "updates", {"reporter": {"final_report": "Report"}})
+
+    mock_graph.astream = mock_astream
+    client = TestClient(app)
+    request_data = {
+        "thread_id": "run-thread",
+        "messages": [{"role": "user", "content": "Hello"}],
+        "auto_accepted_plan": True,
+    }
+
+    with patch("src.server.app.run_manager", RunManager(ReplayRegistry())):
+        response = client.post("/api/chat/stream", json=request_data)
+        run_id = response.headers["X-Run-ID"]
+
+        status = client.get(f"/api/runs/{run_id}").json()
+        assert status["status"] == RUN_SUCCESS
+        assert status["thread_id"] == "run-thread"
+        assert status["event_count"] == 1
+        assert status["has_report"] is True
+
+        report = client.get(f"/api/runs/{run_id}/report").json()
+        assert report["final_report"] == "Report"
+
+        attached = client.get(f"/api/runs/{run_id}/stream")
+        assert attached.text == response.text
+
+        cancelled = client.post(f"/api/runs/{run_id}/cancel").json()
+        assert cancelled["status"] == RUN_SUCCESS
+
+        assert client.get("/api/runs/unknown").status_code == 404
+        assert client.get("/api/runs/unknown/report").status_code == 404
@@ -0,0 +1,90 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import json
+
+import pytest
+
+import src.server.sse as sse
+from src.server.sse import StreamEventEncoder, dumps, encode_event, frame_prefix
+
+
+def _payload(frame: str) -> dict:
+    header, data = frame.rstrip("\n").split("\n", 1)
+    assert header.startswith("event: ")
+    assert data.startswith("data: ")
+    return json.loads(data[len("data: ") :])
+
+
+def test_frame_prefix_is_cached():
+    assert frame_prefix("message_chunk") is frame_prefix("message_chunk")
+    assert frame_prefix("tool_calls") == "event: tool_calls\ndata: "
+
+
+def test_dumps_falls_back_to_json_without_orjson(monkeypatch):
+    monkeypatch.setattr(sse, "orjson", None)
+    assert dumps({"a": "é", "b": [1, 2]}) == '{"a":"é","b":[1,2]}'
+
+
+def test_dumps_falls_back_for_values_orjson_rejects():
+    assert dumps({1: "a"}) == '{"1":"a"}'
+
+
+def test_encode_event_drops_empty_content():
+    frame = encode_event("message_chunk", {"content": "", "id": "x"})
+    assert frame == 'event: message_chunk\ndata: {"id":"x"}\n\n'
+
+
+def test_encoder_merges_header_and_fields():
+    encoder = StreamEventEncoder("thread-1")
+    metadata = {
+        "checkpoint_ns": "researcher:1",
+        "langgraph_node": "agent",
+        "langgraph_path": ("__pregel_pull", "agent"),
+        "langgraph_step": 3,
+    }
+    frame = encoder.encode_message(
+        "message_chunk", "researcher", metadata, {"id": "m1", "content": "Hi"}
+    )
+
+    assert frame.startswith("event: message_chunk\ndata: ")
+    assert _payload(frame) == {
+        "thread_id": "thread-1",
+        "agent": "researcher",
+        "role": "assistant",
+        "checkpoint_ns": "researcher:1",
+        "langgraph_node": "agent",
+        "langgraph_path": ["__pregel_pull", "agent"],
+        "langgraph_step": 3,
+        "id": "m1",
+        "content": "Hi",
+    }
+    assert len(encoder._headers) == 1
+
+    encoder.encode_message(
+        "message_chunk", "researcher", metadata, {"id": "m1", "content": "!"}
+    )
+    assert len(encoder._headers) == 1
+
+
+def test_encoder_with_empty_fields_and_unhashable_metadata():
+    encoder = StreamEventEncoder("t")
+    frame = encoder.encode_message(
+        "message_chunk", "a", {"langgraph_path": ["x"]}, {"content": ""}
+    )
+    assert _payload(frame)["langgraph_path"] == ["x"]
+    assert "content" not in _payload(frame)
+    assert encoder._headers == {}
+
+
+def test_encoder_bounds_header_cache():
+    encoder = StreamEventEncoder("t", max_headers=2)
+    for step in range(5):
+        encoder.encode_message("message_chunk", "a", {"langgraph_step": step}, {})
+    assert len(encoder._headers) <= 2
+
+
+def test_encoder_raises_on_unserializable_fields():
+    encoder = StreamEventEncoder("t")
+    with pytest.raises(TypeError):
+        encoder.encode_message("message_chunk", "a", {}, {"content": object()})
@@ -1,6 +1,40 @@
 from unittest.mock import Mock, patch
 
-from src.tools.crawl import crawl_tool
+import pytest
+
+from src.crawler.crawler import CrawlResult
+from src.tools import crawl as crawl_module
+from src.tools.crawl import crawl_many_tool, crawl_tool, read_crawled_page_tool
+
+ARTICLE_MARKDOWN = """## Installation
+
+Install the package with pip.
+
+## Pricing
+
+The free plan allows 100 requests per day.
+
+## Support
+
+Ask questions in the forum.
+"""
+
+
+@pytest.fixture
+def documents():
+    crawl_module._documents.clear()
+    yield crawl_module._documents
+    crawl_module._documents.clear()
+
+
+@pytest.fixture
+def mock_crawler(documents):
+    with patch("src.tools.crawl.Crawler") as mock_crawler_class:
+        article = Mock()
+        article.title = "Title"
+        article.to_markdown.return_value = ARTICLE_MARKDOWN
+        mock_crawler_class.return_value.crawl.return_value = article
+        yield mock_crawler_class.return_value
 
 
 class TestCrawlTool:
@@ -107,3 +141,65 @@ class TestCrawlTool:
         assert "Failed to crawl" in result
         assert "Markdown conversion error" in result
         mock_logger.error.assert_called_once()
+
+
+class TestCrawlManyTool:
+    @pytest.mark.asyncio
+    @patch("src.tools.crawl.Crawler")
+    async def test_crawl_many_tool(self, mock_crawler_class):
+        article = Mock()
+        article.to_markdown.return_value = "x" * 2000
+
+        async def crawl_many(urls):
+            yield CrawlResult(url="https://b.com", article=article)
+            yield CrawlResult(url="https://a.com", error=Exception("Network error"))
+
+        mock_crawler_class.return_value.crawl_many = crawl_many
+
+        result = await crawl_many_tool.ainvoke(
+            {"urls": ["https://a.com", "https://b.com"]}
+        )
+
+        assert result[0]["url"] == "https://b.com"
+        assert len(result[0]["crawled_content"]) == 1000
+        assert result[1]["url"] == "https://a.com"
+        assert "Network error" in result[1]["error"]
+
+
+class TestRankedCrawl:
+    def test_crawl_tool_with_query(self, mock_crawler):
+        result = crawl_tool.invoke({"url": "https://a.com", "query": "free plan"})
+
+        assert result["title"] == "Title"
+        assert result["total_chunks"] == 3
+        assert result["chunks"] == [
+            {
+                "offset": 1,
+                "heading": "Pricing",
+                "text": "The free plan allows 100 requests per day.",
+            }
+        ]
+
+    def test_follow_up_reads_use_cached_document(self, mock_crawler):
+        crawl_tool.invoke({"url": "https://a.com", "query": "pricing"})
+        result = read_crawled_page_tool.invoke({"url": "https://a.com", "offset": 2})
+
+        assert [c["heading"] for c in result["chunks"]] == ["Support"]
+        assert "next_offset" not in result
+        mock_crawler.crawl.assert_called_once_with("https://a.com")
+
+    def test_read_crawled_page_next_offset(self, mock_crawler):
+        with patch.dict("os.environ", {"CRAWL_RESULT_CHARS": "40"}):
+            result = read_crawled_page_tool.invoke({"url": "https://a.com"})
+
+        assert [c["offset"] for c in result["chunks"]] == [0]
+        assert result["next_offset"] == 1
+
+    @patch("src.tools.crawl.logger")
+    def test_read_crawled_page_error(self, mock_logger, mock_crawler):
+        mock_crawler.crawl.side_effect = Exception("Network error")
+
+        result = read_crawled_page_tool.invoke({"url": "https://a.com"})
+
+        assert "Network error" in result
+        mock_logger.error.assert_called_once()
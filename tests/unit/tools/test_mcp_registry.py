@@ -0,0 +1,75 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.tools.mcp_registry import MCPToolRegistry
+
+SERVERS = {"github": {"transport": "stdio", "command": "uvx", "args": ["gh"]}}
+
+
+class FakeClient:
+    created = 0
+
+    def __init__(self, servers):
+        FakeClient.created += 1
+        self.servers = servers
+
+    async def get_tools(self):
+        await asyncio.sleep(0.01)
+        return [f"{name}-tool" for name in self.servers]
+
+
+@pytest.fixture(autouse=True)
+def _reset_client_count():
+    FakeClient.created = 0
+
+
+@pytest.mark.asyncio
+async def test_tools_are_listed_once_per_server_set():
+    registry = MCPToolRegistry()
+    first = await registry.get_tools(SERVERS, FakeClient)
+    second = await registry.get_tools(
+        {"github": {"args": ["gh"], "command": "uvx", "transport": "stdio"}},
+        FakeClient,
+    )
+    assert first == second == ["github-tool"]
+    assert FakeClient.created == 1
+
+    await registry.get_tools({"other": {"transport": "sse"}}, FakeClient)
+    assert FakeClient.created == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_deduplicated():
+    registry = MCPToolRegistry()
+    results = await asyncio.gather(
+        *[registry.get_tools(SERVERS, FakeClient) for _ in range(5)]
+    )
+    assert all(result == ["github-tool"] for result in results)
+    assert FakeClient.created == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate():
+    registry = MCPToolRegistry()
+    await registry.get_tools(SERVERS, FakeClient)
+    registry.invalidate(SERVERS)
+    await registry.get_tools(SERVERS, FakeClient)
+    registry.invalidate()
+    await registry.get_tools(SERVERS, FakeClient)
+    assert FakeClient.created == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_listing_is_not_cached():
+    class FailingClient(FakeClient):
+        async def get_tools(self):
+            raise RuntimeError("server crashed")
+
+    registry = MCPToolRegistry()
+    with pytest.raises(RuntimeError):
+        await registry.get_tools(SERVERS, FailingClient)
+    assert await registry.get_tools(SERVERS, FakeClient) == ["github-tool"]
@@ -0,0 +1,178 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.tools.mcp_session_pool import (
+    MCPSessionPool,
+    PooledMCPClient,
+    connection_key,
+)
+
+STDIO = {"transport": "stdio", "command": "uvx", "args": ["server"], "env": None}
+
+
+class FakeSession:
+    def __init__(self, connection):
+        self.connection = connection
+        self.initialized = False
+        self.closed = False
+        self.pings = 0
+        self.healthy = True
+        self.calls = []
+
+    async def initialize(self):
+        self.initialized = True
+
+    async def send_ping(self):
+        self.pings += 1
+        if not self.healthy:
+            raise ConnectionError("gone")
+
+    async def list_tools(self, cursor=None):
+        tool = SimpleNamespace(
+            name=f"tool_{cursor or 'a'}",
+            description="desc",
+            inputSchema={"type": "object", "properties": {}},
+            annotations=None,
+        )
+        return SimpleNamespace(tools=[tool], nextCursor="b" if cursor is None else None)
+
+    async def call_tool(self, name, arguments=None, **kwargs):
+        self.calls.append((name, arguments))
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=f"{name} ok")],
+            isError=False,
+        )
+
+
+@pytest.fixture
+def sessions():
+    opened = []
+
+    @asynccontextmanager
+    async def fake_create_session(connection):
+        session = FakeSession(connection)
+        opened.append(session)
+        try:
+            yield session
+        finally:
+            session.closed = True
+
+    with patch(
+        "src.tools.mcp_session_pool.create_session", side_effect=fake_create_session
+    ):
+        yield opened
+
+
+def test_connection_key_ignores_unset_values():
+    assert connection_key(STDIO) == connection_key(
+        {"command": "uvx", "args": ["server"], "transport": "stdio", "env": {}}
+    )
+    assert connection_key(STDIO) != connection_key({**STDIO, "args": ["other"]})
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused(sessions):
+    pool = MCPSessionPool()
+    async with pool.session(STDIO) as first:
+        pass
+    async with pool.session(dict(STDIO)) as second:
+        pass
+    assert first is second
+    assert len(sessions) == 1
+    assert sessions[0].initialized
+    assert pool.stats() == {"sessions": 1, "in_use": 0}
+    await pool.aclose()
+    assert sessions[0].closed
+    assert len(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_open_one_session(sessions):
+    pool = MCPSessionPool()
+
+    async def use():
+        async with pool.session(STDIO) as session:
+            await asyncio.sleep(0)
+            return session
+
+    results = await asyncio.gather(*[use() for _ in range(5)])
+    assert len(sessions) == 1
+    assert all(session is results[0] for session in results)
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_session_is_replaced(sessions):
+    pool = MCPSessionPool(health_check_interval=0)
+    async with pool.session(STDIO):
+        pass
+    sessions[0].healthy = False
+    async with pool.session(STDIO) as session:
+        assert session is sessions[1]
+    assert sessions[0].closed
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_session_is_discarded(sessions):
+    pool = MCPSessionPool()
+    with pytest.raises(ConnectionError):
+        async with pool.session(STDIO):
+            raise ConnectionError("broken pipe")
+    assert len(pool) == 0
+    assert sessions[0].closed
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_max_sessions_evicts_idle_session(sessions):
+    pool = MCPSessionPool(max_sessions=1)
+    async with pool.session(STDIO):
+        pass
+    async with pool.session({**STDIO, "args": ["other"]}):
+        pass
+    assert len(pool) == 1
+    assert sessions[0].closed
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_max_sessions_falls_back_to_one_off_session(sessions):
+    pool = MCPSessionPool(max_sessions=1)
+    async with pool.session(STDIO):
+        async with pool.session({**STDIO, "args": ["other"]}) as one_off:
+            assert one_off is sessions[1]
+        assert sessions[1].closed
+        assert len(pool) == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_close_idle(sessions):
+    pool = MCPSessionPool(idle_timeout=0)
+    async with pool.session(STDIO):
+        assert await pool.close_idle() == 0
+    assert await pool.close_idle() == 1
+    assert sessions[0].closed
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_tools_share_session(sessions):
+    pool = MCPSessionPool()
+    client = PooledMCPClient({"server": STDIO}, pool=pool)
+    tools = await client.get_tools()
+    assert [tool.name for tool in tools] == ["tool_a", "tool_b"]
+
+    await tools[0].ainvoke({})
+    await tools[1].ainvoke({})
+    assert len(sessions) == 1
+    assert sessions[0].calls == [("tool_a", {}), ("tool_b", {})]
+    await pool.aclose()
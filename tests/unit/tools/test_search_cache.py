@@ -0,0 +1,171 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from typing import List, Optional
+from unittest.mock import patch
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.tools.decorators import create_logged_tool
+from src.tools.search_cache import (
+    MemorySearchCache,
+    SearchCache,
+    SQLiteSearchCache,
+    bypass_search_cache,
+    create_cached_search_tool,
+    normalize_query,
+    search_cache_key,
+)
+
+
+class FakeSearch(BaseTool):
+    name: str = "fake_search"
+    description: str = "fake search"
+    max_results: int = 3
+    include_domains: Optional[List[str]] = None
+    calls: List[str] = []
+    fail: bool = False
+
+    def _run(self, query: str, run_manager=None):
+        self.calls.append(query)
+        if self.fail:
+            return repr(Exception("boom")), {}
+        return [{"title": query, "content": f"about {query}"}]
+
+
+class FakeAsyncSearch(FakeSearch):
+    async def _arun(self, query: str, run_manager=None):
+        self.calls.append(f"async:{query}")
+        return [{"title": query, "content": f"about {query}"}]
+
+
+CachedFakeSearch = create_logged_tool(create_cached_search_tool(FakeSearch))
+CachedFakeAsyncSearch = create_logged_tool(create_cached_search_tool(FakeAsyncSearch))
+
+
+@pytest.fixture
+def cache():
+    cache = SearchCache([MemorySearchCache(max_size=16, ttl=60)])
+    with patch("src.tools.search_cache.search_cache", cache):
+        yield cache
+
+
+def test_normalize_query():
+    assert normalize_query("  Deer   FLOW\tNews ") == "deer flow news"
+    assert normalize_query("ＡＢＣ") == "abc"
+
+
+def test_search_cache_key_normalization():
+    key = search_cache_key(
+        "tavily", "AI  news", max_results=3, include_domains=["b.com", "A.com"]
+    )
+    assert key == search_cache_key(
+        "tavily", "ai news", max_results=3, include_domains=["a.com", "b.com"]
+    )
+    assert key != search_cache_key(
+        "tavily", "ai news", max_results=5, include_domains=["a.com", "b.com"]
+    )
+    assert key != search_cache_key(
+        "brave", "ai news", max_results=3, include_domains=["a.com", "b.com"]
+    )
+    assert search_cache_key("tavily", "q", exclude_domains=[]) == search_cache_key(
+        "tavily", "q"
+    )
+
+
+def test_tool_results_are_cached(cache):
+    tool = CachedFakeSearch(calls=[])
+    first = tool.invoke("Deer Flow")
+    second = tool.invoke("deer   flow")
+    assert first == second
+    assert tool.calls == ["Deer Flow"]
+    assert cache.stats() == {"hits": 1, "misses": 1, "bypassed": 0}
+
+    tool.invoke({"query": "deer flow"})
+    assert len(tool.calls) == 1
+
+
+def test_tool_options_are_part_of_the_key(cache):
+    CachedFakeSearch(calls=[]).invoke("query")
+    other = CachedFakeSearch(calls=[], max_results=5)
+    other.invoke("query")
+    assert other.calls == ["query"]
+
+
+def test_error_results_are_not_cached(cache):
+    tool = CachedFakeSearch(calls=[], fail=True)
+    tool.invoke("query")
+    tool.invoke("query")
+    assert tool.calls == ["query", "query"]
+
+
+def test_bypass_search_cache(cache):
+    tool = CachedFakeSearch(calls=[])
+    tool.invoke("query")
+    with bypass_search_cache():
+        tool.invoke("query")
+    assert tool.calls == ["query", "query"]
+    assert cache.stats()["bypassed"] == 1
+
+    tool.invoke("query")
+    assert len(tool.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_tool_results_are_cached(cache):
+    tool = CachedFakeAsyncSearch(calls=[])
+    await tool.ainvoke("query")
+    await tool.ainvoke("query")
+    tool.invoke("query")
+    assert tool.calls == ["async:query"]
+
+
+@pytest.mark.asyncio
+async def test_async_fallback_to_sync_tool_counts_once(cache):
+    tool = CachedFakeSearch(calls=[])
+    await tool.ainvoke("query")
+    assert tool.calls == ["query"]
+    assert cache.stats() == {"hits": 0, "misses": 1, "bypassed": 0}
+
+
+def test_sqlite_backend(tmp_path):
+    path = str(tmp_path / "cache" / "search.db")
+    backend = SQLiteSearchCache(path, ttl=60)
+    backend.set("key", [{"title": "t"}])
+    assert backend.get("key") == [{"title": "t"}]
+    backend.close()
+
+    # Results survive a restart
+    reopened = SQLiteSearchCache(path, ttl=60)
+    assert reopened.get("key") == [{"title": "t"}]
+    reopened.clear()
+    assert reopened.get("key") is None
+    reopened.close()
+
+
+def test_sqlite_backend_expiry(tmp_path):
+    backend = SQLiteSearchCache(str(tmp_path / "search.db"), ttl=60)
+    backend.set("key", "value")
+    with patch("src.tools.search_cache.time.time", return_value=10**12):
+        assert backend.get("key") is None
+    backend.close()
+
+
+def test_slower_backend_hit_is_promoted(tmp_path):
+    memory = MemorySearchCache()
+    disk = SQLiteSearchCache(str(tmp_path / "search.db"))
+    cache = SearchCache([memory, disk])
+    disk.set("key", ["result"])
+
+    assert cache.get("key") == ["result"]
+    assert memory.get("key") == ["result"]
+    disk.close()
+
+
+def test_disabled_cache():
+    memory = MemorySearchCache()
+    cache = SearchCache([memory], enabled=False)
+    cache.set("key", "value")
+    assert cache.get("key") is None
+    assert memory.get("key") is None
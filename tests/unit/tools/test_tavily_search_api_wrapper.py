@@ -1,10 +1,9 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
-import json
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import httpx
 import pytest
-import requests
 
 from src.tools.tavily_search.tavily_search_api_wrapper import (
     EnhancedTavilySearchAPIWrapper,
@@ -41,11 +40,12 @@ class TestEnhancedTavilySearchAPIWrapper:
             ],
         }
 
-    @patch("src.tools.tavily_search.tavily_search_api_wrapper.requests.post")
-    def test_raw_results_success(self, mock_post, wrapper, mock_response_data):
+    @patch("src.tools.tavily_search.tavily_search_api_wrapper.get_http_client")
+    def test_raw_results_success(self, mock_client, wrapper, mock_response_data):
         mock_response = Mock()
         mock_response.json.return_value = mock_response_data
         mock_response.raise_for_status.return_value = None
+        mock_post = mock_client.return_value.post
         mock_post.return_value = mock_response
 
         result = wrapper.raw_results("test query", max_results=10)
@@ -57,13 +57,14 @@ class TestEnhancedTavilySearchAPIWrapper:
         assert call_args.kwargs["json"]["query"] == "test query"
         assert call_args.kwargs["json"]["max_results"] == 10
 
-    @patch("src.tools.tavily_search.tavily_search_api_wrapper.requests.post")
+    @patch("src.tools.tavily_search.tavily_search_api_wrapper.get_http_client")
     def test_raw_results_with_all_parameters(
-        self, mock_post, wrapper, mock_response_data
+        self, mock_client, wrapper, mock_response_data
     ):
         mock_response = Mock()
         mock_response.json.return_value = mock_response_data
         mock_response.raise_for_status.return_value = None
+        mock_post = mock_client.return_value.post
         mock_post.return_value = mock_response
 
         result = wrapper.raw_results(
@@ -86,66 +87,42 @@ class TestEnhancedTavilySearchAPIWrapper:
         assert params["include_answer"] is True
         assert params["include_raw_content"] is True
 
-    @patch("src.tools.tavily_search.tavily_search_api_wrapper.requests.post")
-    def test_raw_results_http_error(self, mock_post, wrapper):
+    @patch("src.tools.tavily_search.tavily_search_api_wrapper.get_http_client")
+    def test_raw_results_http_error(self, mock_client, wrapper):
         mock_response = Mock()
-        mock_response.raise_for_status.side_effect = requests.HTTPError("API Error")
-        mock_post.return_value = mock_response
+        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "API Error", request=Mock(), response=Mock()
+        )
+        mock_client.return_value.post.return_value = mock_response
 
-        with pytest.raises(requests.HTTPError):
+        with pytest.raises(httpx.HTTPStatusError):
             wrapper.raw_results("test query")
 
     @pytest.mark.asyncio
     async def test_raw_results_async_success(self, wrapper, mock_response_data):
-        # Create a mock that acts as both the response and its context manager
-        mock_response_cm = AsyncMock()
-        mock_response_cm.__aenter__ = AsyncMock(return_value=mock_response_cm)
-        mock_response_cm.__aexit__ = AsyncMock(return_value=None)
-        mock_response_cm.status = 200
-        mock_response_cm.text = AsyncMock(return_value=json.dumps(mock_response_data))
-
-        # Create mock session that returns the context manager
-        mock_session = AsyncMock()
-        mock_session.post = MagicMock(
-            return_value=mock_response_cm
-        )  # Use MagicMock, not AsyncMock
-
-        # Create mock session class
-        mock_session_cm = AsyncMock()
-        mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_response = Mock(status_code=200)
+        mock_response.json.return_value = mock_response_data
+        mock_client = MagicMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
 
         with patch(
-            "src.tools.tavily_search.tavily_search_api_wrapper.aiohttp.ClientSession",
-            return_value=mock_session_cm,
+            "src.tools.tavily_search.tavily_search_api_wrapper.get_async_http_client",
+            return_value=mock_client,
         ):
             result = await wrapper.raw_results_async("test query")
 
             assert result == mock_response_data
+            assert mock_client.post.call_args.kwargs["json"]["query"] == "test query"
 
     @pytest.mark.asyncio
     async def test_raw_results_async_error(self, wrapper):
-        # Create a mock that acts as both the response and its context manager
-        mock_response_cm = AsyncMock()
-        mock_response_cm.__aenter__ = AsyncMock(return_value=mock_response_cm)
-        mock_response_cm.__aexit__ = AsyncMock(return_value=None)
-        mock_response_cm.status = 400
-        mock_response_cm.reason = "Bad Request"
-
-        # Create mock session that returns the context manager
-        mock_session = AsyncMock()
-        mock_session.post = MagicMock(
-            return_value=mock_response_cm
-        )  # Use MagicMock, not AsyncMock
-
-        # Create mock session class
-        mock_session_cm = AsyncMock()
-        mock_session_cm.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session_cm.__aexit__ = AsyncMock(return_value=None)
+        mock_response = Mock(status_code=400, reason_phrase="Bad Request")
+        mock_client = MagicMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
 
         with patch(
-            "src.tools.tavily_search.tavily_search_api_wrapper.aiohttp.ClientSession",
-            return_value=mock_session_cm,
+            "src.tools.tavily_search.tavily_search_api_wrapper.get_async_http_client",
+            return_value=mock_client,
         ):
             with pytest.raises(Exception, match="Error 400: Bad Request"):
                 await wrapper.raw_results_async("test query")
@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from pydantic import BaseModel
+
+from src.utils.cache import LRUCache, stable_hash
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.utils.cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 1
+    assert "a" not in cache
+    assert cache.get("a") is None
+
+
+def test_lru_cache_disabled_with_zero_size():
+    cache = LRUCache(max_size=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_pop_and_stats():
+    cache = LRUCache()
+    cache.set("a", 1)
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "missing") == "missing"
+    cache.get("a")
+    assert cache.stats() == {"size": 0, "hits": 0, "misses": 1, "evictions": 0}
+
+
+class _Model(BaseModel):
+    value: int
+
+
+def _func():
+    pass
+
+
+def test_stable_hash():
+    assert stable_hash({"a": 1, "b": [1, 2]}) == stable_hash({"b": [1, 2], "a": 1})
+    assert stable_hash({"a": 1}) != stable_hash({"a": 2})
+    assert stable_hash(_Model(value=1)) == stable_hash(_Model(value=1))
+    assert stable_hash(_Model(value=1)) != stable_hash(_Model(value=2))
+    assert stable_hash(_func) == stable_hash(_func)
+    assert stable_hash(_func) != stable_hash(lambda: None)
+    assert stable_hash(object()) == stable_hash(object())
@@ -0,0 +1,55 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.utils import http_client
+
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    yield
+    if http_client._sync_client is not None:
+        http_client._sync_client.close()
+        http_client._sync_client = None
+
+
+def test_sync_client_is_shared():
+    client = http_client.get_http_client()
+    assert isinstance(client, httpx.Client)
+    assert http_client.get_http_client() is client
+
+    client.close()
+    assert http_client.get_http_client() is not client
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_shared_per_loop():
+    client = http_client.get_async_http_client()
+    assert isinstance(client, httpx.AsyncClient)
+    assert http_client.get_async_http_client() is client
+
+    other = await asyncio.to_thread(asyncio.run, _client_of_new_loop())
+    assert other is not client
+
+    await http_client.close_http_clients()
+    assert client.is_closed
+    assert http_client.get_async_http_client() is not client
+    await http_client.close_http_clients()
+
+
+async def _client_of_new_loop():
+    client = http_client.get_async_http_client()
+    await client.aclose()
+    return client
+
+
+def test_client_options_from_env(monkeypatch):
+    monkeypatch.setenv("TOOLS_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("TOOLS_HTTP2", "false")
+    options = http_client._client_options()
+    assert options["limits"].max_connections == 7
+    assert options["http2"] is False